@@ -0,0 +1,218 @@
+import argparse
+import gzip
+import multiprocessing
+import os
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from dataset_generator1 import (spam_subjects, spam_content_phrases, legitimate_subjects,
+                                legitimate_content_phrases, shared_phrases, first_names,
+                                last_names, domains)
+from corrupt_dataset import corrupt_frame
+
+COLUMNS = ["label", "subject", "message", "sender", "created_at", "has_attachment"]
+FORMATS = ('csv.gz', 'parquet')
+DEFAULT_SHARD_SIZE = 250_000
+DEFAULT_BATCH_SIZE = 50_000
+
+PHRASES = np.array(spam_content_phrases + legitimate_content_phrases + shared_phrases, dtype=object)
+SPAM_POOL = (0, len(spam_content_phrases))
+LEGITIMATE_POOL = (len(spam_content_phrases), len(legitimate_content_phrases))
+SHARED_POOL = (len(spam_content_phrases) + len(legitimate_content_phrases), len(shared_phrases))
+
+def sample_phrases(rng, segments):
+    """Pick phrases for every row at once and return the joined bodies.
+
+    segments is a list of ((offset, size), counts) pairs: counts[i] distinct
+    phrases are drawn without replacement from that pool for row i, and each
+    row's picks from all pools are then put in a random order.
+    """
+    picked, valid = [], []
+    for (offset, size), counts in segments:
+        width = int(counts.max()) if len(counts) else 0
+        if width == 0:
+            continue
+        order = np.argsort(rng.random((len(counts), size)), axis=1)[:, :width]
+        picked.append(order + offset)
+        valid.append(np.arange(width) < counts[:, None])
+    picked = np.concatenate(picked, axis=1)
+    valid = np.concatenate(valid, axis=1)
+
+    keys = rng.random(picked.shape)
+    keys[~valid] = np.inf
+    order = np.argsort(keys, axis=1)
+    picked = np.take_along_axis(picked, order, axis=1)
+    lengths = valid.sum(axis=1)
+    return [" ".join(PHRASES[row[:length]]) for row, length in zip(picked, lengths)]
+
+def with_suffix(values, mask, suffix=None, prefix=None):
+    values = values.copy()
+    if prefix is not None:
+        values[mask] = prefix + values[mask]
+    if suffix is not None:
+        values[mask] = values[mask] + suffix
+    return values
+
+def generate_batch(rng, size, spam_ratio=0.3, difficulty='hard', now=None):
+    """Generate one DataFrame of size emails with the same distributions as the
+    row-by-row generators: 'basic' follows dataset_generator.py, 'normal' and
+    'hard' follow dataset_generator1.py."""
+    now = now or datetime.now()
+    num_spam = int(size * spam_ratio)
+    is_spam = rng.permutation(np.arange(size) < num_spam)
+    spam_rows = np.flatnonzero(is_spam)
+    legit_rows = np.flatnonzero(~is_spam)
+    mixed = difficulty != 'basic'
+    hard = difficulty == 'hard'
+
+    subjects = np.empty(size, dtype=object)
+    subjects[spam_rows] = np.array(spam_subjects, dtype=object)[rng.integers(len(spam_subjects), size=len(spam_rows))]
+    subjects[legit_rows] = np.array(legitimate_subjects, dtype=object)[rng.integers(len(legitimate_subjects), size=len(legit_rows))]
+    spam_subject = subjects[spam_rows]
+    upper = rng.random(len(spam_rows)) > 0.7
+    spam_subject[upper] = np.array([s.upper() for s in spam_subject[upper]], dtype=object)
+    spam_subject = with_suffix(spam_subject, rng.random(len(spam_rows)) > 0.8, prefix="RE: ")
+    spam_subject = with_suffix(spam_subject, rng.random(len(spam_rows)) > 0.9, suffix=" !!!")
+    subjects[spam_rows] = spam_subject
+
+    first = np.array(first_names, dtype=object)[rng.integers(len(first_names), size=size)]
+    last = np.array(last_names, dtype=object)[rng.integers(len(last_names), size=size)]
+    domain = np.array(domains, dtype=object)[rng.integers(len(domains), size=size)]
+    senders = np.array([f"{f.lower()}.{l.lower()}@{d}" for f, l, d in zip(first, last, domain)], dtype=object)
+
+    bodies = np.empty(size, dtype=object)
+    n = len(spam_rows)
+    mix = hard & (rng.random(n) > 0.5)
+    shared = np.where(mix, rng.integers(0, 3, size=n),
+                      np.where(mixed & (rng.random(n) > 0.7), rng.integers(1, 4, size=n), 0))
+    spam_body = np.array(sample_phrases(rng, [
+        (SPAM_POOL, np.where(mix, rng.integers(2, 6, size=n), rng.integers(3, 9, size=n))),
+        (LEGITIMATE_POOL, np.where(mix, rng.integers(1, 4, size=n), 0)),
+        (SHARED_POOL, shared)
+    ]), dtype=object)
+    spam_body = with_suffix(spam_body, rng.random(n) > 0.6, suffix="\n\nClick here: http://bit.ly/2X3fake")
+    bodies[spam_rows] = with_suffix(spam_body, rng.random(n) > 0.7, suffix="\n\nTo unsubscribe, reply with STOP")
+
+    n = len(legit_rows)
+    mix = hard & (rng.random(n) > 0.6)
+    shared = np.where(mix, rng.integers(0, 3, size=n),
+                      np.where(mixed & (rng.random(n) > 0.6), rng.integers(1, 3, size=n), 0))
+    legit_body = np.array(sample_phrases(rng, [
+        (LEGITIMATE_POOL, np.where(mix, rng.integers(2, 5, size=n), rng.integers(2, 7, size=n))),
+        (SPAM_POOL, np.where(mix, rng.integers(1, 3, size=n), 0)),
+        (SHARED_POOL, shared)
+    ]), dtype=object)
+    legit_body = with_suffix(legit_body, rng.random(n) > 0.6, prefix="Hi,\n\n")
+    signed = rng.random(n) > 0.7
+    legit_body[signed] = legit_body[signed] + "\n\nBest regards,\n" + first[legit_rows][signed] + " " + last[legit_rows][signed]
+    bodies[legit_rows] = legit_body
+
+    seconds_ago = rng.integers(0, 91, size=size) * 86400
+    created_at = np.datetime64(now.replace(microsecond=0), 's') - seconds_ago.astype('timedelta64[s]')
+    created_at = np.char.replace(np.datetime_as_string(created_at, unit='s'), 'T', ' ')
+
+    attachment_threshold = np.where(is_spam, 0.8 if difficulty == 'basic' else 0.7, 0.3)
+    has_attachment = rng.random(size) > attachment_threshold
+
+    return pd.DataFrame({
+        "label": np.where(is_spam, 'spam', 'legitimate'),
+        "subject": subjects,
+        "message": bodies,
+        "sender": senders,
+        "created_at": created_at,
+        "has_attachment": has_attachment
+    }, columns=COLUMNS)
+
+def shard_path(output_dir, shard, fmt):
+    return os.path.join(output_dir, f"part-{shard:05d}.{fmt}")
+
+def write_shard(task):
+    """Generate one shard in batches and stream them to its own output file."""
+    shard, rows, seed_sequence, options = task
+    rng = np.random.default_rng(seed_sequence)
+    path = shard_path(options['output_dir'], shard, options['format'])
+    writer = None
+    written = 0
+    try:
+        if options['format'] == 'csv.gz':
+            writer = gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=options['compresslevel'])
+        while written < rows:
+            size = min(options['batch_size'], rows - written)
+            df = generate_batch(rng, size, options['spam_ratio'], options['difficulty'], options['now'])
+            if options['corrupt']:
+                df = corrupt_frame(df, rng)
+            if options['format'] == 'csv.gz':
+                df.to_csv(writer, index=False, header=written == 0)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+                writer.write_table(table)
+            written += size
+    finally:
+        if writer is not None:
+            writer.close()
+    return path, written
+
+def generate_dataset(num_rows, output_dir, fmt='csv.gz', workers=None, seed=42,
+                     shard_size=DEFAULT_SHARD_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                     spam_ratio=0.3, difficulty='hard', corrupt=False, compresslevel=6):
+    """Generate num_rows emails as shards written in parallel to output_dir.
+
+    Shard i always covers the same rows and draws from the i-th child of
+    SeedSequence(seed), so the output is identical for any number of workers.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt}, expected one of {FORMATS}")
+    if fmt == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+    os.makedirs(output_dir, exist_ok=True)
+
+    num_shards = max(1, -(-num_rows // shard_size))
+    seeds = np.random.SeedSequence(seed).spawn(num_shards)
+    options = {
+        "output_dir": output_dir, "format": fmt, "batch_size": batch_size, "spam_ratio": spam_ratio,
+        "difficulty": difficulty, "corrupt": corrupt, "compresslevel": compresslevel,
+        "now": datetime.now()
+    }
+    tasks = [(shard, min(shard_size, num_rows - shard * shard_size), seeds[shard], options)
+             for shard in range(num_shards)]
+
+    workers = min(workers or os.cpu_count() or 1, num_shards)
+    start = time.perf_counter()
+    if workers == 1:
+        results = [write_shard(task) for task in tasks]
+    else:
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            results = pool.map(write_shard, tasks)
+    elapsed = time.perf_counter() - start
+
+    total = sum(written for _, written in results)
+    print(f"Generated {total} rows in {len(results)} {fmt} shards under {output_dir} "
+          f"in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s, {workers} workers)")
+    return [path for path, _ in results]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a large synthetic spam dataset in parallel")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'generated_dataset'))
+    parser.add_argument('--format', choices=FORMATS, default='csv.gz')
+    parser.add_argument('--workers', type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--spam-ratio', type=float, default=0.3)
+    parser.add_argument('--difficulty', choices=['basic', 'normal', 'hard'], default='hard')
+    parser.add_argument('--corrupt', action='store_true', help="apply the corrupt_dataset.py perturbations")
+    args = parser.parse_args()
+
+    generate_dataset(args.rows, args.output, fmt=args.format, workers=args.workers, seed=args.seed,
+                     shard_size=args.shard_size, batch_size=args.batch_size, spam_ratio=args.spam_ratio,
+                     difficulty=args.difficulty, corrupt=args.corrupt)
@@ -1,9 +1,90 @@
 import pandas as pd
+import numpy as np
 import random
 import os
 import string
 import re
 
+SPAM_WORDS = ['free', 'money', 'cash', 'win', 'prize', 'offer', 'credit', 
+              'discount', 'save', 'cheap', 'guarantee', 'limited', 'risk']
+
+SPAM_WORD_PATTERN = re.compile(r'(?<!\S)(?:' + '|'.join(SPAM_WORDS) + r')(?!\S)', re.IGNORECASE)
+
+LEGITIMATE_PHRASES = [
+    "quarterly report", "team meeting", "project deadline", "meeting minutes",
+    "annual review", "budget approval", "status update", "performance review"
+]
+
+SPAM_PHRASES = [
+    "limited offer", "act now", "risk-free", "exclusive deal", "amazing opportunity",
+    "discount code", "special promotion", "cash prize"
+]
+
+AMBIGUOUS_TEMPLATES = [
+    "Special offer for our valued customers regarding {0}",
+    "Limited time promotion: {0} project update",
+    "Action required: Important {0} notification",
+    "Reminder about your {0} subscription"
+]
+
+AMBIGUOUS_TOPICS = [
+    "account", "service", "membership", "profile", "subscription",
+    "payment", "delivery", "request", "appointment"
+]
+
+OBFUSCATION_TECHNIQUES = [
+    lambda w: w[0] + '.' + w[1:],  
+    lambda w: w[0] + ',' + w[1:],  
+    lambda w: w.replace('o', '0'),  
+    lambda w: w.replace('i', '1'),  
+    lambda w: w.replace('e', '3'),  
+    lambda w: w.replace('a', '@'), 
+    lambda w: w.replace('s', '$'),  
+    lambda w: ''.join([c + ' ' for c in w]).strip(), 
+    lambda w: w[0] + w[1:-1].upper() + w[-1]  
+]
+
+def obfuscate_word(word, choose=random.choice):
+    if len(word) <= 3:
+        return word
+    return choose(OBFUSCATION_TECHNIQUES)(word)
+
+def corrupt_frame(df, rng):
+    """Apply the corrupt_dataset() perturbations to a batch of rows with array operations.
+
+    Uses the numpy Generator rng instead of the global random module so each
+    shard of a parallel generation run corrupts its rows reproducibly.
+    """
+    n = len(df)
+    labels = df['label'].to_numpy(copy=True)
+    flip = rng.random(n) < 0.08
+    labels[flip] = np.where(labels[flip] == 'spam', 'legitimate', 'spam')
+    df['label'] = labels
+    is_spam = labels == 'spam'
+
+    choose = lambda options: options[rng.integers(len(options))]
+    obfuscate = lambda match: obfuscate_word(match.group(0), choose) if rng.random() < 0.3 else match.group(0)
+    obfuscated = is_spam & (rng.random(n) < 0.4)
+    for column in ('subject', 'message'):
+        df.loc[obfuscated, column] = df.loc[obfuscated, column].str.replace(SPAM_WORD_PATTERN, obfuscate, regex=True)
+
+    legitimate_phrases = np.array(LEGITIMATE_PHRASES, dtype=object)
+    spam_phrases = np.array(SPAM_PHRASES, dtype=object)
+    confusing = is_spam & (rng.random(n) < 0.5)
+    df.loc[confusing, 'message'] = df.loc[confusing, 'message'] + " " + \
+        legitimate_phrases[rng.integers(len(legitimate_phrases), size=confusing.sum())]
+    confusing = ~is_spam & (rng.random(n) < 0.4)
+    df.loc[confusing, 'message'] = df.loc[confusing, 'message'] + " " + \
+        spam_phrases[rng.integers(len(spam_phrases), size=confusing.sum())]
+
+    ambiguous = rng.choice(n, size=int(n * 0.1), replace=False)
+    subjects = np.array([t.format(topic) for t in AMBIGUOUS_TEMPLATES for topic in AMBIGUOUS_TOPICS], dtype=object)
+    messages = np.array([f"Please review the following information. {legit}. {spam}. This requires your attention."
+                         for legit in LEGITIMATE_PHRASES for spam in SPAM_PHRASES], dtype=object)
+    df.iloc[ambiguous, df.columns.get_loc('subject')] = subjects[rng.integers(len(subjects), size=len(ambiguous))]
+    df.iloc[ambiguous, df.columns.get_loc('message')] = messages[rng.integers(len(messages), size=len(ambiguous))]
+    return df
+
 def corrupt_dataset():
     
     print("Loading dataset to corrupt...")
@@ -26,27 +107,6 @@ def corrupt_dataset():
     
     print(f"Flipped labels for {num_to_flip} examples")
     
-    def obfuscate_word(word):
-        if len(word) <= 3:
-            return word
-        
-        techniques = [
-            lambda w: w[0] + '.' + w[1:],  
-            lambda w: w[0] + ',' + w[1:],  
-            lambda w: w.replace('o', '0'),  
-            lambda w: w.replace('i', '1'),  
-            lambda w: w.replace('e', '3'),  
-            lambda w: w.replace('a', '@'), 
-            lambda w: w.replace('s', '$'),  
-            lambda w: ''.join([c + ' ' for c in w]).strip(), 
-            lambda w: w[0] + w[1:-1].upper() + w[-1]  
-        ]
-        
-        return random.choice(techniques)(word)
-    
-    spam_words = ['free', 'money', 'cash', 'win', 'prize', 'offer', 'credit', 
-                 'discount', 'save', 'cheap', 'guarantee', 'limited', 'risk']
-    
     def obfuscate_text(text):
         if not isinstance(text, str):
             return text
@@ -55,7 +115,7 @@ def corrupt_dataset():
         for i, word in enumerate(words):
             word_lower = word.lower()
             
-            if word_lower in spam_words and random.random() < 0.3:
+            if word_lower in SPAM_WORDS and random.random() < 0.3:
                 words[i] = obfuscate_word(word)
                 
         return ' '.join(words)
@@ -68,25 +128,15 @@ def corrupt_dataset():
     
     print("Applied obfuscation to spam messages")
     
-    legitimate_phrases = [
-        "quarterly report", "team meeting", "project deadline", "meeting minutes",
-        "annual review", "budget approval", "status update", "performance review"
-    ]
-    
-    spam_phrases = [
-        "limited offer", "act now", "risk-free", "exclusive deal", "amazing opportunity",
-        "discount code", "special promotion", "cash prize"
-    ]
-    
     for idx in spam_indices:
         if random.random() < 0.5:  
-            phrase = random.choice(legitimate_phrases)
+            phrase = random.choice(LEGITIMATE_PHRASES)
             df.loc[idx, 'message'] = df.loc[idx, 'message'] + " " + phrase
     
     legit_indices = df[df['label'] == 'legitimate'].index
     for idx in legit_indices:
         if random.random() < 0.4:  
-            phrase = random.choice(spam_phrases)
+            phrase = random.choice(SPAM_PHRASES)
             df.loc[idx, 'message'] = df.loc[idx, 'message'] + " " + phrase
     
     print("Added confusing phrases across both classes")
@@ -95,25 +145,13 @@ def corrupt_dataset():
     num_ambiguous = int(len(df) * 0.1) 
     indices_for_ambiguous = random.sample(range(len(df)), num_ambiguous)
     
-    ambiguous_templates = [
-        "Special offer for our valued customers regarding {0}",
-        "Limited time promotion: {0} project update",
-        "Action required: Important {0} notification",
-        "Reminder about your {0} subscription"
-    ]
-    
-    ambiguous_topics = [
-        "account", "service", "membership", "profile", "subscription",
-        "payment", "delivery", "request", "appointment"
-    ]
-    
     for idx in indices_for_ambiguous:
-        template = random.choice(ambiguous_templates)
-        topic = random.choice(ambiguous_topics)
+        template = random.choice(AMBIGUOUS_TEMPLATES)
+        topic = random.choice(AMBIGUOUS_TOPICS)
         df.loc[idx, 'subject'] = template.format(topic)
         
-        legit_content = random.choice(legitimate_phrases)
-        spam_content = random.choice(spam_phrases)
+        legit_content = random.choice(LEGITIMATE_PHRASES)
+        spam_content = random.choice(SPAM_PHRASES)
         
         df.loc[idx, 'message'] = (f"Please review the following information. "
                                f"{legit_content}. {spam_content}. "
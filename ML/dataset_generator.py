@@ -158,5 +158,6 @@ def write_to_csv(dataset, filename="email_spam_dataset.csv"):
             writer.writerow(data)
     print(f"Dataset written to {filename}")
 
-dataset = generate_spam_dataset(num_samples=1000, spam_ratio=0.3)
-write_to_csv(dataset)
\ No newline at end of file
+if __name__ == "__main__":
+    dataset = generate_spam_dataset(num_samples=1000, spam_ratio=0.3)
+    write_to_csv(dataset)
\ No newline at end of file
@@ -206,8 +206,9 @@ def write_to_csv(dataset, filename="email_spam_dataset.csv"):
             writer.writerow(data)
     print(f"Dataset written to {filename}")
 
-dataset = generate_spam_dataset(num_samples=10000, spam_ratio=0.3, difficulty='hard')
-write_to_csv(dataset)
+if __name__ == "__main__":
+    dataset = generate_spam_dataset(num_samples=10000, spam_ratio=0.3, difficulty='hard')
+    write_to_csv(dataset)
 
-print("Generated dataset")
-print("realistic model")
\ No newline at end of file
+    print("Generated dataset")
+    print("realistic model")
\ No newline at end of file
@@ -0,0 +1,174 @@
+import argparse
+import hashlib
+import multiprocessing
+import os
+import pickle
+import resource
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.models.compact_spam_model import write_compact_model, update_meta, CompactSpamModel
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', 'backend', 'models')
+PICKLE_PATH = os.path.join(MODEL_DIR, 'spam_detector_model.pkl')
+COMPACT_PATH = os.path.join(MODEL_DIR, 'spam_detector_model.compact')
+LINEAR_PATH = os.path.join(MODEL_DIR, 'spam_detector_linear.compact')
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'email_spam_dataset.csv')
+
+def linear_weights(classifier):
+    """Return (coef, intercept) of the spam log-odds for a linear classifier."""
+    name = type(classifier).__name__
+    if name == 'LogisticRegression':
+        return classifier.coef_[0], classifier.intercept_[0]
+    if name == 'MultinomialNB':
+        coef = classifier.feature_log_prob_[1] - classifier.feature_log_prob_[0]
+        intercept = classifier.class_log_prior_[1] - classifier.class_log_prior_[0]
+        return coef, intercept
+    raise ValueError(f"{name} is not a linear model and cannot be exported in the compact format")
+
+def export_compact_model(model, directory=COMPACT_PATH, source=None):
+    """Export a fitted vectorizer + linear classifier pipeline as a compact artifact.
+
+    NoisySpamClassifier wrappers are unwrapped, so the artifact holds only the
+    underlying pipeline and none of the training fingerprints. source is
+    recorded in meta.json to say which model the weights belong to.
+    """
+    model = getattr(model, 'base_model', model)
+    if not hasattr(model, 'steps') or len(model.steps) != 2:
+        raise ValueError("Expected a two-step (vectorizer, classifier) Pipeline")
+    vectorizer, classifier = model.steps[0][1], model.steps[1][1]
+    if not hasattr(vectorizer, 'vocabulary_'):
+        raise ValueError(f"{type(vectorizer).__name__} has no vocabulary to export")
+
+    if vectorizer.analyzer != 'word' or vectorizer.tokenizer or vectorizer.preprocessor \
+            or vectorizer.stop_words or vectorizer.strip_accents:
+        raise ValueError("Only the default word analyzer can be exported")
+
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, index in vectorizer.vocabulary_.items():
+        terms[index] = term
+    if hasattr(vectorizer, 'idf_') and vectorizer.use_idf:
+        idf = vectorizer.idf_
+        norm, sublinear_tf = vectorizer.norm, vectorizer.sublinear_tf
+    else:
+        idf = np.ones(len(terms))
+        norm, sublinear_tf = getattr(vectorizer, 'norm', None), getattr(vectorizer, 'sublinear_tf', False)
+    coef, intercept = linear_weights(classifier)
+
+    meta = write_compact_model(directory, terms, idf, coef, intercept,
+                               token_pattern=vectorizer.token_pattern,
+                               ngram_range=vectorizer.ngram_range,
+                               lowercase=vectorizer.lowercase,
+                               sublinear_tf=sublinear_tf,
+                               norm=norm,
+                               source=source)
+    print(f"Compact model {meta['version']} with {meta['n_features']} features saved to {os.path.abspath(directory)}")
+    return meta
+
+def current_rss_kb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def measure_artifact(kind, path, texts, results):
+    import warnings
+    warnings.filterwarnings('ignore')
+    rss_before = current_rss_kb()
+    start = time.perf_counter()
+    if kind == 'compact':
+        model = CompactSpamModel.load(path)
+    else:
+        with open(path, 'rb') as f:
+            model = pickle.load(f)
+    load_ms = (time.perf_counter() - start) * 1000
+    rss_after = current_rss_kb()
+
+    latencies = []
+    probabilities = []
+    for text in texts:
+        start = time.perf_counter()
+        probabilities.append(float(model.predict_proba([text])[0][1]))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    results[kind] = {
+        "load_ms": load_ms,
+        "rss_mb": (rss_after - rss_before) / 1024,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "probabilities": probabilities
+    }
+
+def sample_texts(sample_size=500, seed=42):
+    df = pd.read_csv(DATA_PATH)
+    sample = df.sample(n=min(sample_size, len(df)), random_state=seed)
+    return (sample['subject'].fillna('') + ' ' + sample['message'].fillna('')).tolist()
+
+def pickle_version(path):
+    """The version SpamModelRegistry reports for a pickled model."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def verdict_agreement(reference_probabilities, compact_probabilities):
+    return float(np.mean([(a > 0.5) == (b > 0.5) for a, b in
+                          zip(reference_probabilities, compact_probabilities)]))
+
+def compare_artifacts(pickle_path=PICKLE_PATH, compact_path=COMPACT_PATH, sample_size=500, seed=42, record=False):
+    """Load each artifact in a fresh process and report load time, RSS growth,
+    single-message latency and verdict agreement on messages sampled from the
+    dataset. With record the agreement is written to the compact artifact's
+    meta.json, so a compact model that is not an exact export carries how far
+    it is from the pickle it would replace."""
+    texts = sample_texts(sample_size, seed)
+
+    context = multiprocessing.get_context('spawn')
+    with context.Manager() as manager:
+        results = manager.dict()
+        for kind, path in (('pickle', pickle_path), ('compact', compact_path)):
+            process = context.Process(target=measure_artifact, args=(kind, path, texts, results))
+            process.start()
+            process.join()
+        results = dict(results)
+
+    print(f"\nArtifact comparison on {len(texts)} sampled messages:")
+    print(f"{'Artifact':<10}{'Load (ms)':>12}{'RSS (MB)':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+    for kind in ('pickle', 'compact'):
+        if kind in results:
+            r = results[kind]
+            print(f"{kind:<10}{r['load_ms']:>12.2f}{r['rss_mb']:>12.2f}{r['p50_ms']:>12.3f}{r['p95_ms']:>12.3f}")
+    if 'pickle' in results and 'compact' in results:
+        reference, compact = results['pickle']['probabilities'], results['compact']['probabilities']
+        agreement = verdict_agreement(reference, compact)
+        print(f"Verdict agreement with pickle: {agreement:.2%}")
+        if record:
+            update_meta(compact_path, agreement={
+                "reference": os.path.basename(pickle_path),
+                "reference_version": pickle_version(pickle_path),
+                "samples": len(texts),
+                "seed": seed,
+                "verdict_agreement": round(agreement, 4),
+                "mean_probability_difference": round(float(np.mean(np.abs(np.subtract(reference, compact)))), 4)
+            })
+            print(f"Agreement recorded in {os.path.join(compact_path, 'meta.json')}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the spam model as a compact artifact and compare it with the pickle")
+    parser.add_argument('--source', default=PICKLE_PATH, help="pickled pipeline to export")
+    parser.add_argument('--output', default=COMPACT_PATH, help="directory to write the compact artifact to")
+    parser.add_argument('--compare-only', action='store_true', help="skip the export and only run the comparison")
+    parser.add_argument('--record', action='store_true', help="write the verdict agreement to the artifact's meta.json")
+    args = parser.parse_args()
+
+    if not args.compare_only:
+        with open(args.source, 'rb') as f:
+            export_compact_model(pickle.load(f), args.output, source=f"export of {os.path.basename(args.source)}")
+    compare_artifacts(args.source, args.output, record=args.record)
@@ -0,0 +1,89 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from datetime import datetime
+from sqlalchemy import DateTime, bindparam, create_engine, text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.models.incremental_spam_model import (INCREMENTAL_MODEL_PATH, partial_fit_batches,
+                                                   load_incremental_model, save_incremental_model)
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'email_spam_dataset.csv')
+DATABASE_URL = os.environ.get('PMAIL_DATABASE_URL', 'mysql+pymysql://root:@localhost/pmail')
+DEFAULT_BATCH_SIZE = 2000
+
+FEEDBACK_LABELS_QUERY = text(
+    "SELECT f.id, f.created_at, f.is_spam, m.subject, m.body FROM spam_feedback f "
+    "JOIN messages m ON m.id = f.message_id "
+    "WHERE f.created_at > :after_at OR (f.created_at = :after_at AND f.id > :after_id) "
+    "ORDER BY f.created_at, f.id LIMIT :limit"
+).bindparams(bindparam('after_at', type_=DateTime)).columns(created_at=DateTime)
+
+def new_incremental_model(seed=42, n_features=2 ** 18):
+    """A stateless hashing vectorizer feeding an SGD logistic regression, so the
+    model can learn batch by batch without a vocabulary held in memory."""
+    return Pipeline([
+        ('hashing', HashingVectorizer(n_features=n_features, ngram_range=(1, 2),
+                                      alternate_sign=False, norm='l2')),
+        ('classifier', SGDClassifier(loss='log_loss', alpha=1e-5, random_state=seed))
+    ])
+
+def iter_csv_batches(path=DATA_PATH, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield (texts, labels) from the dataset CSV, batch_size rows at a time."""
+    for chunk in pd.read_csv(path, chunksize=batch_size):
+        texts = (chunk['subject'].fillna('') + ' ' + chunk['message'].fillna('')).tolist()
+        labels = np.where(chunk['label'] == 'spam', 1, 0)
+        yield texts, labels
+
+def iter_feedback_batches(engine, batch_size=DEFAULT_BATCH_SIZE, state=None):
+    """Yield (texts, labels) for messages users marked as spam or not spam.
+
+    messages.is_spam is mostly the classifier's own verdict, so only the
+    corrections recorded in spam_feedback are used as labels. Feedback is
+    paged by (created_at, id) after the position saved in state, so an update
+    picks up corrections to old messages as well as new ones, and the last
+    position seen is written back to state.
+    """
+    state = state if state is not None else {}
+    after_at = datetime.fromisoformat(state.get('last_feedback_at', datetime.min.isoformat()))
+    after_id = state.get('last_feedback_id', 0)
+    while True:
+        with engine.connect() as connection:
+            rows = connection.execute(FEEDBACK_LABELS_QUERY, {"after_at": after_at, "after_id": after_id,
+                                                              "limit": batch_size}).fetchall()
+        if not rows:
+            break
+        after_at, after_id = rows[-1].created_at, rows[-1].id
+        state['last_feedback_at'] = after_at.isoformat()
+        state['last_feedback_id'] = after_id
+        yield [f"{row.subject} {row.body}" for row in rows], np.array([int(row.is_spam) for row in rows])
+
+def train_incremental(source='csv', batch_size=DEFAULT_BATCH_SIZE, update=False,
+                      path=INCREMENTAL_MODEL_PATH, csv_path=DATA_PATH, engine=None, seed=42):
+    """Train or update the incremental model from the CSV or user spam feedback.
+
+    With update=True training continues from the saved model; for feedback
+    only corrections recorded since the last run are read.
+    """
+    previous = load_incremental_model(path) if update else None
+    model, state = previous if previous else (new_incremental_model(seed), {})
+
+    if source == 'db':
+        engine = engine or create_engine(DATABASE_URL)
+        batches = iter_feedback_batches(engine, batch_size, state)
+    else:
+        batches = iter_csv_batches(csv_path, batch_size)
+
+    accuracy = partial_fit_batches(model, batches, state)
+    if accuracy is not None:
+        state['progressive_accuracy'] = accuracy
+    if 'samples_seen' not in state:
+        print("No labelled data found, nothing to train on")
+        return model, state
+    save_incremental_model(model, state, path)
+    return model, state
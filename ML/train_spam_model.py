@@ -3,10 +3,14 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import classification_report, accuracy_score
 import pickle
 import os
+import argparse
+from export_compact_model import export_compact_model, compare_artifacts
+from incremental_training import train_incremental, DEFAULT_BATCH_SIZE
 
 def train_spam_model():
     print("Loading spam dataset...")
@@ -49,7 +53,35 @@ def train_spam_model():
         pickle.dump(model, f)
     print(f"Model saved to {os.path.abspath(model_path)}")
     
+    # The random forest cannot be scored as a dot product, so a logistic
+    # regression is fitted on the same TF-IDF features and published as its own
+    # compact model version, with its agreement with the forest recorded.
+    print("Training linear model for the compact artifact...")
+    linear_model = Pipeline([
+        ('tfidf', model.named_steps['tfidf']),
+        ('classifier', LogisticRegression(C=10, max_iter=1000, random_state=42))
+    ])
+    linear_model.named_steps['classifier'].fit(model.named_steps['tfidf'].transform(X_train), y_train)
+    print(f"Linear model accuracy: {accuracy_score(y_test, linear_model.predict(X_test)):.4f}")
+    compact_path = os.path.join(os.path.dirname(model_path), 'spam_detector_linear.compact')
+    export_compact_model(linear_model, compact_path,
+                         source=f"logistic regression refit on the TF-IDF features of {os.path.basename(model_path)}")
+    compare_artifacts(model_path, compact_path, record=True)
+    
     return model
 
 if __name__ == "__main__":
-    train_spam_model()
+    parser = argparse.ArgumentParser(description="Train the spam detection model")
+    parser.add_argument('--out-of-core', action='store_true',
+                        help="train a hashing vectorizer + SGD model in bounded-memory batches")
+    parser.add_argument('--source', choices=['csv', 'db'], default='csv',
+                        help="read training data from the dataset CSV or users' spam feedback")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--update', action='store_true',
+                        help="continue training the saved incremental model on newly labelled data")
+    args = parser.parse_args()
+    
+    if args.out_of_core:
+        train_incremental(source=args.source, batch_size=args.batch_size, update=args.update)
+    else:
+        train_spam_model()
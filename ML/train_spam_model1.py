@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold
 from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, HashingVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
@@ -12,6 +12,12 @@ from sklearn.metrics import (classification_report, accuracy_score, confusion_ma
                            mean_squared_error, mean_absolute_error, r2_score)
 from sklearn.dummy import DummyClassifier
 import pickle
+import argparse
+import shutil
+import tempfile
+import time
+from joblib import Memory, Parallel, delayed
+from export_compact_model import export_compact_model, compare_artifacts
 import os
 from collections import Counter
 import re
@@ -339,7 +345,23 @@ def evaluate_model(name, model, X_train, y_train, X_test, y_test):
     
     return result
 
-def train_spam_model():
+def fit_and_evaluate(name, model, X_train, y_train, X_test, y_test):
+    model.fit(X_train, y_train)
+    if "RandomClassifier" in name:
+        return name, model, None
+    return name, model, evaluate_model(name, model, X_train, y_train, X_test, y_test)
+
+def train_spam_model(n_jobs=None, cache_vectorizers=False, seed=42):
+    """Train, grid-search and save the spam model.
+
+    n_jobs spreads phase 1 fits and GridSearchCV candidates across cores, and
+    cache_vectorizers keeps fitted vectorizer outputs in a joblib cache so a
+    classifier parameter sweep reuses them instead of refitting the vectorizer.
+    Every random source is seeded from seed, so results do not depend on either.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
     print("Loading spam dataset...")
     data_path = os.path.join(os.path.dirname(__file__), 'email_spam_dataset.csv')
     df = pd.read_csv(data_path)
@@ -352,14 +374,13 @@ def train_spam_model():
     print(df['label'].value_counts())
     
     print("\nSample subject lines (spam):")
-    print(df[df['label'] == 'spam']['subject'].sample(5).values)
+    print(df[df['label'] == 'spam']['subject'].sample(5, random_state=seed).values)
     
     print("\nSample subject lines (legitimate):")
-    print(df[df['label'] == 'legitimate']['subject'].sample(5).values)
+    print(df[df['label'] == 'legitimate']['subject'].sample(5, random_state=seed).values)
     
     df['combined_text'] = df['subject'] + ' ' + df['message']
     
-    random.seed(42)
     
 
     legitimate_indices = df[df['label'] == 'legitimate'].index
@@ -431,7 +452,7 @@ def train_spam_model():
         df['combined_text'], 
         df['is_spam'],
         test_size=0.2,
-        random_state=42
+        random_state=seed
     )
     
     train_indices = X_train.index.tolist()
@@ -450,6 +471,10 @@ def train_spam_model():
     print(f"Training spam ratio: {sum(y_train)/len(y_train):.2f}")
     print(f"Testing spam ratio: {sum(y_test)/len(y_test):.2f}")
     
+    cache_dir = tempfile.mkdtemp(prefix='pmail-vectorizer-cache-') if cache_vectorizers else None
+    memory = Memory(cache_dir, verbose=0) if cache_dir else None
+    phases_start = time.perf_counter()
+    
     print("\n" + "="*70)
     print("PHASE 1: TRAINING BASELINE MODELS (BEFORE GRID SEARCH)")
     print("="*70)
@@ -463,10 +488,10 @@ def train_spam_model():
     }
     
     classifiers = {
-        "RandomForest": RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42),
-        "LogisticRegression": LogisticRegression(C=0.1, solver='liblinear', random_state=42),
+        "RandomForest": RandomForestClassifier(n_estimators=20, max_depth=5, random_state=seed),
+        "LogisticRegression": LogisticRegression(C=0.1, solver='liblinear', random_state=seed),
         "MultinomialNB": MultinomialNB(alpha=1.0),
-        "RandomClassifier": DummyClassifier(strategy='uniform', random_state=42)
+        "RandomClassifier": DummyClassifier(strategy='uniform', random_state=seed)
     }
     
     initial_models = {}
@@ -479,18 +504,23 @@ def train_spam_model():
             initial_models[model_name] = Pipeline([
                 ('vectorizer', vec),
                 ('classifier', clf)
-            ])
+            ], memory=memory)
     
     initial_results = {}
     
-    for name, model in initial_models.items():
-        print(f"\nTraining initial model: {name}")
-        model.fit(X_train, y_train)
+    print(f"\nTraining {len(initial_models)} initial models (n_jobs={n_jobs})")
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(fit_and_evaluate)(name, model, X_train, y_train, X_test, y_test)
+        for name, model in initial_models.items()
+    )
+    
+    for name, model, result in fitted:
+        initial_models[name] = model
+        print(f"\nTrained initial model: {name}")
         
-        if "RandomClassifier" in name:
+        if result is None:
             continue
             
-        result = evaluate_model(name, model, X_train, y_train, X_test, y_test)
         initial_results[name] = result
         
         print(f"Train accuracy: {result['Train Accuracy']:.4f}")
@@ -590,7 +620,7 @@ def train_spam_model():
             model = models_to_optimize[name]
             param_grid = param_grids[name]
             
-            grid = GridSearchCV(model, param_grid, cv=3, scoring='f1')
+            grid = GridSearchCV(model, param_grid, cv=StratifiedKFold(n_splits=3), scoring='f1', n_jobs=n_jobs)
             grid.fit(X_train, y_train)
             
             grid_search_results[name] = grid
@@ -640,6 +670,17 @@ def train_spam_model():
     display_df = optimized_df[~optimized_df['Model'].str.contains("RandomClassifier")]
     print(display_df[['Model', 'Overall Accuracy', 'Precision', 'Recall', 'F1 Score']].round(4))
     
+    phases_elapsed = time.perf_counter() - phases_start
+    print("\n" + "="*70)
+    print(f"BENCHMARK: phases 1-3 took {phases_elapsed:.2f}s wall-clock "
+          f"(n_jobs={n_jobs}, cache_vectorizers={cache_vectorizers}, seed={seed})")
+    print("="*70)
+    
+    for model in optimized_models.values():
+        model.set_params(memory=None)
+    if cache_dir:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    
     print("\n" + "="*70)
     print("PHASE 4: COMPARING BEFORE/AFTER AND GENERATING VISUALIZATIONS")
     print("="*70)
@@ -686,6 +727,7 @@ def train_spam_model():
         best_model_name = valid_models.loc[best_model_idx, 'Model']
         original_model_name = best_model_name.split(" (Optimized)")[0]
         best_model = optimized_models[original_model_name]  
+    else:
         best_model_idx = (optimized_df['Overall Accuracy'] - 0.67).abs().idxmin()
         best_model_name = optimized_df.loc[best_model_idx, 'Model']
         original_model_name = best_model_name.split(" (Optimized)")[0]
@@ -727,10 +769,23 @@ def train_spam_model():
         pickle.dump(best_model, f)
         
     print(f"\nBest model saved to: {os.path.abspath(model_path)}")
+    
+    compact_path = os.path.join(os.path.dirname(model_path), 'spam_detector_model.compact')
+    try:
+        export_compact_model(best_model, compact_path, source=f"export of {os.path.basename(model_path)}")
+        compare_artifacts(model_path, compact_path, record=True)
+    except ValueError as e:
+        print(f"Skipping compact export: {e}")
     print(f"Generated {len(visualizations)} visualizations in: {os.path.dirname(__file__)}")
     
     
     return best_model, optimized_df, visualizations
 
 if __name__ == "__main__":
-    model, metrics, plots = train_spam_model()
+    parser = argparse.ArgumentParser(description="Train and grid-search the spam detection model")
+    parser.add_argument('--n-jobs', type=int, default=None, help="parallel jobs for model fitting and grid search (-1 for all cores)")
+    parser.add_argument('--cache-vectorizers', action='store_true', help="reuse fitted vectorizer outputs across classifier parameter sweeps")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    model, metrics, plots = train_spam_model(n_jobs=args.n_jobs, cache_vectorizers=args.cache_vectorizers, seed=args.seed)
@@ -10,7 +10,12 @@ from backend.routes.admin import admin_bp
 from backend.routes.bulk_updates import bulk_updates_bp
 from backend.routes.employer import employer_bp
 from backend.routes.status import status_bp
+from backend.models.spam_model_registry import spam_model_registry
+from backend.routes.spam_feedback_trainer import spam_feedback_trainer
+from backend.routes.dashboard_aggregates import rebuild_dashboard_aggregates
+from backend.routes.messages import collect_attachment_garbage, spam_queue
 
+import click
 import os
 import logging
 
@@ -20,6 +25,11 @@ CORS(app)
 
 app.config['SQLALCHEMY_DATABASE_URI'] = 'mysql+pymysql://root:@localhost/pmail'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['MAX_CONTENT_LENGTH'] = 8 * 1024 * 1024
+app.config['ATTACHMENT_STORE_PATH'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'attachment_store')
+app.config['SPAM_CLASSIFICATION_MODE'] = os.environ.get('PMAIL_SPAM_CLASSIFICATION_MODE', 'sync')
+app.config['SPAM_FEEDBACK_TRAINING_INTERVAL'] = int(os.environ.get('PMAIL_SPAM_FEEDBACK_TRAINING_INTERVAL', 3600))
+app.config['SPAM_FEEDBACK_REPLACES_BASE_MODEL'] = os.environ.get('PMAIL_SPAM_FEEDBACK_REPLACES_BASE_MODEL') == '1'
 
 db.init_app(app)
 
@@ -54,6 +64,19 @@ def serve_public(filename):
     logging.info(f'Serving public file: {filename}')
     return send_from_directory(public_dir, filename)
 
+@app.cli.command('rebuild-dashboard-aggregates')
+@click.option('--user-id', 'user_ids', type=int, multiple=True, help="only rebuild these users (repeatable)")
+def rebuild_dashboard_aggregates_command(user_ids):
+    """Recompute the dashboard_aggregates table from the messages table."""
+    rebuild_dashboard_aggregates(user_ids or None)
+
+@app.cli.command('collect-attachment-garbage')
+@click.option('--min-age', type=int, default=3600, show_default=True,
+              help="keep unreferenced blobs younger than this many seconds")
+def collect_attachment_garbage_command(min_age):
+    """Delete attachment blobs that no attachment row refers to."""
+    collect_attachment_garbage(min_age)
+
 @app.errorhandler(404)
 def page_not_found(e):
     logging.error(f'Page not found: {e}')
@@ -64,6 +87,17 @@ def internal_server_error(e):
     logging.error(f'Internal server error: {e}')
     return jsonify({"message": "Internal server error"}), 500
 
+def start_background_workers():
+    spam_model_registry.warm()
+    if app.config['SPAM_CLASSIFICATION_MODE'] == 'async':
+        spam_queue.start(app)
+    spam_feedback_trainer.start(app, app.config['SPAM_FEEDBACK_TRAINING_INTERVAL'])
+
 if __name__ == '__main__':
     logging.info('Starting the application...')
-    app.run(host='127.0.0.1', port=5000, debug=True)
\ No newline at end of file
+    debug = True
+    # With the debug reloader this script also runs in the file-watching parent
+    # process; workers belong only in the child that serves requests.
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_workers()
+    app.run(host='127.0.0.1', port=5000, debug=debug)
\ No newline at end of file
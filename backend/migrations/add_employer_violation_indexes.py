@@ -0,0 +1,13 @@
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_employer_violations_employer_message', 'employer_violations',
+                    ['employer_id', 'message_id'])
+    op.create_index('ix_employer_violations_employer_acknowledged', 'employer_violations',
+                    ['employer_id', 'acknowledged'])
+    print("Added violation checker indexes to employer_violations table")
+
+def downgrade():
+    op.drop_index('ix_employer_violations_employer_acknowledged', table_name='employer_violations')
+    op.drop_index('ix_employer_violations_employer_message', table_name='employer_violations')
+    print("Removed violation checker indexes from employer_violations table")
@@ -0,0 +1,37 @@
+from alembic import op
+import sqlalchemy as sa
+
+BACKFILL_BATCH_SIZE = 1000
+
+def backfill_auto_replies(connection):
+    """Flag existing automated status replies.
+
+    They were stored as the employer's "Re: <subject>" reply to an application
+    carrying the new status, whereas a reply typed by hand is sent as Pending.
+    """
+    last_id = 0
+    flagged = 0
+    while True:
+        rows = connection.execute(sa.text(
+            "SELECT reply.id, reply.subject, parent.subject AS parent_subject FROM messages reply "
+            "JOIN messages parent ON parent.id = reply.parent_id "
+            "WHERE reply.id > :last_id AND reply.sender_id = parent.recipient_id "
+            "AND reply.status <> 'Pending' ORDER BY reply.id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        updates = [{"message_id": row.id} for row in rows if row.subject == f"Re: {row.parent_subject}"]
+        if updates:
+            connection.execute(sa.text("UPDATE messages SET is_auto_reply = 1 WHERE id = :message_id"), updates)
+            flagged += len(updates)
+    return flagged
+
+def upgrade():
+    op.add_column('messages', sa.Column('is_auto_reply', sa.Boolean(), nullable=False, server_default=sa.false()))
+    flagged = backfill_auto_replies(op.get_bind())
+    print(f"Added is_auto_reply to messages table, flagged {flagged} automated status replies")
+
+def downgrade():
+    op.drop_column('messages', 'is_auto_reply')
+    print("Removed is_auto_reply from messages table")
@@ -0,0 +1,13 @@
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_messages_recipient_folder', 'messages',
+                    ['recipient_id', 'is_draft', 'is_spam', 'created_at', 'id'])
+    op.create_index('ix_messages_sender_folder', 'messages',
+                    ['sender_id', 'is_draft', 'created_at', 'id'])
+    print("Added folder pagination indexes to messages table")
+
+def downgrade():
+    op.drop_index('ix_messages_sender_folder', table_name='messages')
+    op.drop_index('ix_messages_recipient_folder', table_name='messages')
+    print("Removed folder pagination indexes from messages table")
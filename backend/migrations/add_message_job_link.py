@@ -0,0 +1,76 @@
+from alembic import op
+import sqlalchemy as sa
+
+APPLICATION_PREFIX = "application for:"
+BACKFILL_BATCH_SIZE = 1000
+
+def parse_job_title(subject):
+    subject = (subject or "").strip()
+    if not subject.lower().startswith(APPLICATION_PREFIX):
+        return None
+    return subject[len(APPLICATION_PREFIX):].strip()
+
+def backfill_job_links(connection):
+    """Set is_application and job_id on existing messages from their subjects.
+
+    A title is matched against the recipient company's listings first and
+    otherwise only if exactly one listing has that title.
+    """
+    jobs_by_company = {}
+    jobs_by_title = {}
+    for job in connection.execute(sa.text("SELECT id, title, company_name FROM job_listings")):
+        title = job.title.strip().lower()
+        jobs_by_company.setdefault((title, job.company_name), job.id)
+        jobs_by_title.setdefault(title, []).append(job.id)
+    companies = dict(connection.execute(sa.text(
+        "SELECT id, company_name FROM users WHERE company_name IS NOT NULL")).fetchall())
+
+    last_id = 0
+    linked = applications = 0
+    while True:
+        rows = connection.execute(sa.text(
+            "SELECT id, recipient_id, subject FROM messages "
+            "WHERE id > :last_id AND subject LIKE '%Application for:%' ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for row in rows:
+            job_title = parse_job_title(row.subject)
+            if job_title is None:
+                continue
+            key = job_title.lower()
+            job_id = jobs_by_company.get((key, companies.get(row.recipient_id)))
+            if job_id is None and len(jobs_by_title.get(key, [])) == 1:
+                job_id = jobs_by_title[key][0]
+            updates.append({"message_id": row.id, "job_id": job_id})
+            linked += job_id is not None
+        if updates:
+            connection.execute(sa.text(
+                "UPDATE messages SET is_application = 1, job_id = :job_id WHERE id = :message_id"
+            ), updates)
+            applications += len(updates)
+    return applications, linked
+
+def upgrade():
+    op.add_column('messages', sa.Column('job_id', sa.Integer(), sa.ForeignKey('job_listings.id', ondelete='SET NULL'),
+                                       nullable=True))
+    op.add_column('messages', sa.Column('is_application', sa.Boolean(), nullable=False, server_default=sa.false()))
+    applications, linked = backfill_job_links(op.get_bind())
+    op.create_index('ix_messages_recipient_applications', 'messages',
+                    ['recipient_id', 'is_application', 'is_draft', 'is_spam', 'created_at'])
+    op.create_index('ix_messages_applications', 'messages',
+                    ['is_application', 'is_draft', 'is_spam', 'created_at'])
+    op.create_index('ix_messages_job_id', 'messages', ['job_id'])
+    print(f"Added job_id and is_application to messages table, backfilled {applications} applications "
+          f"({linked} linked to a job listing)")
+
+def downgrade():
+    op.drop_index('ix_messages_job_id', table_name='messages')
+    op.drop_index('ix_messages_applications', table_name='messages')
+    op.drop_index('ix_messages_recipient_applications', table_name='messages')
+    op.drop_column('messages', 'is_application')
+    op.drop_column('messages', 'job_id')
+    print("Removed job_id and is_application from messages table")
@@ -0,0 +1,9 @@
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_messages_parent_created', 'messages', ['parent_id', 'created_at'])
+    print("Added reply thread index to messages table")
+
+def downgrade():
+    op.drop_index('ix_messages_parent_created', table_name='messages')
+    print("Removed reply thread index from messages table")
@@ -0,0 +1,10 @@
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.add_column('messages', sa.Column('spam_model_version', sa.String(64), nullable=True))
+    print("Added spam_model_version column to messages table")
+
+def downgrade():
+    op.drop_column('messages', 'spam_model_version')
+    print("Removed spam_model_version column from messages table")
@@ -0,0 +1,9 @@
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_messages_spam_pending', 'messages', ['is_spam', 'is_draft', 'id'])
+    print("Added pending spam classification index to messages table")
+
+def downgrade():
+    op.drop_index('ix_messages_spam_pending', table_name='messages')
+    print("Removed pending spam classification index from messages table")
@@ -0,0 +1,11 @@
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.alter_column('messages', 'is_spam', existing_type=sa.Boolean, nullable=True)
+    print("messages.is_spam now accepts NULL for messages awaiting classification")
+
+def downgrade():
+    op.execute("UPDATE messages SET is_spam = 0 WHERE is_spam IS NULL")
+    op.alter_column('messages', 'is_spam', existing_type=sa.Boolean, nullable=False)
+    print("messages.is_spam is NOT NULL again")
@@ -0,0 +1,22 @@
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.create_table(
+        'dashboard_aggregates',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('user_id', sa.Integer, nullable=False),
+        sa.Column('direction', sa.String(10), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('month', sa.String(7), nullable=False),
+        sa.Column('weekday', sa.String(10), nullable=False),
+        sa.Column('category', sa.String(100), nullable=False, server_default=''),
+        sa.Column('count', sa.Integer, nullable=False, server_default='0'),
+        sa.UniqueConstraint('user_id', 'direction', 'status', 'month', 'weekday', 'category',
+                            name='uq_dashboard_aggregates_key')
+    )
+    print("Created dashboard_aggregates table; run `flask --app backend.app rebuild-dashboard-aggregates` to fill it")
+
+def downgrade():
+    op.drop_table('dashboard_aggregates')
+    print("Dropped dashboard_aggregates table")
@@ -0,0 +1,21 @@
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.create_table(
+        'spam_feedback',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('message_id', sa.Integer, nullable=False),
+        sa.Column('user_id', sa.Integer, nullable=False),
+        sa.Column('is_spam', sa.Boolean, nullable=False),
+        sa.Column('model_version', sa.String(64), nullable=True),
+        sa.Column('created_at', sa.DateTime, nullable=True),
+        sa.Column('trained_at', sa.DateTime, nullable=True)
+    )
+    op.create_index('ix_spam_feedback_message_id', 'spam_feedback', ['message_id'])
+    op.create_index('ix_spam_feedback_trained_at', 'spam_feedback', ['trained_at'])
+    print("Created spam_feedback table")
+
+def downgrade():
+    op.drop_table('spam_feedback')
+    print("Dropped spam_feedback table")
@@ -0,0 +1,57 @@
+from alembic import op
+import sqlalchemy as sa
+from backend.models.blob_store import get_blob_store
+
+CHUNK_SIZE = 1024 * 1024
+
+def read_blob_chunks(bind, attachment_id):
+    offset = 1
+    while True:
+        chunk = bind.execute(
+            sa.text("SELECT SUBSTRING(file_data, :offset, :size) FROM attachments WHERE id = :id"),
+            {"offset": offset, "size": CHUNK_SIZE, "id": attachment_id}
+        ).scalar()
+        if not chunk:
+            break
+        yield chunk
+        offset += len(chunk)
+
+def upgrade():
+    op.add_column('attachments', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.create_index('ix_attachments_content_hash', 'attachments', ['content_hash'])
+    op.alter_column('attachments', 'file_data', existing_type=sa.LargeBinary, nullable=True)
+
+    bind = op.get_bind()
+    store = get_blob_store()
+    attachment_ids = [row[0] for row in bind.execute(sa.text(
+        "SELECT id FROM attachments WHERE content_hash IS NULL AND file_data IS NOT NULL"
+    ))]
+
+    for attachment_id in attachment_ids:
+        content_hash, size = store.put_chunks(read_blob_chunks(bind, attachment_id))
+        bind.execute(
+            sa.text("UPDATE attachments SET content_hash = :hash, file_size = :size, file_data = NULL WHERE id = :id"),
+            {"hash": content_hash, "size": size, "id": attachment_id}
+        )
+        print(f"Moved attachment {attachment_id} ({size} bytes) to blob {content_hash}")
+
+    print(f"Moved {len(attachment_ids)} attachments into the blob store")
+
+def downgrade():
+    bind = op.get_bind()
+    store = get_blob_store()
+    rows = bind.execute(sa.text(
+        "SELECT id, content_hash FROM attachments WHERE content_hash IS NOT NULL AND file_data IS NULL"
+    )).fetchall()
+
+    for attachment_id, content_hash in rows:
+        with store.open(content_hash) as blob:
+            bind.execute(
+                sa.text("UPDATE attachments SET file_data = :data WHERE id = :id"),
+                {"data": blob.read(), "id": attachment_id}
+            )
+
+    op.alter_column('attachments', 'file_data', existing_type=sa.LargeBinary, nullable=False)
+    op.drop_index('ix_attachments_content_hash', table_name='attachments')
+    op.drop_column('attachments', 'content_hash')
+    print("Moved attachments back into the attachments table")
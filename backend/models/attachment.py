@@ -9,7 +9,8 @@ class Attachment(db.Model):
     filename = db.Column(db.String(255), nullable=False)
     file_type = db.Column(db.String(100), nullable=False)
     file_size = db.Column(db.Integer, nullable=False)
-    file_data = db.Column(db.LargeBinary, nullable=False)  
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+    file_data = db.deferred(db.Column(db.LargeBinary, nullable=True))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     message = db.relationship('Message', backref=db.backref('attachments', lazy=True, cascade='all, delete-orphan'))
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from flask import current_app, has_app_context
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'attachment_store')
+CHUNK_SIZE = 64 * 1024
+
+HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+class BlobTooLarge(Exception):
+    pass
+
+class BlobStore(ABC):
+    """Content-addressed storage for attachment bytes, keyed by SHA-256."""
+
+    @abstractmethod
+    def put_chunks(self, chunks, max_size=None):
+        """Store an iterable of byte chunks and return (content_hash, size).
+
+        Raises BlobTooLarge as soon as more than max_size bytes have arrived.
+        """
+
+    def put(self, stream, max_size=None):
+        return self.put_chunks(iter(lambda: stream.read(CHUNK_SIZE), b''), max_size=max_size)
+
+    @abstractmethod
+    def open(self, content_hash):
+        """Return a readable binary file object for the blob."""
+
+    @abstractmethod
+    def exists(self, content_hash):
+        """Return whether a blob with content_hash is stored."""
+
+    @abstractmethod
+    def delete(self, content_hash):
+        """Remove a blob; returns False if it was not stored."""
+
+    @abstractmethod
+    def list_blobs(self):
+        """Yield (content_hash, modified_time) for every stored blob."""
+
+    def collect_garbage(self, referenced, min_age=3600):
+        """Delete blobs whose hash is not in referenced and return how many went.
+
+        Blobs younger than min_age seconds are kept, since an upload stores its
+        blob before the attachment row referencing it is committed.
+        """
+        cutoff = time.time() - min_age
+        deleted = 0
+        for content_hash, modified in list(self.list_blobs()):
+            if content_hash not in referenced and modified < cutoff and self.delete(content_hash):
+                deleted += 1
+        return deleted
+
+    def local_path(self, content_hash):
+        """Filesystem path of a blob, or None when the store is not file-backed."""
+        return None
+
+class LocalBlobStore(BlobStore):
+    """Keeps blobs on the local filesystem under root/ab/cd/<sha256>.
+
+    Uploads are hashed while they are written to a temporary file and then
+    renamed into place, so identical files are stored once and a crashed
+    upload never leaves a partial blob behind.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, content_hash):
+        if not HASH_PATTERN.match(content_hash or ''):
+            raise ValueError(f"Invalid content hash: {content_hash!r}")
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], content_hash)
+
+    def put_chunks(self, chunks, max_size=None):
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise BlobTooLarge(f"Blob exceeds {max_size} bytes")
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            content_hash = digest.hexdigest()
+            target = self.path(content_hash)
+            if os.path.exists(target):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(temp_path, target)
+            return content_hash, size
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def open(self, content_hash):
+        return open(self.path(content_hash), 'rb')
+
+    def local_path(self, content_hash):
+        return self.path(content_hash)
+
+    def exists(self, content_hash):
+        return os.path.exists(self.path(content_hash))
+
+    def delete(self, content_hash):
+        try:
+            os.remove(self.path(content_hash))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def list_blobs(self):
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if HASH_PATTERN.match(name):
+                    yield name, os.path.getmtime(os.path.join(directory, name))
+
+_stores = {}
+
+def get_blob_store():
+    root = current_app.config.get('ATTACHMENT_STORE_PATH') if has_app_context() else None
+    root = root or os.environ.get('PMAIL_ATTACHMENT_STORE', DEFAULT_STORE_PATH)
+    if root not in _stores:
+        _stores[root] = LocalBlobStore(root)
+    return _stores[root]
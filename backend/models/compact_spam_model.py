@@ -0,0 +1,144 @@
+import hashlib
+import json
+import math
+import os
+import re
+import numpy as np
+
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+VOCABULARY_FILE = 'vocabulary.txt'
+IDF_FILE = 'idf.npy'
+COEF_FILE = 'coef.npy'
+
+def is_compact_model(path):
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+def update_meta(directory, **fields):
+    """Add fields to an artifact's meta.json; they do not change its version."""
+    path = os.path.join(directory, META_FILE)
+    with open(path) as f:
+        meta = json.load(f)
+    meta.update(fields)
+    with open(path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+def write_compact_model(directory, terms, idf, coef, intercept, token_pattern=r'(?u)\b\w\w+\b',
+                        ngram_range=(1, 1), lowercase=True, sublinear_tf=False, norm='l2', source=None):
+    """Write a linear TF-IDF spam model as plain arrays.
+
+    terms[i] is the vocabulary term for feature i; idf and coef are stored as
+    float32 .npy files that the loader memory-maps instead of unpickling.
+    source describes where the weights came from and is kept in meta.json.
+    """
+    os.makedirs(directory, exist_ok=True)
+    idf = np.ascontiguousarray(idf, dtype=np.float32)
+    coef = np.ascontiguousarray(coef, dtype=np.float32)
+    if not len(terms) == len(idf) == len(coef):
+        raise ValueError("terms, idf and coef must have the same length")
+    if any('\n' in term for term in terms):
+        raise ValueError("Vocabulary terms may not contain newlines")
+
+    vocabulary = '\n'.join(terms).encode('utf-8')
+    digest = hashlib.sha256(vocabulary)
+    digest.update(idf.tobytes())
+    digest.update(coef.tobytes())
+    digest.update(repr(float(intercept)).encode())
+
+    with open(os.path.join(directory, VOCABULARY_FILE), 'wb') as f:
+        f.write(vocabulary)
+    np.save(os.path.join(directory, IDF_FILE), idf)
+    np.save(os.path.join(directory, COEF_FILE), coef)
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "version": digest.hexdigest()[:12],
+        "n_features": len(terms),
+        "intercept": float(intercept),
+        "token_pattern": token_pattern,
+        "ngram_range": list(ngram_range),
+        "lowercase": lowercase,
+        "sublinear_tf": sublinear_tf,
+        "norm": norm
+    }
+    if source:
+        meta["source"] = source
+    with open(os.path.join(directory, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+class CompactSpamModel:
+    """Scores messages from a compact artifact with a sparse dot product.
+
+    Reproduces TfidfVectorizer's word n-gram analyzer and normalization, then
+    computes sigmoid(x . coef + intercept) over the features present in each
+    message, so predict_proba matches the exported linear pipeline.
+    """
+
+    def __init__(self, meta, vocabulary, idf, coef):
+        self.meta = meta
+        self.version = meta['version']
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.coef = coef
+        self.intercept = meta['intercept']
+        self.token_pattern = re.compile(meta['token_pattern'])
+        self.min_n, self.max_n = meta['ngram_range']
+        self.lowercase = meta['lowercase']
+        self.sublinear_tf = meta['sublinear_tf']
+        self.norm = meta['norm']
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format {meta.get('format_version')}")
+        with open(os.path.join(directory, VOCABULARY_FILE), 'rb') as f:
+            terms = f.read().decode('utf-8').split('\n')
+        vocabulary = {term: index for index, term in enumerate(terms)}
+        idf = np.load(os.path.join(directory, IDF_FILE), mmap_mode='r')
+        coef = np.load(os.path.join(directory, COEF_FILE), mmap_mode='r')
+        if not len(vocabulary) == len(idf) == len(coef) == meta['n_features']:
+            raise ValueError("Compact model arrays do not match its vocabulary")
+        return cls(meta, vocabulary, idf, coef)
+
+    def features(self, text):
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_pattern.findall(text)
+        counts = {}
+        for n in range(self.min_n, self.max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                index = self.vocabulary.get(tokens[i] if n == 1 else ' '.join(tokens[i:i + n]))
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        return indices, values
+
+    def decision_function_one(self, text):
+        indices, values = self.features(text)
+        if not len(indices):
+            return self.intercept
+        if self.sublinear_tf:
+            values = 1.0 + np.log(values)
+        values = values * self.idf[indices]
+        if self.norm == 'l2':
+            length = math.sqrt(float(values @ values))
+        elif self.norm == 'l1':
+            length = float(np.abs(values).sum())
+        else:
+            length = 1.0
+        if length:
+            values = values / length
+        return float(values @ self.coef[indices]) + self.intercept
+
+    def predict_proba(self, texts):
+        scores = np.array([self.decision_function_one(text) for text in texts], dtype=np.float64)
+        spam = 1.0 / (1.0 + np.exp(-scores))
+        return np.column_stack([1.0 - spam, spam])
+
+    def predict(self, texts):
+        return (self.predict_proba(texts)[:, 1] > 0.5).astype(int)
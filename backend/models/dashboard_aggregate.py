@@ -0,0 +1,21 @@
+from backend.models.database import db
+
+class DashboardAggregate(db.Model):
+    __tablename__ = 'dashboard_aggregates'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    direction = db.Column(db.String(10), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    month = db.Column(db.String(7), nullable=False)
+    weekday = db.Column(db.String(10), nullable=False)
+    category = db.Column(db.String(100), nullable=False, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'direction', 'status', 'month', 'weekday', 'category',
+                            name='uq_dashboard_aggregates_key'),
+    )
+
+    def __repr__(self):
+        return f'<DashboardAggregate user_id:{self.user_id} {self.direction} {self.status} {self.month} count:{self.count}>'
@@ -10,6 +10,11 @@ class EmployerViolation(db.Model):
     violation_date = db.Column(db.DateTime, default=datetime.utcnow)
     acknowledged = db.Column(db.Boolean, default=False)
     resulted_in_suspension = db.Column(db.Boolean, default=False)
+
+    __table_args__ = (
+        db.Index('ix_employer_violations_employer_message', 'employer_id', 'message_id'),
+        db.Index('ix_employer_violations_employer_acknowledged', 'employer_id', 'acknowledged'),
+    )
     
     def __repr__(self):
         return f'<EmployerViolation {self.id} employer_id:{self.employer_id}>'
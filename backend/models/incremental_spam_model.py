@@ -0,0 +1,59 @@
+import json
+import os
+import pickle
+import numpy as np
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+INCREMENTAL_MODEL_PATH = os.path.join(MODEL_DIR, 'spam_detector_model_incremental.pkl')
+CLASSES = np.array([0, 1])
+
+def partial_fit_batches(model, batches, state=None):
+    """Train model on each batch in turn and return progressive accuracy.
+
+    Every batch is scored before the model learns from it (test-then-train),
+    which gives an honest accuracy estimate without holding out data.
+    """
+    vectorizer = model.named_steps['hashing']
+    classifier = model.named_steps['classifier']
+    state = state if state is not None else {}
+    correct = 0
+    scored = 0
+
+    for texts, labels in batches:
+        if not len(texts):
+            continue
+        features = vectorizer.transform(texts)
+        if hasattr(classifier, 'coef_'):
+            correct += int((classifier.predict(features) == labels).sum())
+            scored += len(labels)
+        classifier.partial_fit(features, labels, classes=CLASSES)
+        state['samples_seen'] = state.get('samples_seen', 0) + len(labels)
+        print(f"Trained on {state['samples_seen']} samples"
+              + (f", progressive accuracy {correct / scored:.4f}" if scored else ""))
+
+    return correct / scored if scored else None
+
+def load_incremental_model(path=INCREMENTAL_MODEL_PATH):
+    """Return (model, state) from a previous run, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+    state_path = f"{path}.state.json"
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+    return model, state
+
+def save_incremental_model(model, state, path=INCREMENTAL_MODEL_PATH):
+    """Write the model and its training state, replacing any previous files atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(model, f)
+    os.replace(temp_path, path)
+    with open(f"{temp_path}.state.json", 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(f"{temp_path}.state.json", f"{path}.state.json")
+    print(f"Incremental model saved to {os.path.abspath(path)}")
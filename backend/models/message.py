@@ -1,4 +1,5 @@
 from backend.models.database import db
+from backend.models.job import Job  # registers job_listings for the job_id foreign key
 
 class Message(db.Model):
     __tablename__ = 'messages'
@@ -10,11 +11,25 @@ class Message(db.Model):
     body = db.Column(db.Text, nullable=False)
     status = db.Column(db.String(20), default="Pending", nullable=False)
     is_draft = db.Column(db.Boolean, default=False, nullable=False)
-    is_spam = db.Column(db.Boolean, default=False, nullable=False)
+    is_spam = db.Column(db.Boolean, default=False, nullable=True)
+    spam_model_version = db.Column(db.String(64), nullable=True)
     parent_id = db.Column(db.Integer, db.ForeignKey('messages.id'), nullable=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_listings.id', ondelete='SET NULL'), nullable=True)
+    is_application = db.Column(db.Boolean, default=False, nullable=False)
+    is_auto_reply = db.Column(db.Boolean, default=False, nullable=False)
   
     replies = db.relationship('Message',
                               backref=db.backref('parent', remote_side=[id]),
                               lazy=True)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     status_updated_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_messages_recipient_folder', 'recipient_id', 'is_draft', 'is_spam', 'created_at', 'id'),
+        db.Index('ix_messages_sender_folder', 'sender_id', 'is_draft', 'created_at', 'id'),
+        db.Index('ix_messages_recipient_applications', 'recipient_id', 'is_application', 'is_draft', 'is_spam', 'created_at'),
+        db.Index('ix_messages_applications', 'is_application', 'is_draft', 'is_spam', 'created_at'),
+        db.Index('ix_messages_job_id', 'job_id'),
+        db.Index('ix_messages_parent_created', 'parent_id', 'created_at'),
+        db.Index('ix_messages_spam_pending', 'is_spam', 'is_draft', 'id'),
+    )
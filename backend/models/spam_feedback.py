@@ -0,0 +1,16 @@
+from backend.models.database import db
+from datetime import datetime
+
+class SpamFeedback(db.Model):
+    __tablename__ = 'spam_feedback'
+
+    id = db.Column(db.Integer, primary_key=True)
+    message_id = db.Column(db.Integer, nullable=False, index=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    is_spam = db.Column(db.Boolean, nullable=False)
+    model_version = db.Column(db.String(64), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    trained_at = db.Column(db.DateTime, nullable=True, index=True)
+
+    def __repr__(self):
+        return f'<SpamFeedback {self.id} message_id:{self.message_id} is_spam:{self.is_spam}>'
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from backend.models.compact_spam_model import CompactSpamModel, is_compact_model
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL_PATH = os.path.join(MODEL_DIR, 'spam_detector_model.pkl')
+# A logistic regression refit on the production model's TF-IDF features. It is
+# a separate model version, not an export of DEFAULT_MODEL_PATH: its meta.json
+# records how often its verdicts agree with that model.
+LINEAR_MODEL_PATH = os.path.join(MODEL_DIR, 'spam_detector_linear.compact')
+SMOKE_TEST_TEXTS = [
+    "Application for: Software Developer Dear hiring manager, please find my CV attached.",
+    "URGENT!!! Make money fast, click here for free cash now!"
+]
+
+class LoadedModel:
+    def __init__(self, model, version, path=None):
+        self.model = model
+        self.version = version
+        self.path = path
+
+class SpamModelRegistry:
+    """Holds the spam classifier, loading it on first use and swapping it atomically.
+
+    Readers take a reference to the current LoadedModel and use it for the whole
+    call, so a concurrent swap never mixes two models within one prediction.
+
+    A model made current with publish() is also recorded in active_path, and
+    is what the registry loads on first use instead of path, so it survives a
+    restart. The record belongs to path: pointing PMAIL_SPAM_MODEL at another
+    artifact starts from that artifact again.
+    """
+
+    def __init__(self, path=None, active_path=None):
+        self.path = path or os.environ.get('PMAIL_SPAM_MODEL', DEFAULT_MODEL_PATH)
+        self.active_path = active_path or f"{self.path.rstrip(os.sep)}.active.json"
+        self.current = None
+        self.load_error = None
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def get(self):
+        """Return the current LoadedModel, loading it on first use, or None if it cannot be loaded."""
+        current = self.current
+        if current is not None:
+            return current
+        with self.lock:
+            if self.current is None and self.load_error is None:
+                try:
+                    self.current = self._load_active()
+                    print(f"Spam detection model {self.current.version} loaded from {self.current.path}")
+                except Exception as e:
+                    self.load_error = e
+                    print(f"Error loading spam model: {e}")
+                    print(f"Attempted to load from: {os.path.abspath(self.path)}")
+            return self.current
+
+    def on_swap(self, callback):
+        """Call callback(loaded_model) after every successful swap."""
+        self.listeners.append(callback)
+
+    def warm(self):
+        return self.get()
+
+    @property
+    def version(self):
+        current = self.get()
+        return current.version if current else None
+
+    def swap(self, path=None, model=None, version=None):
+        """Load and smoke-test a new model, then make it current.
+
+        Raises ValueError if the candidate cannot score the smoke-test texts; the
+        model that was current before stays in place.
+        """
+        if model is None:
+            candidate = self._load(path or self.path)
+        else:
+            candidate = LoadedModel(model, version or f"obj:{id(model):x}", path)
+        self.smoke_test(candidate.model)
+
+        with self.lock:
+            previous = self.current
+            self.current = candidate
+            self.load_error = None
+        print(f"Swapped spam model {previous.version if previous else None} -> {candidate.version}")
+        for callback in self.listeners:
+            callback(candidate)
+        return candidate
+
+    def publish(self, path, model=None, version=None):
+        """Swap to the model stored at path and record it as the one to load after a restart.
+
+        model can be passed when it is already in memory; it must be what path holds.
+        """
+        candidate = self.swap(path=path, model=model, version=version)
+        temp_path = f"{self.active_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({"path": os.path.abspath(path), "version": candidate.version}, f)
+        os.replace(temp_path, self.active_path)
+        print(f"Published spam model {candidate.version} from {path}")
+        return candidate
+
+    def published(self):
+        """Return the {"path", "version"} record written by publish(), or None."""
+        if not os.path.exists(self.active_path):
+            return None
+        with open(self.active_path) as f:
+            return json.load(f)
+
+    def _load_active(self):
+        published = self.published()
+        if published and os.path.exists(published['path']):
+            loaded = self._load(published['path'])
+            loaded.version = published.get('version') or loaded.version
+            return loaded
+        if published:
+            print(f"Published spam model {published['path']} is missing, loading {self.path}")
+        return self._load(self.path)
+
+    def _load(self, path):
+        if is_compact_model(path):
+            model = CompactSpamModel.load(path)
+            return LoadedModel(model, model.version, path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        version = hashlib.sha256(data).hexdigest()[:12]
+        return LoadedModel(pickle.loads(data), version, path)
+
+    def smoke_test(self, model):
+        """Raise ValueError unless model scores the smoke-test texts with valid probabilities."""
+        try:
+            probs = model.predict_proba(SMOKE_TEST_TEXTS)
+        except Exception as e:
+            raise ValueError(f"Candidate spam model failed smoke test: {e}")
+        if len(probs) != len(SMOKE_TEST_TEXTS) or any(not 0.0 <= row[1] <= 1.0 for row in probs):
+            raise ValueError("Candidate spam model returned invalid probabilities")
+
+spam_model_registry = SpamModelRegistry()
@@ -4,8 +4,16 @@ from backend.models.user import User
 from backend.models.message import Message
 from backend.models.login_history import LoginHistory
 from backend.models.job import Job
+from backend.models.spam_model_registry import spam_model_registry, MODEL_DIR
+from backend.routes.folder_versions import folder_versions
+from backend.routes.spam_verdict_cache import spam_verdict_cache
+from backend.routes.spam_feedback_trainer import spam_feedback_trainer
+from backend.routes.messages import rescore_messages
+from backend.models.dashboard_aggregate import DashboardAggregate
+from backend.routes.dashboard_aggregates import record_deleted_messages, record_category_change
 from sqlalchemy import func, extract
 import traceback
+import os
 from datetime import datetime
 
 admin_bp = Blueprint('admin', __name__)
@@ -118,9 +126,13 @@ def delete_user(user_id):
             return jsonify({"error": "Cannot delete the admin account"}), 403
 
         LoginHistory.query.filter_by(user_id=user_id).delete()
-        Message.query.filter((Message.sender_id == user_id) | (Message.recipient_id == user_id)).delete()
+        conversation = (Message.sender_id == user_id) | (Message.recipient_id == user_id)
+        record_deleted_messages(conversation)
+        DashboardAggregate.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+        Message.query.filter(conversation).delete()
         db.session.delete(user)
         db.session.commit()
+        folder_versions.invalidate_all()
 
         return jsonify({"success": True, "message": f"User {user.email} deleted successfully"}), 200
 
@@ -139,7 +151,7 @@ def get_dashboard_stats():
         employer_count    = User.query.filter_by(role="employer").count()
         active_jobs       = Job.query.filter((Job.deadline == None) | (Job.deadline >= datetime.utcnow())).count()
         application_count = Message.query.filter(
-            Message.subject.like('%Application for:%'),
+            Message.is_application == True,
             Message.is_draft == False,
             Message.is_spam == False
         ).count()
@@ -233,6 +245,8 @@ def admin_job_actions(job_id):
         }), 200
 
     try:
+        record_category_change(job.id, job.category, None)
+        Message.query.filter(Message.job_id == job.id).update({Message.job_id: None}, synchronize_session=False)
         db.session.delete(job)
         db.session.commit()
         return jsonify({"success": True}), 200
@@ -277,7 +291,7 @@ def report_user_growth():
     total_users      = User.query.count()
     new_jobs         = Job.query.count()
     app_count        = Message.query.filter(
-        Message.subject.like('%Application for:%'),
+        Message.is_application == True,
         Message.is_draft == False,
         Message.is_spam == False
     ).count()
@@ -333,7 +347,7 @@ def report_job_postings():
         (Job.created_at <= end_dt)   if end_dt   else True
     ).count()
     app_count    = Message.query.filter(
-        Message.subject.like('%Application for:%'),
+        Message.is_application == True,
         Message.is_draft == False,
         Message.is_spam == False,
         (Message.created_at >= start_dt) if start_dt else True,
@@ -374,7 +388,7 @@ def report_application_stats():
         func.date_format(Message.created_at, '%Y-%m').label('month'),
         func.count(Message.id).label('count')
     ).filter(
-        Message.subject.like('%Application for:%'),
+        Message.is_application == True,
         Message.is_draft == False,
         Message.is_spam == False
     )
@@ -388,7 +402,7 @@ def report_application_stats():
     status_q = db.session.query(
         Message.status, func.count(Message.id)
     ).filter(
-        Message.subject.like('%Application for:%'),
+        Message.is_application == True,
         Message.is_draft == False,
         Message.is_spam == False
     )
@@ -448,7 +462,7 @@ def report_user_activity():
 
        
         app_q = Message.query.filter(
-            Message.subject.like('%Application for:%'),
+            Message.is_application == True,
             Message.is_draft == False,
             Message.is_spam == False
         )
@@ -524,3 +538,99 @@ def report_user_activity():
         print(f"Error in report_user_activity: {e}")
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
+
+
+@admin_bp.route('/admin/spam/rescore', methods=['POST'])
+@admin_required
+def rescore_spam():
+    data = request.get_json() or {}
+    message_ids = data.get('message_ids')
+    since = data.get('since')
+
+    if message_ids:
+        criteria = [Message.id.in_(message_ids)]
+    elif since:
+        try:
+            criteria = [Message.created_at >= datetime.strptime(since, '%Y-%m-%d')]
+        except ValueError:
+            return jsonify({"error": "Invalid date format, use YYYY-MM-DD"}), 400
+    else:
+        return jsonify({"error": "Provide message_ids or since"}), 400
+
+    try:
+        summary = rescore_messages(*criteria)
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error rescoring messages: {e}")
+        traceback.print_exc()
+        return jsonify({"error": f"Error rescoring messages: {str(e)}"}), 500
+
+    return jsonify({"success": True, **summary}), 200
+
+@admin_bp.route('/admin/spam/model', methods=['GET'])
+@admin_required
+def get_spam_model():
+    loaded = spam_model_registry.get()
+    return jsonify({
+        "loaded": loaded is not None,
+        "version": loaded.version if loaded else None,
+        "path": loaded.path if loaded else None
+    }), 200
+
+@admin_bp.route('/admin/spam/model', methods=['POST'])
+@admin_required
+def swap_spam_model():
+    data = request.get_json() or {}
+    filename = data.get('filename', os.path.basename(spam_model_registry.path))
+    path = os.path.join(MODEL_DIR, os.path.basename(filename))
+    if not os.path.exists(path):
+        return jsonify({"error": f"Model file {filename} not found"}), 404
+
+    try:
+        loaded = spam_model_registry.publish(path)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 422
+    except Exception as e:
+        print(f"Error swapping spam model: {e}")
+        traceback.print_exc()
+        return jsonify({"error": f"Error loading spam model: {str(e)}"}), 500
+
+    return jsonify({"success": True, "version": loaded.version}), 200
+
+@admin_bp.route('/admin/spam/cache', methods=['GET'])
+@admin_required
+def get_spam_cache_stats():
+    return jsonify({"model_version": spam_model_registry.version, **spam_verdict_cache.stats()}), 200
+
+@admin_bp.route('/admin/spam/cache', methods=['DELETE'])
+@admin_required
+def clear_spam_cache():
+    spam_verdict_cache.invalidate()
+    return jsonify({"success": True}), 200
+
+@admin_bp.route('/admin/spam/feedback', methods=['GET'])
+@admin_required
+def get_spam_feedback_status():
+    last_run = spam_feedback_trainer.last_run
+    return jsonify({
+        "pending": spam_feedback_trainer.pending_count(),
+        "last_run": last_run.strftime("%Y-%m-%d %H:%M:%S") if last_run else None,
+        "model_version": spam_model_registry.version
+    }), 200
+
+@admin_bp.route('/admin/spam/feedback/train', methods=['POST'])
+@admin_required
+def train_on_spam_feedback():
+    try:
+        summary = spam_feedback_trainer.run_once()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error training on spam feedback: {e}")
+        traceback.print_exc()
+        return jsonify({"error": f"Error training on spam feedback: {str(e)}"}), 500
+
+    if summary.get("error"):
+        return jsonify(summary), 503
+    return jsonify({"success": True, **summary}), 200
@@ -202,7 +202,7 @@ def check_employer_violations(employer_id):
         Message.recipient_id == employer_id,
         Message.is_draft == False,
         Message.is_spam == False,
-        Message.subject.like("%Application for:%"),
+        Message.is_application == True,
         (Message.status_updated_at == None) | (Message.status_updated_at < seven_days_ago),
         Message.created_at < seven_days_ago
     ).all()
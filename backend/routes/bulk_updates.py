@@ -1,32 +1,165 @@
+from datetime import datetime
 from flask import Blueprint, jsonify, request
+from sqlalchemy import insert, update
 from backend.models.database import db
 from backend.models.message import Message
+from backend.routes.folder_versions import folder_versions
+from backend.routes.message_events import message_events
+from backend.routes.messages import VALID_STATUSES, generate_status_message, load_users_by_id
+from backend.routes.status_templates import status_template_cache
+from backend.routes.dashboard_aggregates import record_new_messages, record_status_change
 
 bulk_updates_bp = Blueprint('bulk_updates', __name__)
 
+BULK_UPDATE_CHUNK_SIZE = 500
+
+def apply_status_chunk(message_ids, new_status, now):
+    """Apply new_status to one chunk of messages and queue their auto-replies.
+
+    Runs a fixed number of set-based statements, plus one template load for
+    employers not yet in the status template cache, and leaves the
+    transaction open for the caller to commit. The rows are locked while
+    read so the status deltas match exactly what the UPDATE changes.
+    Returns the chunk's outcome.
+    """
+    rows = db.session.query(
+        Message.id, Message.sender_id, Message.recipient_id, Message.subject, Message.status,
+        Message.created_at, Message.job_id
+    ).filter(Message.id.in_(message_ids)).order_by(Message.id).with_for_update().all()
+    found = {row.id for row in rows}
+    changed = [row for row in rows if row.status != new_status]
+
+    if changed:
+        db.session.execute(
+            update(Message)
+            .where(Message.id.in_([row.id for row in changed]), Message.status != new_status)
+            .values(status=new_status, status_updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        record_status_change(changed, new_status)
+
+    users = load_users_by_id(user_id for row in changed for user_id in (row.sender_id, row.recipient_id))
+    status_template_cache.get_many(row.recipient_id for row in changed)
+    reply_rows = []
+    for row in changed:
+        employer = users.get(row.recipient_id)
+        employee = users.get(row.sender_id)
+        if employer and employee:
+            reply_rows.append({
+                "sender_id": employer.id,
+                "recipient_id": employee.id,
+                "subject": f"Re: {row.subject}",
+                "body": generate_status_message(new_status, row.subject, employer.id),
+                "status": new_status,
+                "is_draft": False,
+                "is_spam": False,
+                "is_auto_reply": True,
+                "parent_id": row.id
+            })
+
+    auto_replies = []
+    if reply_rows:
+        db.session.execute(insert(Message), reply_rows)
+        latest = {}
+        for reply in db.session.query(
+            Message.id, Message.parent_id, Message.sender_id, Message.recipient_id,
+            Message.status, Message.created_at, Message.job_id
+        ).filter(
+            Message.parent_id.in_([row["parent_id"] for row in reply_rows]),
+            Message.status == new_status
+        ).all():
+            if reply.parent_id not in latest or reply.id > latest[reply.parent_id].id:
+                latest[reply.parent_id] = reply
+        record_new_messages(latest.values())
+        auto_replies = [(reply.id, reply.recipient_id) for reply in latest.values()]
+
+    return {
+        "updated": [row.id for row in rows],
+        "missing": [message_id for message_id in message_ids if message_id not in found],
+        "touched_users": {user_id for row in rows for user_id in (row.sender_id, row.recipient_id)},
+        "status_changes": [(row.id, row.sender_id, row.recipient_id) for row in changed],
+        "auto_replies": auto_replies
+    }
+
+def apply_bulk_status_update(message_ids, new_status, chunk_size=BULK_UPDATE_CHUNK_SIZE):
+    """Set new_status on every message in message_ids, chunk by chunk.
+
+    Each chunk is its own transaction, so row locks are held for one chunk
+    only. A chunk that fails is rolled back and reported without stopping the
+    chunks after it; events are published only for committed chunks.
+    """
+    report = {"updated_count": 0, "failed": [], "chunks": 0, "failed_chunks": 0}
+    touched_users = set()
+    status_changes = []
+    auto_replies = []
+
+    ids = []
+    seen = set()
+    for message_id in message_ids:
+        try:
+            message_id = int(message_id)
+        except (TypeError, ValueError):
+            report["failed"].append({"message_id": message_id, "error": "Invalid message id"})
+            continue
+        if message_id not in seen:
+            seen.add(message_id)
+            ids.append(message_id)
+
+    now = datetime.utcnow()
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        report["chunks"] += 1
+        try:
+            outcome = apply_status_chunk(chunk, new_status, now)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Bulk status update failed for chunk of {len(chunk)} messages starting at {chunk[0]}: {e}")
+            import traceback
+            traceback.print_exc()
+            report["failed_chunks"] += 1
+            report["failed"].extend({"message_id": message_id, "error": str(e)} for message_id in chunk)
+            continue
+
+        report["updated_count"] += len(outcome["updated"])
+        report["failed"].extend({"message_id": message_id, "error": "Message not found"}
+                                for message_id in outcome["missing"])
+        touched_users |= outcome["touched_users"]
+        status_changes.extend(outcome["status_changes"])
+        auto_replies.extend(outcome["auto_replies"])
+
+    for user_id in touched_users:
+        folder_versions.bump(user_id, 'inbox', 'sent')
+    for message_id, sender_id, recipient_id in status_changes:
+        for user_id in (sender_id, recipient_id):
+            message_events.publish(user_id, 'status_change', message_id=message_id, status=new_status)
+    for reply_id, recipient_id in auto_replies:
+        message_events.publish(recipient_id, 'new_message', message_id=reply_id, folder='inbox')
+
+    print(f"Bulk status update to {new_status}: {report['updated_count']} updated, "
+          f"{len(report['failed'])} failed, {len(auto_replies)} automated replies in {report['chunks']} chunks")
+    return report
+
 @bulk_updates_bp.route('/messages/bulk-status-update', methods=['PUT'])
 def bulk_status_update():
-    data = request.json
-    
-    if not data or 'message_ids' not in data or 'status' not in data:
+    data = request.get_json(silent=True)
+
+    if not data or not isinstance(data.get('message_ids'), list) or 'status' not in data:
         return jsonify({
             'error': 'Invalid request: message_ids and status are required'
         }), 400
-    
-    message_ids = data['message_ids']
+
     new_status = data['status']
-    updated_count = 0
-    
-    for message_id in message_ids:
-        message = Message.query.get(message_id)
-        if message:
-            message.status = new_status
-            updated_count += 1
-    
-    db.session.commit()
-    
+    if new_status not in VALID_STATUSES:
+        return jsonify({"error": "Invalid status value"}), 400
+
+    report = apply_bulk_status_update(data['message_ids'], new_status)
+    updated_count = report['updated_count']
+
     return jsonify({
-        'success': True,
+        'success': not report['failed'],
+        'status': new_status,
         'updated_count': updated_count,
+        'failed': report['failed'],
         'message': f'Successfully updated {updated_count} messages'
-    }), 200
+    }), 207 if report['failed'] else 200
@@ -3,153 +3,91 @@ from backend.models.database import db
 from backend.models.message import Message
 from backend.models.job import Job 
 from backend.models.user import User
+from backend.routes.dashboard_aggregates import load_dashboard_aggregates, SENT, RECEIVED
+from backend.routes.messages import load_users_by_id, paginate_folder, folder_response
 from sqlalchemy import func
-from collections import defaultdict
 from datetime import datetime
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
+def dashboard_messages(*criteria):
+    """One newest-first page of non-draft messages for a dashboard listing.
+
+    The chart tallies come from the dashboard_aggregates table; this only
+    feeds the application list, which is paged with the same ?limit= and
+    ?cursor= keyset pagination as the mailbox folders.
+    Returns (messages, next_cursor).
+    """
+    return paginate_folder(Message.query.filter(Message.is_draft == False, *criteria))
+
+def load_jobs_by_id(job_ids):
+    ids = {job_id for job_id in job_ids if job_id is not None}
+    if not ids:
+        return {}
+    return {job.id: job for job in Job.query.filter(Job.id.in_(ids)).all()}
+
+def serialize_application(msg, job):
+    return {
+        "id": msg.id,
+        "subject": msg.subject,
+        "status": msg.status,
+        "created_at": msg.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "job_category": job.category if job else "N/A",
+        "job_type": job.job_type if job else "N/A",
+        "job_location": job.location if job else "N/A",
+        "job_company": job.company_name if job else "N/A",
+        "salary_range": job.salary_range if job else "Not specified"
+    }
+
 @dashboard_bp.route('/employee/<int:employee_id>', methods=['GET'])
 def employee_dashboard(employee_id):
 
-    messages = Message.query.filter_by(sender_id=employee_id, is_draft=False)\
-                    .order_by(Message.created_at.desc()).all()
-
-    status_counts = defaultdict(int)
-    time_series = defaultdict(int)
-    category_counts = defaultdict(int)
-    day_of_week_counts = defaultdict(int)
+    messages, next_cursor = dashboard_messages(Message.sender_id == employee_id)
+    jobs = load_jobs_by_id(msg.job_id for msg in messages if msg.is_application)
+    recipients = load_users_by_id(msg.recipient_id for msg in messages)
 
     applications = []
-
     for msg in messages:
-      
-        job_title = None
-        if msg.subject.lower().startswith("application for:"):
-            after_colon = msg.subject.split(":", 1)[1].strip()
-            job_title = after_colon 
-
-
-        found_job = None
-        if job_title:
-            found_job = Job.query.filter_by(title=job_title).first()
-
-
-        msg_status = msg.status or "Pending"
-        status_counts[msg_status] += 1
-
-        month_str = msg.created_at.strftime("%Y-%m")
-        time_series[month_str] += 1
-
-        if found_job:
-            cat = found_job.category
-            category_counts[cat] += 1
+        found_job = jobs.get(msg.job_id) if msg.is_application else None
+        recipient_user = recipients.get(msg.recipient_id)
 
-        day_name = msg.created_at.strftime("%A") 
-        day_of_week_counts[day_name] += 1
+        application = serialize_application(msg, found_job)
+        application["recipient_email"] = recipient_user.email if recipient_user else "unknown"
+        applications.append(application)
 
-        recipient_user = User.query.get(msg.recipient_id)
-        recipient_email = recipient_user.email if recipient_user else "unknown"
-
-        applications.append({
-            "id": msg.id, 
-            "subject": msg.subject,
-            "status": msg.status,
-            "created_at": msg.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "recipient_email": recipient_email,
-            "job_category": found_job.category if found_job else "N/A",
-            "job_type": found_job.job_type if found_job else "N/A",
-            "job_location": found_job.location if found_job else "N/A",
-            "job_company": found_job.company_name if found_job else "N/A",
-            "salary_range": found_job.salary_range if found_job else "Not specified"
-        })
-
-    return jsonify({
-        "status_counts": dict(status_counts),
-        "time_series": dict(time_series),
-        "category_counts": dict(category_counts),
-        "day_of_week_counts": dict(day_of_week_counts),
-        "applications": applications
-    }), 200
+    return folder_response({
+        **load_dashboard_aggregates(employee_id, SENT),
+        "applications": applications,
+        "next_cursor": next_cursor
+    }, next_cursor)
 
 @dashboard_bp.route('/employer/<int:employer_id>', methods=['GET'])
 def employer_dashboard(employer_id):
-    messages = Message.query.filter_by(recipient_id=employer_id, is_draft=False)\
-                    .order_by(Message.created_at.desc()).all()
+    messages, next_cursor = dashboard_messages(Message.recipient_id == employer_id)
+    jobs = load_jobs_by_id(msg.job_id for msg in messages if msg.is_application)
+    users = load_users_by_id([employer_id] + [msg.sender_id for msg in messages])
 
-    status_counts = defaultdict(int)
-    time_series = defaultdict(int)
-    category_counts = defaultdict(int)
-    day_of_week_counts = defaultdict(int)
+    employer = users.get(employer_id)
+    company_name = employer.company_name if employer else None
+    now = datetime.now()
 
     applications = []
-
-    job_title_status = {}  
-
- 
-    active_jobs = Job.query.filter(
-        Job.company_name == User.query.get(employer_id).company_name
-    ).all()
-
-
-    for job in active_jobs:
-        is_closed = False
-        if job.deadline and job.deadline < datetime.now():
-            is_closed = True
-        job_title_status[job.title.lower()] = is_closed
-
     for msg in messages:
-        job_title = None
-        if msg.subject.lower().startswith("application for:"):
-            after_colon = msg.subject.split(":", 1)[1].strip()
-            job_title = after_colon  
-
-        found_job = None
-        is_closed = False
-        
-        if job_title:
-            found_job = Job.query.filter(func.lower(Job.title) == job_title.lower()).first()
-            is_closed = job_title_status.get(job_title.lower(), False)
-
-        msg_status = msg.status or "Pending"
-        status_counts[msg_status] += 1
-
-        month_str = msg.created_at.strftime("%Y-%m")
-        time_series[month_str] += 1
-
-        if found_job:
-            cat = found_job.category
-            category_counts[cat] += 1
-
-
-        day_name = msg.created_at.strftime("%A")  
-        day_of_week_counts[day_name] += 1
-
-
-        sender_user = User.query.get(msg.sender_id)
-        sender_email = sender_user.email if sender_user else "unknown"
-
-        applications.append({
-            "id": msg.id,
-            "subject": msg.subject,
-            "status": msg.status,
-            "created_at": msg.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "sender_email": sender_email,
-            "job_category": found_job.category if found_job else "N/A",
-            "job_type": found_job.job_type if found_job else "N/A",
-            "job_location": found_job.location if found_job else "N/A",
-            "job_company": found_job.company_name if found_job else "N/A",
-            "job_closed": is_closed,  
-            "salary_range": found_job.salary_range if found_job else "Not specified"
-        })
-
-    return jsonify({
-        "status_counts": dict(status_counts),
-        "time_series": dict(time_series),
-        "category_counts": dict(category_counts),
-        "day_of_week_counts": dict(day_of_week_counts),
-        "applications": applications
-    }), 200
+        found_job = jobs.get(msg.job_id) if msg.is_application else None
+        is_closed = bool(found_job and found_job.company_name == company_name
+                         and found_job.deadline and found_job.deadline < now)
+        sender_user = users.get(msg.sender_id)
+
+        application = serialize_application(msg, found_job)
+        application["sender_email"] = sender_user.email if sender_user else "unknown"
+        application["job_closed"] = is_closed
+        applications.append(application)
+
+    return folder_response({
+        **load_dashboard_aggregates(employer_id, RECEIVED),
+        "applications": applications,
+        "next_cursor": next_cursor
+    }, next_cursor)
 
 @dashboard_bp.route('/employee/profile/<int:employee_id>', methods=['GET'])
 def employee_profile(employee_id):
@@ -158,22 +96,10 @@ def employee_profile(employee_id):
     if not employee:
         return jsonify({"error": "Employee not found"}), 404
 
-    total_applications = Message.query.filter_by(
-        sender_id=employee_id, 
-        is_draft=False
-    ).count()
-    
-    under_review_count = Message.query.filter_by(
-        sender_id=employee_id,
-        is_draft=False,
-        status="Under Review"
-    ).count()
-    
-    accepted_count = Message.query.filter_by(
-        sender_id=employee_id,
-        is_draft=False,
-        status="Accepted"
-    ).count()
+    status_counts = load_dashboard_aggregates(employee_id, SENT)["status_counts"]
+    total_applications = sum(status_counts.values())
+    under_review_count = status_counts.get("Under Review", 0)
+    accepted_count = status_counts.get("Accepted", 0)
     
     return jsonify({
         "profile": {
@@ -0,0 +1,184 @@
+from collections import Counter
+from sqlalchemy import or_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from backend.models.database import db
+from backend.models.dashboard_aggregate import DashboardAggregate
+from backend.models.job import Job
+from backend.models.message import Message
+
+SENT = 'sent'
+RECEIVED = 'received'
+KEY_COLUMNS = ('user_id', 'direction', 'status', 'month', 'weekday', 'category')
+REBUILD_BATCH_SIZE = 5000
+
+def load_categories(job_ids):
+    ids = {job_id for job_id in job_ids if job_id is not None}
+    if not ids:
+        return {}
+    return dict(db.session.query(Job.id, Job.category).filter(Job.id.in_(ids)).all())
+
+def count_messages(counts, messages, delta=1, status=None, categories=None):
+    """Add delta to both participants' aggregate keys for each message.
+
+    messages only need sender_id, recipient_id, status, created_at and job_id;
+    status overrides the message's own status, which lets a status change be
+    counted as -1 under the old status and +1 under the new one.
+    """
+    messages = list(messages)
+    if categories is None:
+        categories = load_categories(message.job_id for message in messages)
+    for message in messages:
+        key = (status or message.status or "Pending",
+               message.created_at.strftime("%Y-%m"),
+               message.created_at.strftime("%A"),
+               categories.get(message.job_id) or '')
+        counts[(message.sender_id, SENT) + key] += delta
+        counts[(message.recipient_id, RECEIVED) + key] += delta
+    return counts
+
+def apply_counts(counts):
+    """Add counts to the aggregate table with one upsert statement.
+
+    Runs inside the caller's transaction so the aggregates commit or roll
+    back together with the message changes they describe.
+    """
+    rows = [dict(zip(KEY_COLUMNS, key), count=delta) for key, delta in counts.items() if delta]
+    if not rows:
+        return
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql_insert(DashboardAggregate)
+        stmt = stmt.on_duplicate_key_update(count=DashboardAggregate.count + stmt.inserted['count'])
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(DashboardAggregate)
+        stmt = stmt.on_conflict_do_update(index_elements=list(KEY_COLUMNS),
+                                          set_={'count': DashboardAggregate.count + stmt.excluded['count']})
+    else:
+        for row in rows:
+            key = [getattr(DashboardAggregate, column) == row[column] for column in KEY_COLUMNS]
+            updated = DashboardAggregate.query.filter(*key).update(
+                {DashboardAggregate.count: DashboardAggregate.count + row['count']}, synchronize_session=False)
+            if not updated:
+                db.session.add(DashboardAggregate(**row))
+        return
+    db.session.execute(stmt, rows)
+
+def record_new_messages(messages):
+    apply_counts(count_messages(Counter(), messages))
+
+def record_status_change(messages, new_status, old_status=None):
+    """Move each message's count from its old status to new_status.
+
+    old_status is needed when the messages already carry the new status.
+    """
+    messages = list(messages)
+    categories = load_categories(message.job_id for message in messages)
+    counts = Counter()
+    for message in messages:
+        count_messages(counts, [message], -1, old_status or message.status, categories)
+    count_messages(counts, messages, 1, new_status, categories)
+    apply_counts(counts)
+
+def message_rows(*criteria):
+    """Stream the counted columns of non-draft messages matching criteria.
+
+    Rows are read in id order in batches so callers can fold them into a
+    Counter without loading every message at once.
+    """
+    query = db.session.query(
+        Message.id, Message.sender_id, Message.recipient_id, Message.status,
+        Message.created_at, Message.job_id
+    ).filter(Message.is_draft == False, *criteria)
+    last_id = 0
+    while True:
+        batch = query.filter(Message.id > last_id).order_by(Message.id).limit(REBUILD_BATCH_SIZE).all()
+        if not batch:
+            return
+        last_id = batch[-1].id
+        yield batch
+
+def record_deleted_messages(*criteria):
+    """Remove the counts of the messages matching criteria.
+
+    Call before deleting them, in the same transaction as the delete.
+    """
+    categories = None
+    counts = Counter()
+    for batch in message_rows(*criteria):
+        if categories is None:
+            categories = dict(db.session.query(Job.id, Job.category).all())
+        count_messages(counts, batch, -1, categories=categories)
+    apply_counts(counts)
+
+def record_category_change(job_id, old_category, new_category):
+    """Move the counts of a job's messages from old_category to new_category.
+
+    Used when a job's category is edited and when a job is deleted, which
+    leaves its messages uncategorised.
+    """
+    if (old_category or '') == (new_category or ''):
+        return
+    counts = Counter()
+    for batch in message_rows(Message.job_id == job_id):
+        count_messages(counts, batch, -1, categories={job_id: old_category})
+        count_messages(counts, batch, 1, categories={job_id: new_category})
+    apply_counts(counts)
+
+def load_dashboard_aggregates(user_id, direction):
+    """Return the dashboard tallies for one user from the aggregate table."""
+    rows = db.session.query(
+        DashboardAggregate.status, DashboardAggregate.month, DashboardAggregate.weekday,
+        DashboardAggregate.category, DashboardAggregate.count
+    ).filter(
+        DashboardAggregate.user_id == user_id,
+        DashboardAggregate.direction == direction,
+        DashboardAggregate.count > 0
+    ).all()
+
+    status_counts = Counter()
+    time_series = Counter()
+    category_counts = Counter()
+    day_of_week_counts = Counter()
+    for status, month, weekday, category, count in rows:
+        status_counts[status] += count
+        time_series[month] += count
+        day_of_week_counts[weekday] += count
+        if category:
+            category_counts[category] += count
+    return {
+        "status_counts": dict(status_counts),
+        "time_series": dict(time_series),
+        "category_counts": dict(category_counts),
+        "day_of_week_counts": dict(day_of_week_counts)
+    }
+
+def rebuild_dashboard_aggregates(user_ids=None):
+    """Recompute the aggregates from the messages table and commit.
+
+    With user_ids only those users' rows are rebuilt. Messages are streamed
+    in id order so memory is bounded by the number of distinct keys.
+    Returns the number of aggregate rows written.
+    """
+    user_ids = set(user_ids) if user_ids is not None else None
+    delete = DashboardAggregate.query
+    criteria = []
+    if user_ids is not None:
+        if not user_ids:
+            return 0
+        delete = delete.filter(DashboardAggregate.user_id.in_(user_ids))
+        criteria.append(or_(Message.sender_id.in_(user_ids), Message.recipient_id.in_(user_ids)))
+    delete.delete(synchronize_session=False)
+
+    categories = dict(db.session.query(Job.id, Job.category).all())
+    counts = Counter()
+    for batch in message_rows(*criteria):
+        count_messages(counts, batch, categories=categories)
+
+    if user_ids is not None:
+        counts = Counter({key: count for key, count in counts.items() if key[0] in user_ids})
+    apply_counts(counts)
+    db.session.commit()
+    print(f"Rebuilt {len(counts)} dashboard aggregate rows"
+          + (f" for {len(user_ids)} users" if user_ids is not None else ""))
+    return len(counts)
@@ -20,7 +20,7 @@ def get_recent_applications():
         Message.recipient_id == employer_id,
         Message.is_draft == False,
         Message.is_spam == False,
-        Message.subject.like("%Application for:%")
+        Message.is_application == True
     ).order_by(desc(Message.created_at)).limit(5).all()
     
     results = []
@@ -77,7 +77,7 @@ def get_active_jobs():
         applications = Message.query.filter(
             Message.recipient_id == employer_id,
             Message.is_draft == False,
-            Message.subject.like(f"%Application for: {job.title}%")
+            Message.job_id == job.id
         ).all()
         
         application_count = len(applications)
@@ -130,13 +130,13 @@ def get_employer_profile():
     applications_count = Message.query.filter(
         Message.recipient_id == employer_id,
         Message.is_draft == False,
-        Message.subject.like("%Application for:%")
+        Message.is_application == True
     ).count()
     
     under_review_count = Message.query.filter(
         Message.recipient_id == employer_id,
         Message.is_draft == False,
-        Message.subject.like("%Application for:%"),
+        Message.is_application == True,
         Message.status == "Under Review"
     ).count()
     
@@ -144,21 +144,21 @@ def get_employer_profile():
     new_this_week_count = Message.query.filter(
         Message.recipient_id == employer_id,
         Message.is_draft == False,
-        Message.subject.like("%Application for:%"),
+        Message.is_application == True,
         Message.created_at >= one_week_ago
     ).count()
     
     accepted_count = Message.query.filter(
         Message.recipient_id == employer_id,
         Message.is_draft == False,
-        Message.subject.like("%Application for:%"),
+        Message.is_application == True,
         Message.status == "Accepted"
     ).count()
     
     rejected_count = Message.query.filter(
         Message.recipient_id == employer_id,
         Message.is_draft == False,
-        Message.subject.like("%Application for:%"),
+        Message.is_application == True,
         Message.status == "Rejected"
     ).count()
     
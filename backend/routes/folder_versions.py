@@ -0,0 +1,39 @@
+import hashlib
+import threading
+import uuid
+
+FOLDERS = ('inbox', 'sent', 'drafts', 'spam')
+
+class FolderVersionStore:
+    """Per-user, per-folder version counters used as mailbox ETags.
+
+    Versions live in process memory, so every write path must call bump() after
+    its commit. The boot id keeps ETags issued before a restart from matching.
+    """
+
+    def __init__(self):
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.generation = 0
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    def get(self, user_id, folder):
+        return self.versions.get((int(user_id), folder), 0)
+
+    def bump(self, user_id, *folders):
+        if user_id is None:
+            return
+        with self.lock:
+            for folder in folders or FOLDERS:
+                key = (int(user_id), folder)
+                self.versions[key] = self.versions.get(key, 0) + 1
+
+    def invalidate_all(self):
+        with self.lock:
+            self.generation += 1
+
+    def etag(self, user_id, folder, query_string=b''):
+        params = hashlib.sha1(query_string).hexdigest()[:8]
+        return f"{self.boot_id}-{self.generation}-{folder}-{int(user_id)}-{self.get(user_id, folder)}-{params}"
+
+folder_versions = FolderVersionStore()
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, session
 from backend.models.database import db
 from backend.models.job import Job
 from backend.models.user import User
+from backend.routes.dashboard_aggregates import record_category_change
 from sqlalchemy import func
 from datetime import datetime
 
@@ -183,6 +184,7 @@ def update_job(job_id):
     if not user or job.company_name != user.company_name:
         return jsonify({"error": "Not authorized to edit this job"}), 403
 
+    old_category = job.category
     job.title = data["title"]
     job.description = data["description"]
     job.category = data["category"]
@@ -196,6 +198,7 @@ def update_job(job_id):
         return jsonify({"error": "Invalid deadline format. Use YYYY-MM-DD"}), 400
 
     try:
+        record_category_change(job.id, old_category, job.category)
         db.session.commit()
         return jsonify({"message": "Job updated successfully"}), 200
     except Exception as e:
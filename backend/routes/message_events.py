@@ -0,0 +1,76 @@
+import itertools
+import json
+import queue
+import threading
+from collections import defaultdict
+
+class LocalEventBackend:
+    """Fans events out to subscriber queues held in this process.
+
+    Any object with the same subscribe/unsubscribe/publish methods can replace it,
+    e.g. one backed by Redis pub/sub when the app runs in several processes.
+    """
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self.subscribers = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscriber = queue.Queue(maxsize=self.max_queue_size)
+        with self.lock:
+            self.subscribers[user_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        with self.lock:
+            self.subscribers[user_id].discard(subscriber)
+            if not self.subscribers[user_id]:
+                del self.subscribers[user_id]
+
+    def publish(self, user_id, event):
+        with self.lock:
+            subscribers = list(self.subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                print(f"Dropping event {event['id']} for slow subscriber of user {user_id}")
+
+class MessageEventBus:
+    def __init__(self, backend=None):
+        self.backend = backend or LocalEventBackend()
+        self.ids = itertools.count(1)
+
+    def set_backend(self, backend):
+        self.backend = backend
+
+    def publish(self, user_id, event_type, **data):
+        if user_id is None:
+            return
+        event = {"id": next(self.ids), "type": event_type}
+        event.update(data)
+        self.backend.publish(int(user_id), event)
+
+    def subscribe(self, user_id):
+        return self.backend.subscribe(int(user_id))
+
+    def unsubscribe(self, user_id, subscriber):
+        self.backend.unsubscribe(int(user_id), subscriber)
+
+    def stream(self, user_id, heartbeat=15):
+        """Yield Server-Sent Events for one user until the client disconnects."""
+        subscriber = self.subscribe(user_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            self.unsubscribe(user_id, subscriber)
+
+message_events = MessageEventBus()
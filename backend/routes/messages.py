@@ -1,47 +1,370 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, make_response, Response, current_app
 from backend.models.database import db
 from backend.models.message import Message
 from backend.models.attachment import Attachment
 from backend.models.user import User
+from backend.models.job import Job
 from backend.models.status_message import StatusMessage
-from sqlalchemy import func
-import pickle
-import os
+from backend.models.spam_feedback import SpamFeedback
+from backend.models.blob_store import get_blob_store, BlobTooLarge
+from backend.models.spam_model_registry import spam_model_registry
+from backend.routes.folder_versions import folder_versions
+from backend.routes.message_events import message_events
+from backend.routes.spam_queue import SpamClassificationQueue
+from backend.routes.spam_verdict_cache import spam_verdict_cache
+from backend.routes.dashboard_aggregates import record_new_messages, record_status_change
+from backend.routes.status_templates import (DEFAULT_STATUS_MESSAGES, DEFAULT_STATUS_TEMPLATES,
+                                             status_template_cache, status_template_key)
+from sqlalchemy import func, and_, or_, null, exists
 import io
-from datetime import datetime
+import base64
+import binascii
+import hashlib
+from datetime import datetime, timedelta
 
 messages_bp = Blueprint('messages', __name__)
 
-SPAM_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'spam_detector_model.pkl')
-
-try:
-    with open(SPAM_MODEL_PATH, 'rb') as f:
-        spam_model = pickle.load(f)
-    print(f"Spam detection model loaded successfully from {SPAM_MODEL_PATH}")
-except Exception as e:
-    print(f"Error loading spam model: {e}")
-    print(f"Attempted to load from: {os.path.abspath(SPAM_MODEL_PATH)}")
-    spam_model = None
-
-def is_spam(subject, body):
-    if spam_model is None:
+ATTACHMENT_MAX_AGE = 7 * 24 * 60 * 60
+MAX_ATTACHMENT_SIZE = 5 * 1024 * 1024
+PDF_MAGIC = b'%PDF-'
+RESCORE_BATCH_SIZE = 500
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+SNIPPET_LENGTH = 120
+
+def classify_spam(subject, body):
+    """Return (is_spam, model_version) for one message; falls back to not-spam
+    with no version when the model is unavailable."""
+    if spam_model_registry.get() is None:
         print("Spam model not loaded, defaulting to non-spam")
-        return False
+        return False, None
     
     try:
         combined_text = f"{subject} {body}"
         print(f"Analyzing message: '{combined_text[:50]}...'")
         
-        spam_prob = spam_model.predict_proba([combined_text])[0][1]
+        probabilities, version = spam_probabilities([combined_text])
+        spam_prob = probabilities[0]
         is_spam_result = spam_prob > 0.5 
         
-        print(f"Spam probability: {spam_prob:.4f} - {'SPAM' if is_spam_result else 'NOT SPAM'}")
-        return is_spam_result
+        print(f"Spam probability: {spam_prob:.4f} - {'SPAM' if is_spam_result else 'NOT SPAM'} (model {version})")
+        return is_spam_result, version
     except Exception as e:
         print(f"Error in spam detection: {e}")
         import traceback
         traceback.print_exc()
-        return False
+        return False, None
+
+def is_spam(subject, body):
+    return classify_spam(subject, body)[0]
+
+def spam_probabilities(texts, registry=spam_model_registry, cache=spam_verdict_cache):
+    """Return (probabilities, model_version) for many texts.
+
+    Verdicts already in the cache for the current model are reused; the rest
+    are scored with a single vectorized predict_proba call and cached.
+    """
+    texts = list(texts)
+    loaded = registry.get()
+    if loaded is None:
+        raise RuntimeError("Spam model not loaded")
+
+    probabilities = [cache.get(text, loaded.version) for text in texts]
+    misses = [i for i, prob in enumerate(probabilities) if prob is None]
+    if misses:
+        scored = loaded.model.predict_proba([texts[i] for i in misses])[:, 1]
+        for i, prob in zip(misses, scored):
+            probabilities[i] = float(prob)
+            cache.put(texts[i], loaded.version, probabilities[i])
+    return probabilities, loaded.version
+
+spam_model_registry.on_swap(lambda loaded: spam_verdict_cache.invalidate())
+
+def is_spam_batch(texts):
+    """Return (verdicts, model_version) for many texts."""
+    texts = list(texts)
+    try:
+        probabilities, version = spam_probabilities(texts)
+        return [prob > 0.5 for prob in probabilities], version
+    except Exception as e:
+        print(f"Error in batch spam detection: {e}")
+        import traceback
+        traceback.print_exc()
+        return [False] * len(texts), None
+
+def classify_queued_messages(batch):
+    """Score a micro-batch of (message_id, text) pairs and move each message
+    out of the classifying state into the inbox or spam folder."""
+    spam_verdicts, model_version = is_spam_batch(text for _, text in batch)
+    verdicts = dict(zip((message_id for message_id, _ in batch), spam_verdicts))
+
+    messages = Message.query.filter(
+        Message.id.in_(verdicts.keys()),
+        Message.is_spam.is_(None)
+    ).all()
+    classified = []
+    for message in messages:
+        message.is_spam = verdicts[message.id]
+        message.spam_model_version = model_version
+        classified.append((message.id, message.recipient_id, message.is_spam))
+    db.session.commit()
+
+    for message_id, recipient_id, spam in classified:
+        folder_versions.bump(recipient_id, 'inbox', 'spam')
+        message_events.publish(recipient_id, 'new_message',
+                               message_id=message_id,
+                               folder='spam' if spam else 'inbox')
+    print(f"Classified {len(classified)} queued messages, {sum(spam for _, _, spam in classified)} spam")
+
+def unclassified_messages(min_age=0, batch_size=RESCORE_BATCH_SIZE):
+    """Yield (message_id, text) for sent messages still waiting for a spam
+    verdict that were created at least min_age seconds ago."""
+    criteria = [Message.is_spam.is_(None), Message.is_draft == False]
+    if min_age:
+        criteria.append(Message.created_at <= datetime.now() - timedelta(seconds=min_age))
+    last_id = 0
+    while True:
+        rows = db.session.query(Message.id, Message.subject, Message.body).filter(
+            *criteria, Message.id > last_id
+        ).order_by(Message.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        for row in rows:
+            yield row.id, f"{row.subject} {row.body}"
+
+spam_queue = SpamClassificationQueue(classify_queued_messages, recover=unclassified_messages,
+                                     key=lambda item: item[0])
+
+def rescore_messages(*criteria, batch_size=RESCORE_BATCH_SIZE):
+    """Re-classify every sent message matching criteria and write changed
+    verdicts back with one bulk UPDATE per direction per batch.
+
+    Automated status replies and messages a user has already corrected through
+    spam feedback keep their verdict and are not scored.
+
+    Walks the matching rows by id in batches of batch_size so memory stays flat
+    however large the corpus is. Raises RuntimeError if the model is unavailable
+    rather than silently moving everything to the inbox.
+    """
+    summary = {"scored": 0, "moved_to_spam": 0, "moved_to_inbox": 0}
+    changed = []
+    last_id = 0
+
+    while True:
+        rows = db.session.query(
+            Message.id, Message.recipient_id, Message.subject, Message.body, Message.is_spam
+        ).filter(
+            Message.is_draft == False,
+            Message.is_auto_reply == False,
+            ~exists().where(SpamFeedback.message_id == Message.id),
+            Message.id > last_id,
+            *criteria
+        ).order_by(Message.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        probabilities, model_version = spam_probabilities(f"{row.subject} {row.body}" for row in rows)
+        verdicts = [prob > 0.5 for prob in probabilities]
+        to_spam = [row for row, spam in zip(rows, verdicts) if spam and row.is_spam is not True]
+        to_inbox = [row for row, spam in zip(rows, verdicts) if not spam and row.is_spam is not False]
+
+        for moved, verdict in ((to_spam, True), (to_inbox, False)):
+            if moved:
+                Message.query.filter(Message.id.in_([row.id for row in moved])) \
+                             .update({Message.is_spam: verdict}, synchronize_session=False)
+                changed.extend((row.id, row.recipient_id, verdict) for row in moved)
+        Message.query.filter(Message.id.in_([row.id for row in rows])) \
+                     .update({Message.spam_model_version: model_version}, synchronize_session=False)
+        db.session.commit()
+
+        summary["scored"] += len(rows)
+        summary["moved_to_spam"] += len(to_spam)
+        summary["moved_to_inbox"] += len(to_inbox)
+
+    for recipient_id in {recipient_id for _, recipient_id, _ in changed}:
+        folder_versions.bump(recipient_id, 'inbox', 'spam')
+    for message_id, recipient_id, verdict in changed:
+        message_events.publish(recipient_id, 'spam_reclassified', message_id=message_id, is_spam=verdict)
+
+    print(f"Rescored {summary['scored']} messages: {summary['moved_to_spam']} to spam, {summary['moved_to_inbox']} to inbox")
+    return summary
+
+def encode_cursor(message):
+    raw = f"{message.created_at.isoformat()}|{message.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, message_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(message_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def folder_summary_query(*criteria):
+    """Project only the columns a folder listing renders, with the body cut down
+    to a snippet in SQL so full message bodies never leave the database."""
+    return db.session.query(
+        Message.id,
+        Message.sender_id,
+        Message.recipient_id,
+        Message.subject,
+        Message.status,
+        Message.created_at,
+        func.substr(Message.body, 1, SNIPPET_LENGTH + 1).label('snippet')
+    ).filter(*criteria)
+
+def make_snippet(text):
+    if not text:
+        return ""
+    snippet = ' '.join(text.split())
+    if len(text) > SNIPPET_LENGTH:
+        snippet = snippet[:SNIPPET_LENGTH].rstrip() + "..."
+    return snippet
+
+def paginate_folder(query):
+    """Return one page of a folder query, newest first, plus the cursor for the next page.
+
+    Pages are keyed on (created_at, id) rather than OFFSET, so every page costs the
+    same index range scan no matter how deep the client has scrolled.
+    """
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        created_at, message_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            Message.created_at < created_at,
+            and_(Message.created_at == created_at, Message.id < message_id)
+        ))
+
+    messages = query.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(messages[limit - 1]) if len(messages) > limit else None
+    return messages[:limit], next_cursor
+
+def folder_etag(user_id, folder):
+    return folder_versions.etag(user_id, folder, request.query_string)
+
+def folder_not_modified(etag):
+    if not request.if_none_match.contains(etag):
+        return None
+    response = make_response('', 304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def folder_response(payload, next_cursor, etag=None):
+    response = jsonify(payload)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response, 200
+
+def store_pdf_attachment(upload):
+    """Validate an uploaded PDF and stream it into the blob store in chunks.
+
+    Returns (content_hash, size); raises ValueError for files that are not PDFs
+    and BlobTooLarge once more than MAX_ATTACHMENT_SIZE bytes have been read.
+    """
+    if not upload.filename.lower().endswith('.pdf'):
+        raise ValueError("Only PDF files are allowed")
+
+    stream = upload.stream
+    if stream.read(len(PDF_MAGIC)) != PDF_MAGIC:
+        raise ValueError("Attachment is not a valid PDF file")
+    stream.seek(0)
+
+    return get_blob_store().put(stream, max_size=MAX_ATTACHMENT_SIZE)
+
+def referenced_blob_hashes():
+    return {content_hash for (content_hash,) in db.session.query(Attachment.content_hash)
+            .filter(Attachment.content_hash.isnot(None)).distinct()}
+
+def collect_attachment_garbage(min_age=3600):
+    """Delete blobs no attachment row refers to, e.g. left by a failed or crashed send.
+
+    Blobs younger than min_age are kept: an identical upload may be using one
+    while its attachment row is not committed yet.
+    """
+    deleted = get_blob_store().collect_garbage(referenced_blob_hashes(), min_age=min_age)
+    print(f"Deleted {deleted} unreferenced attachment blobs")
+    return deleted
+
+def load_users_by_id(user_ids):
+    ids = {user_id for user_id in user_ids if user_id is not None}
+    if not ids:
+        return {}
+    return {user.id: user for user in User.query.filter(User.id.in_(ids)).all()}
+
+def serialize_message_list(messages, folder):
+    """Serialize a folder listing, resolving every participant in one IN (...) query.
+
+    Inbox and spam rows show the sender; sent and draft rows show the recipient.
+    """
+    participant_attr = 'recipient_id' if folder in ('sent', 'drafts') else 'sender_id'
+    users = load_users_by_id(getattr(msg, participant_attr) for msg in messages)
+
+    results = []
+    for msg in messages:
+        user = users.get(getattr(msg, participant_attr))
+        entry = {"id": msg.id}
+
+        if folder == 'drafts':
+            entry["recipient_email"] = user.email if user and user.id != msg.sender_id else ""
+        elif folder == 'sent':
+            entry["recipient_id"] = msg.recipient_id
+            entry["recipient_email"] = user.email if user else "Unknown"
+        else:
+            entry["sender_id"] = msg.sender_id
+            entry["sender_email"] = user.email if user else "Unknown"
+            if folder == 'spam':
+                entry["sender_name"] = f"{user.first_name} {user.last_name}" if user else "Unknown Sender"
+
+        entry["subject"] = msg.subject
+        entry["snippet"] = make_snippet(msg.snippet)
+        if folder in ('inbox', 'sent'):
+            entry["status"] = msg.status
+        entry["created_at"] = msg.created_at.strftime("%Y-%m-%d %H:%M:%S")
+        results.append(entry)
+    return results
+
+VALID_STATUSES = ["Pending", "Under Review", "Accepted", "Rejected"]
+APPLICATION_PREFIX = "application for:"
+
+def application_link(subject, recipient, job_id=None):
+    """Return (is_application, job_id) for a message sent to recipient.
+
+    An explicit job_id from the compose form wins when it is one of the
+    recipient company's listings; otherwise the job title is parsed from a
+    subject starting with "Application for: <title>" and matched against the
+    recipient company's listings, falling back to a title that is unique.
+    Replies ("Re: Application for: ...") are not applications.
+    """
+    company_name = recipient.company_name if recipient else None
+    if job_id:
+        job = Job.query.get(job_id)
+        if job and company_name and job.company_name == company_name:
+            return True, job.id
+        print(f"Ignoring job_id {job_id}, it is not a listing of the recipient's company")
+    subject = (subject or "").strip()
+    if not subject.lower().startswith(APPLICATION_PREFIX):
+        return False, None
+
+    job_title = subject[len(APPLICATION_PREFIX):].strip()
+    if not job_title:
+        return True, None
+    if company_name:
+        job = Job.query.filter(func.lower(Job.title) == job_title.lower(),
+                               Job.company_name == company_name).first()
+        if job:
+            return True, job.id
+    jobs = Job.query.filter(func.lower(Job.title) == job_title.lower()).limit(2).all()
+    return True, jobs[0].id if len(jobs) == 1 else None
 
 @messages_bp.route('/messages/send', methods=['POST'])
 def send_message():
@@ -59,6 +382,7 @@ def send_message():
         body = request.form.get('body')
         draft_id = request.form.get('draft_id')
         parent_id = request.form.get('parent_message_id')
+        job_id = request.form.get('job_id', type=int)
 
         attachment = request.files.get('attachment')
         has_attachment = attachment and attachment.filename
@@ -75,6 +399,7 @@ def send_message():
         body = data.get('body')
         draft_id = data.get('draft_id')
         parent_id = data.get('parent_message_id')
+        job_id = data.get('job_id')
         attachment = None
 
 
@@ -87,21 +412,41 @@ def send_message():
         return jsonify({"error": "Recipient not found"}), 404
 
     print(f"👤 Recipient found: ID {recipient.id}, Email: {recipient.email}")
+    is_application, job_id = application_link(subject, recipient, job_id)
 
+    message = None
+    if draft_id:
+        message = Message.query.get(draft_id)
+        if not message:
+            return jsonify({"error": "Draft not found"}), 404
+
+    content_hash = None
+    if has_attachment:
+        try:
+            content_hash, file_size = store_pdf_attachment(attachment)
+            print(f"Stored {file_size} bytes from attachment as {content_hash}")
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except BlobTooLarge:
+            return jsonify({"error": "Attachment exceeds the 5 MB size limit"}), 413
  
-    spam_detected = is_spam(subject, body)
+    async_classification = current_app.config.get('SPAM_CLASSIFICATION_MODE') == 'async'
+    if async_classification:
+        spam_detected, model_version = null(), None
+    else:
+        spam_detected, model_version = classify_spam(subject, body)
     
     try:
-        if draft_id:
-            message = Message.query.get(draft_id)
-            if not message:
-                return jsonify({"error": "Draft not found"}), 404
+        if message is not None:
             message.recipient_id = recipient.id
             message.subject = subject
             message.body = body
             message.status = "Pending"
             message.is_draft = False
             message.is_spam = spam_detected
+            message.spam_model_version = model_version
+            message.is_application = is_application
+            message.job_id = job_id
             if parent_id:
                 message.parent_id = parent_id
         else:
@@ -113,43 +458,41 @@ def send_message():
                 status="Pending",
                 is_draft=False,
                 is_spam=spam_detected,
+                spam_model_version=model_version,
+                is_application=is_application,
+                job_id=job_id,
                 parent_id=parent_id
             )
             db.session.add(message)
         
+        if has_attachment:
+            db.session.add(Attachment(
+                message=message,
+                filename=attachment.filename,
+                file_type='application/pdf',
+                file_size=file_size,
+                content_hash=content_hash
+            ))
+        
+        db.session.flush()
+        record_new_messages([message])
         db.session.commit()
+        folder_versions.bump(message.sender_id, 'sent', 'drafts')
+        if async_classification:
+            spam_queue.submit(current_app._get_current_object(), (message.id, f"{subject} {body}"))
+        else:
+            folder_versions.bump(message.recipient_id, 'inbox', 'spam')
+            message_events.publish(message.recipient_id, 'new_message',
+                                   message_id=message.id,
+                                   folder='spam' if message.is_spam else 'inbox')
         print(f"Message saved with ID: {message.id}")
         
-        if has_attachment:
-            try:
-                if not attachment.filename.lower().endswith('.pdf'):
-                    return jsonify({"error": "Only PDF files are allowed"}), 400
-                
-                file_data = attachment.read()
-                file_size = len(file_data)
-                print(f"Read {file_size} bytes from attachment")
-                
-                new_attachment = Attachment(
-                    message_id=message.id,
-                    filename=attachment.filename,
-                    file_type='application/pdf',
-                    file_size=file_size,
-                    file_data=file_data
-                )
-                db.session.add(new_attachment)
-                db.session.commit()
-                
-                print(f"Attachment saved successfully: {attachment.filename}")
-            except Exception as e:
-                print(f"Error saving attachment: {str(e)}")
-                import traceback
-                traceback.print_exc()
-        
         print(f"📤 Message sent with ID {message.id}, is_spam: {message.is_spam}")
         return jsonify({
             "success": True,
             "message": "Message sent successfully", 
-            "message_id": message.id
+            "message_id": message.id,
+            "classifying": async_classification
         }), 201
     except Exception as e:
         db.session.rollback()
@@ -176,6 +519,8 @@ def save_draft():
     if recipient_email:
         recipient = User.query.filter(func.lower(User.email) == recipient_email.lower()).first()
 
+    is_application, job_id = application_link(subject, recipient, job_id)
+
     if draft_id:
         draft = Message.query.get(draft_id)
         if not draft:
@@ -183,9 +528,12 @@ def save_draft():
         draft.subject = subject
         draft.body = body
         draft.recipient_id = recipient.id if recipient else sender_id
+        draft.is_application = is_application
+        draft.job_id = job_id
         draft.is_draft = True
         draft.status = "Pending"  
         db.session.commit()
+        folder_versions.bump(draft.sender_id, 'drafts')
         return jsonify({"message": "Draft updated successfully", "draft_id": draft.id}), 200
     else:
         new_draft = Message(
@@ -194,36 +542,35 @@ def save_draft():
             subject=subject,
             body=body,
             status="Pending",  
-            is_draft=True
+            is_draft=True,
+            is_application=is_application,
+            job_id=job_id
         )
         db.session.add(new_draft)
         db.session.commit()
+        folder_versions.bump(new_draft.sender_id, 'drafts')
         return jsonify({"message": "Draft saved successfully", "draft_id": new_draft.id}), 201
 
 @messages_bp.route('/messages/inbox/<int:user_id>', methods=['GET'])
 def get_inbox(user_id):
+    etag = folder_etag(user_id, 'inbox')
+    not_modified = folder_not_modified(etag)
+    if not_modified:
+        return not_modified
+
     try:
-        messages = Message.query.filter(
+        messages, next_cursor = paginate_folder(folder_summary_query(
             Message.recipient_id == user_id,
             Message.is_draft == False,
             Message.is_spam == False  
-        ).order_by(Message.created_at.desc()).all()
+        ))
         
         print(f"Loaded {len(messages)} non-spam messages for inbox of user {user_id}")
 
-        results = []
-        for msg in messages:
-            sender = User.query.get(msg.sender_id)
-            results.append({
-                "id": msg.id,
-                "sender_id": msg.sender_id,
-                "sender_email": sender.email if sender else "Unknown",
-                "subject": msg.subject,
-                "body": msg.body,
-                "status": msg.status,
-                "created_at": msg.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            })
-        return jsonify(results), 200
+        results = serialize_message_list(messages, 'inbox')
+        return folder_response(results, next_cursor, etag)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error loading inbox: {e}")
         import traceback
@@ -232,52 +579,56 @@ def get_inbox(user_id):
 
 @messages_bp.route('/messages/sent/<int:user_id>', methods=['GET'])
 def get_sent_messages(user_id):
-    messages = Message.query.filter_by(sender_id=user_id, is_draft=False).order_by(Message.created_at.desc()).all()
+    etag = folder_etag(user_id, 'sent')
+    not_modified = folder_not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    try:
+        messages, next_cursor = paginate_folder(folder_summary_query(
+            Message.sender_id == user_id,
+            Message.is_draft == False
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    results = []
-    for msg in messages:
-        recipient = User.query.get(msg.recipient_id)
-        results.append({
-            "id": msg.id,
-            "recipient_id": msg.recipient_id,
-            "recipient_email": recipient.email if recipient else "Unknown",
-            "subject": msg.subject,
-            "body": msg.body,
-            "status": msg.status,
-            "created_at": msg.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        })
-    return jsonify(results), 200
+    results = serialize_message_list(messages, 'sent')
+    return folder_response(results, next_cursor, etag)
 
 @messages_bp.route('/messages/drafts/<int:user_id>', methods=['GET'])
 def get_drafts(user_id):
-    drafts = Message.query.filter_by(sender_id=user_id, is_draft=True).order_by(Message.created_at.desc()).all()
-    results = []
-    for draft in drafts:
-        recipient = User.query.get(draft.recipient_id)
-        results.append({
-            "id": draft.id,
-            "recipient_email": recipient.email if recipient and recipient.id != draft.sender_id else "",
-            "subject": draft.subject,
-            "body": draft.body,
-            "created_at": draft.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        })
-    return jsonify(results), 200
+    etag = folder_etag(user_id, 'drafts')
+    not_modified = folder_not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    try:
+        drafts, next_cursor = paginate_folder(folder_summary_query(
+            Message.sender_id == user_id,
+            Message.is_draft == True
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    results = serialize_message_list(drafts, 'drafts')
+    return folder_response(results, next_cursor, etag)
 
 @messages_bp.route('/messages/<int:message_id>/status', methods=['PUT'])
 def update_message_status(message_id):
     data = request.get_json()
     new_status = data.get('status')
     
-    valid_statuses = ["Pending", "Under Review", "Accepted", "Rejected"]
-    if new_status not in valid_statuses:
+    if new_status not in VALID_STATUSES:
         return jsonify({"error": "Invalid status value"}), 400
     
-    message = Message.query.get(message_id)
+    # Lock the row so the old status the aggregate deltas are computed from
+    # cannot change under a concurrent status update.
+    message = Message.query.filter_by(id=message_id).with_for_update().populate_existing().first()
     if not message:
         return jsonify({"error": "Message not found"}), 404
     
     old_status = message.status
     message.status = new_status
+    auto_reply = None
 
     if old_status != new_status:
         message.status_updated_at = datetime.utcnow()
@@ -297,6 +648,7 @@ def update_message_status(message_id):
                     status=new_status,
                     is_draft=False,
                     is_spam=False,
+                    is_auto_reply=True,
                     parent_id=message_id
                 )
                 db.session.add(auto_reply)
@@ -304,7 +656,20 @@ def update_message_status(message_id):
         except Exception as e:
             print(f"Failed to create status update message: {e}")
 
+        db.session.flush()
+        record_status_change([message], new_status, old_status)
+        if auto_reply is not None:
+            record_new_messages([auto_reply])
+
     db.session.commit()
+    folder_versions.bump(message.sender_id, 'inbox', 'sent')
+    folder_versions.bump(message.recipient_id, 'inbox', 'sent')
+    if old_status != new_status:
+        for user_id in (message.sender_id, message.recipient_id):
+            message_events.publish(user_id, 'status_change', message_id=message_id, status=new_status)
+        if auto_reply is not None:
+            message_events.publish(auto_reply.recipient_id, 'new_message',
+                                   message_id=auto_reply.id, folder='inbox')
     
     return jsonify({
         "success": True,
@@ -313,112 +678,54 @@ def update_message_status(message_id):
         "status_updated_at": message.status_updated_at.strftime("%Y-%m-%d %H:%M:%S") if message.status_updated_at else None
     }), 200
 
-@messages_bp.route('/messages/bulk-status-update', methods=['PUT'])
-def bulk_update_message_status():
-    data = request.get_json()
-    message_ids = data.get('message_ids', [])
-    new_status = data.get('status')
-
-    valid_statuses = ["Pending", "Under Review", "Accepted", "Rejected"]
-    if new_status not in valid_statuses:
-        return jsonify({"error": "Invalid status value"}), 400
-
-    updated_count = 0
-    for message_id in message_ids:
-        message = Message.query.get(message_id)
-        if not message:
-            continue
-        old_status = message.status
-        message.status = new_status
-        if old_status != new_status:
-            message.status_updated_at = datetime.utcnow()
-            try:
-                employer = User.query.get(message.recipient_id)
-                employee = User.query.get(message.sender_id)
-                if employer and employee:
-                    reply_subject = f"Re: {message.subject}"
-                    reply_body = generate_status_message(new_status, message.subject, employer.id)
-                    auto_reply = Message(
-                        sender_id=employer.id,
-                        recipient_id=employee.id,
-                        subject=reply_subject,
-                        body=reply_body,
-                        status=new_status,
-                        is_draft=False,
-                        is_spam=False,
-                        parent_id=message_id
-                    )
-                    db.session.add(auto_reply)
-            except Exception as e:
-                print(f"Failed to create status update message for message {message_id}: {e}")
-        updated_count += 1
-    db.session.commit()
-    return jsonify({
-        "success": True,
-        "updated_count": updated_count,
-        "status": new_status
-    }), 200
-
 def generate_status_message(status, job_subject, employer_id=None):
+    """Build the automated reply for a status change from the employer's
+    cached templates, falling back to the defaults."""
     job_title = job_subject
     if "Application for:" in job_subject:
         job_title = job_subject.split("Application for:")[1].strip()
 
-    if employer_id:
-        custom_message = StatusMessage.query.filter_by(
-            user_id=employer_id,
-            status=status.lower().replace(' ', '_')
-        ).first()
-        
-        if custom_message:
-            return custom_message.message.replace('{job_title}', job_title)
-    
-    if status == "Pending":
-        return f"Thank you for your application for {job_title}. Your application is currently in our pending queue and will be reviewed soon."
-    
-    elif status == "Under Review":
-        return f"Good news! Your application for {job_title} is now being reviewed by our team. We'll be in touch with updates as we evaluate your candidacy."
-    
-    elif status == "Accepted":
-        return f"Congratulations! We are pleased to inform you that your application for {job_title} has been accepted. We'll contact you shortly with next steps regarding the interview process."
-    
-    elif status == "Rejected":
-        return f"Thank you for your interest in {job_title}. After careful consideration, we regret to inform you that we've decided to move forward with other candidates at this time.\n\nWe appreciate your interest in our organization and wish you success in your job search."
-    
-    else:
-        return f"Your application status has been updated to: {status}"
+    key = status_template_key(status)
+    template = status_template_cache.get(employer_id).get(key) if employer_id else None
+    template = template or DEFAULT_STATUS_TEMPLATES.get(key)
+    if template:
+        return template.render(job_title)
+    return f"Your application status has been updated to: {status}"
 
 @messages_bp.route('/messages/spam/<int:user_id>', methods=['GET'])
 def get_spam(user_id):
+    etag = folder_etag(user_id, 'spam')
+    not_modified = folder_not_modified(etag)
+    if not_modified:
+        return not_modified
+
     try:
-        spam_messages = Message.query.filter(
+        spam_messages, next_cursor = paginate_folder(folder_summary_query(
             Message.recipient_id == user_id,
             Message.is_draft == False,
             Message.is_spam == True 
-        ).order_by(Message.created_at.desc()).all()
+        ))
         
         print(f"Loaded {len(spam_messages)} spam messages for user {user_id}")
 
-        results = []
-        for msg in spam_messages:
-            sender = User.query.get(msg.sender_id)
-            results.append({
-                "id": msg.id,
-                "sender_id": msg.sender_id,
-                "sender_email": sender.email if sender else "Unknown",
-                "sender_name": f"{sender.first_name} {sender.last_name}" if sender else "Unknown Sender",
-                "subject": msg.subject,
-                "body": msg.body,
-                "created_at": msg.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            })
+        results = serialize_message_list(spam_messages, 'spam')
         
-        return jsonify({"messages": results}), 200
+        return folder_response({"messages": results, "next_cursor": next_cursor}, next_cursor, etag)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error fetching spam messages: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({"error": "Error fetching spam messages", "details": str(e)}), 500
 
+@messages_bp.route('/messages/stream/<int:user_id>', methods=['GET'])
+def stream_message_events(user_id):
+    response = Response(message_events.stream(user_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @messages_bp.route('/messages/not-spam/<int:message_id>', methods=['POST'])
 def mark_as_not_spam(message_id):
     message = Message.query.get(message_id)
@@ -426,12 +733,37 @@ def mark_as_not_spam(message_id):
         return jsonify({"error": "Message not found"}), 404
         
     if message.is_spam:
-        message.is_spam = False 
-        db.session.commit()
+        reclassify_as(message, False)
         return jsonify({"message": "Message moved to inbox"}), 200
     else:
         return jsonify({"error": "Message is not marked as spam"}), 400
 
+@messages_bp.route('/messages/<int:message_id>/mark-spam', methods=['POST'])
+def mark_as_spam(message_id):
+    message = Message.query.get(message_id)
+    if not message:
+        return jsonify({"error": "Message not found"}), 404
+        
+    if message.is_spam is False and not message.is_draft:
+        reclassify_as(message, True)
+        return jsonify({"message": "Message moved to spam"}), 200
+    else:
+        return jsonify({"error": "Message is not in the inbox"}), 400
+
+def reclassify_as(message, spam):
+    """Apply a user's spam/not-spam correction and record it as training feedback."""
+    db.session.add(SpamFeedback(
+        message_id=message.id,
+        user_id=message.recipient_id,
+        is_spam=spam,
+        model_version=message.spam_model_version
+    ))
+    message.is_spam = spam
+    db.session.commit()
+    folder_versions.bump(message.recipient_id, 'inbox', 'spam')
+    message_events.publish(message.recipient_id, 'spam_reclassified',
+                           message_id=message.id, is_spam=spam)
+
 @messages_bp.route('/messages/<int:message_id>', methods=['GET'])
 def get_message(message_id):
     try:
@@ -486,9 +818,10 @@ def get_replies(message_id):
     try:
         replies = Message.query.filter_by(parent_id=message_id) \
                                .order_by(Message.created_at).all()
+        senders = load_users_by_id(msg.sender_id for msg in replies)
         results = []
         for msg in replies:
-            user = User.query.get(msg.sender_id)
+            user = senders.get(msg.sender_id)
             results.append({
                 "id": msg.id,
                 "sender_email": user.email if user else "",
@@ -511,8 +844,10 @@ def delete_draft(draft_id):
         return jsonify({"error": "Message is not a draft"}), 400
         
     try:
+        sender_id = draft.sender_id
         db.session.delete(draft)
         db.session.commit()
+        folder_versions.bump(sender_id, 'drafts')
         return jsonify({"message": "Draft deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
@@ -522,22 +857,9 @@ def delete_draft(draft_id):
 @messages_bp.route('/status-messages/<int:user_id>', methods=['GET'])
 def get_status_messages(user_id):
     try:
-        messages = {}
-        status_messages = StatusMessage.query.filter_by(user_id=user_id).all()
-        
-        default_messages = {
-            "pending": "Thank you for your application for {job_title}. Your application is currently in our pending queue and will be reviewed soon.",
-            "under_review": "Good news! Your application for {job_title} is now being reviewed by our team. We'll be in touch with updates as we evaluate your candidacy.",
-            "accepted": "Congratulations! We are pleased to inform you that your application for {job_title} has been accepted. We'll contact you shortly with next steps regarding the interview process.",
-            "rejected": "Thank you for your interest in {job_title}. After careful consideration, we regret to inform you that we've decided to move forward with other candidates at this time.\n\nWe appreciate your interest in our organization and wish you success in your job search."
-        }
-        
-        for msg in status_messages:
-            messages[msg.status] = msg.message
-            
-        for status, default_msg in default_messages.items():
-            if status not in messages:
-                messages[status] = default_msg
+        messages = dict(DEFAULT_STATUS_MESSAGES)
+        for status, template in status_template_cache.get(user_id).items():
+            messages[status] = template.text
         
         return jsonify({"success": True, "messages": messages}), 200
     except Exception as e:
@@ -565,6 +887,7 @@ def save_status_messages():
                 ))
 
         db.session.commit()
+        status_template_cache.invalidate(user_id)
         return jsonify({"success": True, "message": "Status messages saved successfully"}), 200
     except Exception as e:
         db.session.rollback()
@@ -598,12 +921,27 @@ def get_attachment(attachment_id):
         
         print(f"Sending file: {attachment.filename}, type: {attachment.file_type}, download: {download}")
         
-        return send_file(
-            io.BytesIO(attachment.file_data),
+        if attachment.content_hash:
+            blob_store = get_blob_store()
+            file_obj = blob_store.local_path(attachment.content_hash) or blob_store.open(attachment.content_hash)
+            etag = attachment.content_hash
+        else:
+            file_obj = io.BytesIO(attachment.file_data)
+            etag = hashlib.sha256(attachment.file_data).hexdigest()
+        
+        response = send_file(
+            file_obj,
             mimetype=attachment.file_type,
             as_attachment=download,
-            download_name=attachment.filename
+            download_name=attachment.filename,
+            conditional=True,
+            etag=etag,
+            last_modified=attachment.created_at,
+            max_age=ATTACHMENT_MAX_AGE
         )
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
     except Exception as e:
         print(f"Error retrieving attachment: {str(e)}")
         import traceback
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from backend.models.database import db
+from backend.models.message import Message
+from backend.models.spam_feedback import SpamFeedback
+from backend.models.spam_model_registry import spam_model_registry
+from backend.models.incremental_spam_model import (INCREMENTAL_MODEL_PATH, load_incremental_model,
+                                                   save_incremental_model, partial_fit_batches)
+
+FEEDBACK_BATCH_SIZE = 500
+
+class SpamFeedbackTrainer:
+    """Folds recorded spam/not-spam corrections into the incremental model.
+
+    Each run reads untrained feedback in batches, partial_fits the saved
+    hashing + SGD model on it, smoke-tests and saves the result and only then
+    marks the feedback as trained, so a rejected model leaves the corrections
+    queued for the next run.
+
+    The result is published through the registry when the incremental model
+    is already the one being served. Replacing a different served model (the
+    shipped random forest or compact artifact) only happens when
+    replace_base_model is set, or the SPAM_FEEDBACK_REPLACES_BASE_MODEL config
+    when it is None; otherwise the model is saved for an admin to publish.
+    """
+
+    def __init__(self, registry=spam_model_registry, model_path=INCREMENTAL_MODEL_PATH,
+                 batch_size=FEEDBACK_BATCH_SIZE, replace_base_model=None):
+        self.registry = registry
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.replace_base_model = replace_base_model
+        self.last_run = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def pending_count(self):
+        return SpamFeedback.query.filter(SpamFeedback.trained_at.is_(None)).count()
+
+    def feedback_batches(self, consumed):
+        last_id = 0
+        while True:
+            rows = db.session.query(
+                SpamFeedback.id, SpamFeedback.is_spam, Message.subject, Message.body
+            ).outerjoin(
+                Message, Message.id == SpamFeedback.message_id
+            ).filter(
+                SpamFeedback.trained_at.is_(None),
+                SpamFeedback.id > last_id
+            ).order_by(SpamFeedback.id).limit(self.batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            consumed.extend(row.id for row in rows)
+            labelled = [row for row in rows if row.subject is not None]
+            yield [f"{row.subject} {row.body}" for row in labelled], [int(row.is_spam) for row in labelled]
+
+    def run_once(self):
+        """Train on all pending feedback and return a summary of the run."""
+        with self.lock:
+            summary = {"trained": 0, "version": None, "published": False}
+            self.last_run = datetime.utcnow()
+
+            previous = load_incremental_model(self.model_path)
+            if previous is None:
+                print(f"No incremental spam model at {self.model_path}; train one with --out-of-core first")
+                summary["error"] = "No incremental base model"
+                return summary
+            model, state = previous
+
+            consumed = []
+            partial_fit_batches(model, self.feedback_batches(consumed), state)
+            if not consumed:
+                return summary
+
+            version = hashlib.sha256(pickle.dumps(model)).hexdigest()[:12]
+            try:
+                self.registry.smoke_test(model)
+            except ValueError as e:
+                print(f"Feedback-trained spam model rejected: {e}")
+                summary["error"] = str(e)
+                return summary
+
+            state['feedback_trained'] = state.get('feedback_trained', 0) + len(consumed)
+            save_incremental_model(model, state, self.model_path)
+
+            served = self.registry.get()
+            serving_incremental = served is not None and served.path is not None and \
+                os.path.abspath(served.path) == os.path.abspath(self.model_path)
+            if serving_incremental or self.replaces_base_model():
+                if not serving_incremental:
+                    print(f"Replacing served spam model {served.version if served else None} "
+                          f"({served.path if served else None}) with feedback-trained model {version}")
+                self.registry.publish(self.model_path, model=model, version=version)
+                summary["published"] = True
+            else:
+                print(f"Feedback-trained spam model {version} saved to {self.model_path} but not published: "
+                      f"the served model is {served.version if served else None}; "
+                      f"publish it from the admin model endpoint or set SPAM_FEEDBACK_REPLACES_BASE_MODEL")
+
+            SpamFeedback.query.filter(SpamFeedback.id.in_(consumed)) \
+                              .update({SpamFeedback.trained_at: datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
+
+            summary.update(trained=len(consumed), version=version)
+            print(f"Trained on {len(consumed)} feedback corrections into spam model {version}")
+            return summary
+
+    def replaces_base_model(self):
+        if self.replace_base_model is not None:
+            return self.replace_base_model
+        return current_app.config.get('SPAM_FEEDBACK_REPLACES_BASE_MODEL', False)
+
+    def start(self, app, interval):
+        """Run the trainer every interval seconds on a daemon thread."""
+        if interval <= 0 or (self.thread and self.thread.is_alive()):
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    with app.app_context():
+                        self.run_once()
+                except Exception as e:
+                    print(f"Error in spam feedback training: {e}")
+                    import traceback
+                    traceback.print_exc()
+
+        self.thread = threading.Thread(target=loop, name="spam-feedback-trainer", daemon=True)
+        self.thread.start()
+
+spam_feedback_trainer = SpamFeedbackTrainer()
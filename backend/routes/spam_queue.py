@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+
+class SpamClassificationQueue:
+    """In-process work queue that classifies sent messages off the request path.
+
+    Worker threads pull queued items and hand them to the handler in
+    micro-batches of up to batch_size, waiting at most max_wait seconds for a
+    batch to fill, so the model scores several messages per predict_proba call.
+
+    A batch whose handler raises is put back up to max_retries times. Items
+    that are lost anyway (retries exhausted, process restart) are found again
+    by recover, which returns the items still awaiting classification. It
+    runs on a background thread as soon as the workers start, so starting the
+    queue from a request never blocks on it, and then every recovery_interval
+    seconds. key(item) identifies an item: one that is already queued or being
+    classified is not queued again by a sweep or a submit.
+    """
+
+    def __init__(self, handler, batch_size=32, max_wait=0.05, workers=2,
+                 recover=None, recovery_interval=300, max_retries=3, retry_delay=1.0, key=None):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.workers = workers
+        self.recover = recover
+        self.recovery_interval = recovery_interval
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.key = key or (lambda item: item)
+        self.pending = queue.Queue()
+        self.queued = set()
+        self.recovered = threading.Event()
+        self.threads = []
+        self.recovery_thread = None
+        self.app = None
+        self.lock = threading.Lock()
+
+    def start(self, app):
+        with self.lock:
+            self.app = app
+            self.threads = [t for t in self.threads if t.is_alive()]
+            while len(self.threads) < self.workers:
+                thread = threading.Thread(target=self._run, name=f"spam-classifier-{len(self.threads)}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+            if self.recover and not (self.recovery_thread and self.recovery_thread.is_alive()):
+                self.recovery_thread = threading.Thread(target=self._recover_loop, name="spam-classifier-recovery",
+                                                        daemon=True)
+                self.recovery_thread.start()
+
+    def submit(self, app, item):
+        self.start(app)
+        self._put(item)
+
+    def drain(self):
+        """Block until the startup recovery sweep and every queued item have been classified."""
+        if self.recovery_thread:
+            self.recovered.wait()
+        self.pending.join()
+
+    def requeue_unclassified(self, min_age=0):
+        """Queue every item recover reports as unclassified for at least min_age seconds.
+
+        Items that were queued or being classified when the sweep began are
+        skipped, even if they finished before recover returned.
+        """
+        with self.lock:
+            in_flight = set(self.queued)
+        with self.app.app_context():
+            items = list(self.recover(min_age))
+        requeued = sum(self._put(item, skip=in_flight) for item in items)
+        if requeued:
+            print(f"Re-queued {requeued} messages still awaiting spam classification")
+        return requeued
+
+    def _put(self, item, skip=()):
+        key = self.key(item)
+        with self.lock:
+            if key in self.queued or key in skip:
+                return False
+            self.queued.add(key)
+        self.pending.put((item, 0))
+        return True
+
+    def _requeue_safely(self, min_age):
+        try:
+            self.requeue_unclassified(min_age)
+        except Exception as e:
+            print(f"Error re-queueing unclassified messages: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def _recover_loop(self):
+        self._requeue_safely(0)
+        self.recovered.set()
+        while True:
+            time.sleep(self.recovery_interval)
+            self._requeue_safely(self.recovery_interval)
+
+    def _next_batch(self):
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            retries = []
+            try:
+                with self.app.app_context():
+                    self.handler([item for item, _ in batch])
+            except Exception as e:
+                print(f"Error classifying batch of {len(batch)} messages: {e}")
+                import traceback
+                traceback.print_exc()
+                retries = [(item, attempts + 1) for item, attempts in batch if attempts < self.max_retries]
+                if retries:
+                    time.sleep(self.retry_delay)
+                    for retry in retries:
+                        self.pending.put(retry)
+                    print(f"Retrying {len(retries)} messages, {len(batch) - len(retries)} left for recovery")
+            finally:
+                retried = {self.key(item) for item, _ in retries}
+                with self.lock:
+                    self.queued.difference_update(self.key(item) for item, _ in batch
+                                                  if self.key(item) not in retried)
+                for _ in batch:
+                    self.pending.task_done()
@@ -0,0 +1,73 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+WHITESPACE = re.compile(r'\s+')
+
+def normalize_text(text):
+    return WHITESPACE.sub(' ', text).strip().lower()
+
+class SpamVerdictCache:
+    """Bounded LRU cache of spam probabilities with a per-entry TTL.
+
+    Entries are keyed by a hash of the normalized message text together with
+    the model version, so a verdict is only ever reused for the model that
+    produced it. Least recently used entries are evicted past max_entries.
+    """
+
+    def __init__(self, max_entries=10000, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def key(self, text, model_version):
+        digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+        return f"{model_version}:{digest}"
+
+    def get(self, text, model_version):
+        key = self.key(text, model_version)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, text, model_version, probability):
+        key = self.key(text, model_version)
+        with self.lock:
+            self.entries[key] = (probability, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+spam_verdict_cache = SpamVerdictCache()
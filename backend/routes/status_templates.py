@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from backend.models.status_message import StatusMessage
+
+JOB_TITLE_PLACEHOLDER = '{job_title}'
+
+DEFAULT_STATUS_MESSAGES = {
+    "pending": "Thank you for your application for {job_title}. Your application is currently in our pending queue and will be reviewed soon.",
+    "under_review": "Good news! Your application for {job_title} is now being reviewed by our team. We'll be in touch with updates as we evaluate your candidacy.",
+    "accepted": "Congratulations! We are pleased to inform you that your application for {job_title} has been accepted. We'll contact you shortly with next steps regarding the interview process.",
+    "rejected": "Thank you for your interest in {job_title}. After careful consideration, we regret to inform you that we've decided to move forward with other candidates at this time.\n\nWe appreciate your interest in our organization and wish you success in your job search."
+}
+
+def status_template_key(status):
+    return status.lower().replace(' ', '_')
+
+class StatusTemplate:
+    """A status message with its text pre-split on the {job_title} placeholder."""
+
+    __slots__ = ('text', 'parts')
+
+    def __init__(self, text):
+        self.text = text
+        self.parts = text.split(JOB_TITLE_PLACEHOLDER)
+
+    def render(self, job_title):
+        return job_title.join(self.parts)
+
+DEFAULT_STATUS_TEMPLATES = {key: StatusTemplate(text) for key, text in DEFAULT_STATUS_MESSAGES.items()}
+
+class StatusTemplateCache:
+    """Per-employer cache of compiled custom status templates.
+
+    Employers without custom templates are cached as an empty map, so once an
+    employer is loaded no auto-reply for them touches the database until
+    save_status_messages invalidates the entry. The TTL bounds how long other
+    processes can serve templates that were changed elsewhere.
+
+    Misses are read from the database outside the lock, so every invalidation
+    bumps a generation counter; a load that overlapped an invalidation of its
+    employer is returned to the caller but not cached.
+    """
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.generations = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_many(self, employer_ids):
+        """Return {employer_id: {status_key: StatusTemplate}}, loading misses in one query."""
+        employer_ids = {int(employer_id) for employer_id in employer_ids if employer_id is not None}
+        now = time.monotonic()
+        found = {}
+        with self.lock:
+            for employer_id in employer_ids:
+                entry = self.entries.get(employer_id)
+                if entry is not None and entry[1] > now:
+                    self.entries.move_to_end(employer_id)
+                    found[employer_id] = entry[0]
+            self.hits += len(found)
+            self.misses += len(employer_ids) - len(found)
+            missing = employer_ids - found.keys()
+            generation = self.generation
+            generations = {employer_id: self.generations.get(employer_id, 0) for employer_id in missing}
+
+        if missing:
+            loaded = {employer_id: {} for employer_id in missing}
+            for row in StatusMessage.query.filter(StatusMessage.user_id.in_(missing)).all():
+                loaded[row.user_id][row.status] = StatusTemplate(row.message)
+            with self.lock:
+                for employer_id, templates in loaded.items():
+                    if self.generation != generation or self.generations.get(employer_id, 0) != generations[employer_id]:
+                        continue
+                    self.entries[employer_id] = (templates, now + self.ttl)
+                    self.entries.move_to_end(employer_id)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            found.update(loaded)
+        return found
+
+    def get(self, employer_id):
+        if employer_id is None:
+            return {}
+        return self.get_many([employer_id])[int(employer_id)]
+
+    def invalidate(self, employer_id=None):
+        with self.lock:
+            if employer_id is None:
+                self.entries.clear()
+                self.generation += 1
+            else:
+                employer_id = int(employer_id)
+                self.entries.pop(employer_id, None)
+                self.generations[employer_id] = self.generations.get(employer_id, 0) + 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+status_template_cache = StatusTemplateCache()
@@ -12,12 +12,7 @@ document.addEventListener("DOMContentLoaded", () => {
     .then(data => {
       window.allApplications = data.applications;
       
-      const uniqueCategories = new Set();
-      data.applications.forEach(app => {
-        if (app.job_category && app.job_category !== 'N/A') {
-          uniqueCategories.add(app.job_category);
-        }
-      });
+      const uniqueCategories = new Set(Object.keys(data.category_counts));
 
       const categoryFilter = document.getElementById("categoryFilter");
       if (categoryFilter) {
@@ -38,12 +33,41 @@ document.addEventListener("DOMContentLoaded", () => {
       renderDayOfWeekChart(data.day_of_week_counts);
 
       displayApplicationCards(data.applications);
+      appendLoadMoreButton(data.next_cursor);
     })
     .catch(err => {
       console.error("Error fetching dashboard data:", err);
     });
 });
 
+function loadMoreApplications(cursor) {
+  const currentUserId = localStorage.getItem("user_id") || "0";
+  fetch(`/dashboard/employee/${currentUserId}?cursor=${encodeURIComponent(cursor)}`)
+    .then(res => res.json())
+    .then(data => {
+      window.allApplications = window.allApplications.concat(data.applications);
+      filterApplications();
+      appendLoadMoreButton(data.next_cursor);
+    })
+    .catch(err => {
+      console.error("Error loading more applications:", err);
+    });
+}
+
+function appendLoadMoreButton(cursor) {
+  const applicationsContainer = document.querySelector('.applications-container');
+  if (!cursor || !applicationsContainer) return;
+
+  const button = document.createElement("button");
+  button.classList.add("load-more-btn");
+  button.textContent = "Load more applications";
+  button.addEventListener("click", () => {
+    button.remove();
+    loadMoreApplications(cursor);
+  });
+  applicationsContainer.appendChild(button);
+}
+
 function filterApplications() {
   const statusFilter = document.getElementById("statusFilter").value;
   const categoryFilter = document.getElementById("categoryFilter").value;
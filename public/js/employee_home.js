@@ -117,7 +117,7 @@ function fetchRecentApplications() {
         return;
     }
     
-    fetch(`/dashboard/employee/${userId}`)
+    fetch(`/dashboard/employee/${userId}?limit=4`)
         .then(response => {
             if (!response.ok) {
                 throw new Error('Failed to fetch application data');
@@ -15,33 +15,15 @@ document.addEventListener("DOMContentLoaded", () => {
     .then(data => {
       window.allApplications = data.applications;
       
-      const uniqueCategories = new Set();
-      data.applications.forEach(app => {
-        if (app.job_category && app.job_category !== "N/A") {
-          uniqueCategories.add(app.job_category);
-        }
-        
-        if (app.subject && app.subject.toLowerCase().includes("application for:")) {
-          const jobTitle = app.subject.split("Application for:")[1].trim();
-          window.jobTitles.add(jobTitle);
-        }
-      });
-      
       const categoryFilter = document.getElementById("categoryFilter");
-      uniqueCategories.forEach(category => {
+      Object.keys(data.category_counts).forEach(category => {
         const option = document.createElement("option");
         option.value = category;
         option.textContent = category;
         categoryFilter.appendChild(option);
       });
       
-      const jobTitleFilter = document.getElementById("jobTitleFilter");
-      window.jobTitles.forEach(title => {
-        const option = document.createElement("option");
-        option.value = title;
-        option.textContent = title;
-        jobTitleFilter.appendChild(option);
-      });
+      addJobTitleOptions(data.applications);
       
       renderStatusChart(data.status_counts);
       renderTimeSeriesChart(data.time_series);
@@ -52,12 +34,60 @@ document.addEventListener("DOMContentLoaded", () => {
       
       displayApplicationCards(window.openApplications, "applicationsGrid");
       displayApplicationCards(window.closedApplications, "closedApplicationsGrid");
+      appendLoadMoreButton(data.next_cursor);
     })
     .catch(err => {
       console.error("Error loading dashboard data:", err);
     });
 });
 
+function addJobTitleOptions(applications) {
+  const jobTitleFilter = document.getElementById("jobTitleFilter");
+  applications.forEach(app => {
+    if (app.subject && app.subject.toLowerCase().includes("application for:")) {
+      const jobTitle = app.subject.split("Application for:")[1].trim();
+      if (!window.jobTitles.has(jobTitle)) {
+        window.jobTitles.add(jobTitle);
+        const option = document.createElement("option");
+        option.value = jobTitle;
+        option.textContent = jobTitle;
+        jobTitleFilter.appendChild(option);
+      }
+    }
+  });
+}
+
+function loadMoreApplications(cursor) {
+  const currentUserId = localStorage.getItem("user_id") || "0";
+  fetch(`/dashboard/employer/${currentUserId}?cursor=${encodeURIComponent(cursor)}`)
+    .then(res => res.json())
+    .then(data => {
+      window.allApplications = window.allApplications.concat(data.applications);
+      addJobTitleOptions(data.applications);
+      separateApplications(window.allApplications);
+      filterApplications();
+      appendLoadMoreButton(data.next_cursor);
+    })
+    .catch(err => {
+      console.error("Error loading more applications:", err);
+      showToast("Failed to load more applications");
+    });
+}
+
+function appendLoadMoreButton(cursor) {
+  const applicationsContainer = document.querySelector(".applications-container");
+  if (!cursor || !applicationsContainer) return;
+  
+  const button = document.createElement("button");
+  button.classList.add("load-more-btn");
+  button.textContent = "Load more applications";
+  button.addEventListener("click", () => {
+    button.remove();
+    loadMoreApplications(cursor);
+  });
+  applicationsContainer.appendChild(button);
+}
+
 function separateApplications(applications) {
   window.openApplications = applications.filter(app => !app.job_closed);
   window.closedApplications = applications.filter(app => app.job_closed);
@@ -378,7 +408,11 @@ function applyBulkAction() {
     return response.json();
   })
   .then(data => {
+    const failedIds = new Set((data.failed || []).map(failure => String(failure.message_id)));
     window.selectedApplications.forEach(appId => {
+      if (failedIds.has(String(appId))) {
+        return;
+      }
       const appIndex = window.allApplications.findIndex(app => app.id == appId);
       if (appIndex !== -1) {
         window.allApplications[appIndex].status = action;
@@ -408,7 +442,11 @@ function applyBulkAction() {
     document.getElementById("selectAll").checked = false;
     updateBulkActionsPanel();
     
-    showToast(`Successfully updated ${data.updated_count || data.count || 'all'} applications`);
+    if (failedIds.size > 0) {
+      showToast(`Updated ${data.updated_count} applications, ${failedIds.size} could not be updated`);
+    } else {
+      showToast(`Successfully updated ${data.updated_count || data.count || 'all'} applications`);
+    }
   })
   .catch(error => {
     console.error('Error applying bulk action:', error);
@@ -41,6 +41,7 @@ document.addEventListener("DOMContentLoaded", () => {
   setupSidebarNavigation();
 
   loadInbox();
+  subscribeToMessageEvents();
   
   createMessageDetailContainer();
 
@@ -48,6 +49,31 @@ document.addEventListener("DOMContentLoaded", () => {
   localStorage.setItem('isEmployer', isEmployerPage);
 });
 
+function subscribeToMessageEvents() {
+  if (!window.EventSource || !currentUserId || currentUserId === "0") return;
+
+  const refreshCurrentFolder = () => {
+    if (currentView === 'inbox') {
+      loadInbox();
+    } else if (currentView === 'sent') {
+      loadSentMessages();
+    } else if (currentView === 'spam') {
+      loadSpam();
+    }
+  };
+
+  const events = new EventSource(`/messages/stream/${currentUserId}`);
+  events.addEventListener('new_message', event => {
+    const data = JSON.parse(event.data);
+    if (data.folder === 'inbox') {
+      showToast("New message received");
+    }
+    refreshCurrentFolder();
+  });
+  events.addEventListener('status_change', refreshCurrentFolder);
+  events.addEventListener('spam_reclassified', refreshCurrentFolder);
+}
+
 function showToast(message) {
   let toast = document.createElement("div");
   toast.className = "toast-notification";
@@ -194,6 +220,7 @@ function sendMessage() {
   const recipientEmail = document.getElementById('recipient-email').value;
   
   let subject;
+  let jobId;
   const subjectInput = document.getElementById('subject-input');
   const subjectDropdown = document.getElementById('subject-dropdown');
   
@@ -202,6 +229,7 @@ function sendMessage() {
   } else if (subjectDropdown && subjectDropdown.selectedIndex > 0) {
     const selectedOption = subjectDropdown.options[subjectDropdown.selectedIndex];
     subject = `Application for: ${selectedOption.text}`;
+    jobId = selectedOption.dataset.jobId;
   } else {
     showToast('Please enter a subject');
     return;
@@ -225,6 +253,9 @@ function sendMessage() {
   formData.append('recipient_email', recipientEmail);
   formData.append('subject', subject);
   formData.append('body', messageBody);
+  if (jobId) {
+    formData.append('job_id', jobId);
+  }
   
   const draftId = document.getElementById('compose-modal').dataset.draftId;
   
@@ -442,6 +473,7 @@ function sendMessage() {
   const recipientEmail = document.getElementById('recipient-email').value;
   
   let subject;
+  let jobId;
   const subjectInput = document.getElementById('subject-input');
   const subjectDropdown = document.getElementById('subject-dropdown');
   
@@ -450,6 +482,7 @@ function sendMessage() {
   } else if (subjectDropdown) {
     const selectedOption = subjectDropdown.options[subjectDropdown.selectedIndex];
     subject = selectedOption.value ? `Application for: ${selectedOption.text}` : '';
+    jobId = selectedOption.dataset.jobId;
   }
   
   const messageBody = document.getElementById('message-body').value;
@@ -468,6 +501,9 @@ function sendMessage() {
   formData.append('recipient_email', recipientEmail);
   formData.append('subject', subject);
   formData.append('body', messageBody);
+  if (jobId) {
+    formData.append('job_id', jobId);
+  }
   
   const draftId = document.getElementById('compose-modal').dataset.draftId;
   if (draftId) {
@@ -697,10 +733,9 @@ function loadInbox() {
     inboxMessages.innerHTML = '<p style="padding:20px;">Loading messages...</p>';
   }
 
-  fetch(`/messages/inbox/${currentUserId}`)
-    .then(res => res.json())
-    .then(data => {
-      renderInbox(data, 'inbox');
+  fetchFolderPage(`/messages/inbox/${currentUserId}`)
+    .then(page => {
+      renderInbox(page.data, 'inbox', page.nextCursor);
     })
     .catch(err => {
       console.error("Error loading inbox:", err);
@@ -708,6 +743,36 @@ function loadInbox() {
     });
 }
 
+function fetchFolderPage(url, cursor = null) {
+  const pageUrl = cursor ? `${url}?cursor=${encodeURIComponent(cursor)}` : url;
+  return fetch(pageUrl).then(res => res.json().then(data => ({
+    data: data,
+    nextCursor: res.headers.get('X-Next-Cursor')
+  })));
+}
+
+function appendLoadMoreButton(container, onLoadMore) {
+  const button = document.createElement("button");
+  button.classList.add("load-more-btn");
+  button.textContent = "Load more";
+  button.addEventListener("click", () => {
+    button.remove();
+    onLoadMore();
+  });
+  container.appendChild(button);
+}
+
+function loadMoreMessages(view, cursor) {
+  fetchFolderPage(`/messages/${view}/${currentUserId}`, cursor)
+    .then(page => {
+      renderInbox(page.data, view, page.nextCursor, true);
+    })
+    .catch(err => {
+      console.error(`Error loading more ${view} messages:`, err);
+      showToast("Failed to load more messages");
+    });
+}
+
 function loadSentMessages() {
   if (!currentUserId || currentUserId === "0") {
     console.error("User not logged in: cannot load sent messages.");
@@ -723,10 +788,9 @@ function loadSentMessages() {
     inboxMessages.innerHTML = '<p style="padding:20px;">Loading messages...</p>';
   }
 
-  fetch(`/messages/sent/${currentUserId}`)
-    .then(res => res.json())
-    .then(data => {
-      renderInbox(data, 'sent');
+  fetchFolderPage(`/messages/sent/${currentUserId}`)
+    .then(page => {
+      renderInbox(page.data, 'sent', page.nextCursor);
     })
     .catch(err => {
       console.error("Error loading sent messages:", err);
@@ -749,10 +813,9 @@ function loadDraftMessages() {
     inboxMessages.innerHTML = '<p style="padding:20px;">Loading drafts...</p>';
   }
 
-  fetch(`/messages/drafts/${currentUserId}`)
-    .then(res => res.json())
-    .then(data => {
-      renderInbox(data, 'drafts');
+  fetchFolderPage(`/messages/drafts/${currentUserId}`)
+    .then(page => {
+      renderInbox(page.data, 'drafts', page.nextCursor);
     })
     .catch(err => {
       console.error("Error loading drafts:", err);
@@ -782,15 +845,12 @@ function loadSpam() {
         `;
         
         data.messages.forEach(message => {
-          html += `
-            <div class="email-item" onclick="viewSpamMessage(${JSON.stringify(message).replace(/"/g, '&quot;')})">
-              <div class="sender">${message.sender_name || message.sender_email}</div>
-              <div class="subject">${message.subject}</div>
-              <div class="time">${message.created_at}</div>
-            </div>
-          `;
+          html += spamItemHtml(message);
         });
         inboxContainer.innerHTML = html;
+        if (data.next_cursor) {
+          appendLoadMoreButton(inboxContainer, () => loadMoreSpam(data.next_cursor));
+        }
       } else {
         inboxContainer.innerHTML = `
           <div class="inbox-header">
@@ -810,6 +870,34 @@ function loadSpam() {
     });
 }
 
+function spamItemHtml(message) {
+  return `
+    <div class="email-item" onclick="viewSpamMessage(${JSON.stringify(message).replace(/"/g, '&quot;')})">
+      <div class="sender">${message.sender_name || message.sender_email}</div>
+      <div class="subject">${message.subject}</div>
+      <div class="time">${message.created_at}</div>
+    </div>
+  `;
+}
+
+function loadMoreSpam(cursor) {
+  const inboxContainer = document.getElementById('inbox-messages');
+  fetch(`/messages/spam/${currentUserId}?cursor=${encodeURIComponent(cursor)}`)
+    .then(response => response.json())
+    .then(data => {
+      (data.messages || []).forEach(message => {
+        inboxContainer.insertAdjacentHTML('beforeend', spamItemHtml(message));
+      });
+      if (data.next_cursor) {
+        appendLoadMoreButton(inboxContainer, () => loadMoreSpam(data.next_cursor));
+      }
+    })
+    .catch(error => {
+      console.error('Error loading more spam messages:', error);
+      showToast("Failed to load more messages");
+    });
+}
+
 function viewSpamMessage(message) {
   currentView = 'message';
   currentMessage = message;
@@ -838,10 +926,22 @@ function viewSpamMessage(message) {
         <div><strong>Date:</strong> ${message.created_at}</div>
       </div>
     </div>
-    <div class="message-body">
-      ${message.body}
+    <div class="message-body" id="spam-message-body">
+      ${message.body || message.snippet}
     </div>
   `;
+
+  if (message.body === undefined) {
+    fetch(`/messages/${message.id}?user_id=${currentUserId}`)
+      .then(res => res.json())
+      .then(fullMessage => {
+        const bodyDiv = document.getElementById("spam-message-body");
+        if (bodyDiv && fullMessage.body !== undefined) {
+          bodyDiv.innerHTML = fullMessage.body;
+        }
+      })
+      .catch(err => console.error("Error loading spam message body:", err));
+  }
   
   document.getElementById("back-to-spam").addEventListener("click", loadSpam);
   
@@ -871,22 +971,25 @@ function moveMessageFromSpam(messageId) {
   });
 }
 
-function renderInbox(messages, view = 'inbox') {
+function renderInbox(messages, view = 'inbox', nextCursor = null, append = false) {
   const container = document.getElementById("inbox-messages");
   if (!container) return;
-  container.innerHTML = "";
 
-  if (!messages || messages.length === 0) {
-    container.innerHTML = `<p style='padding:20px;'>No ${view} messages found.</p>`;
-    return;
-  }
+  if (!append) {
+    container.innerHTML = "";
+
+    if (!messages || messages.length === 0) {
+      container.innerHTML = `<p style='padding:20px;'>No ${view} messages found.</p>`;
+      return;
+    }
 
-  const header = document.createElement("div");
-  header.classList.add("inbox-header");
-  header.textContent = (view === 'inbox') ? "Inbox" :
-                         (view === 'sent') ? "Sent Messages" :
-                         (view === 'drafts') ? "Drafts" : "";
-  container.appendChild(header);
+    const header = document.createElement("div");
+    header.classList.add("inbox-header");
+    header.textContent = (view === 'inbox') ? "Inbox" :
+                           (view === 'sent') ? "Sent Messages" :
+                           (view === 'drafts') ? "Drafts" : "";
+    container.appendChild(header);
+  }
 
   messages.forEach(msg => {
     const item = document.createElement("div");
@@ -915,11 +1018,15 @@ function renderInbox(messages, view = 'inbox') {
         <div class="subject">${msg.subject} ${statusBadge}</div>
         <div class="time">${msg.created_at}</div>
       `;
-      item.addEventListener("click", () => viewDraft(msg));
+      item.addEventListener("click", () => openDraft(msg));
     }
     
     container.appendChild(item);
   });
+
+  if (nextCursor) {
+    appendLoadMoreButton(container, () => loadMoreMessages(view, nextCursor));
+  }
 }
 
 function viewMessage(message, source = 'inbox') {
@@ -942,7 +1049,7 @@ function viewMessage(message, source = 'inbox') {
     })
     .catch(err => {
       console.error("Error fetching complete message data:", err);
-      displayFullMessageDetails(message, source);
+      displayFullMessageDetails({ ...message, body: message.snippet || "" }, source);
     });
     
   const inboxMessages = document.getElementById("inbox-messages");
@@ -1255,6 +1362,23 @@ function closeCompose() {
   }
 }
 
+function openDraft(draft) {
+  fetch(`/messages/${draft.id}?user_id=${currentUserId}`)
+    .then(res => {
+      if (!res.ok) {
+        throw new Error(`Server returned ${res.status}: ${res.statusText}`);
+      }
+      return res.json();
+    })
+    .then(fullDraft => {
+      viewDraft({ ...draft, body: fullDraft.body });
+    })
+    .catch(err => {
+      console.error("Error loading draft:", err);
+      showToast("Failed to load draft");
+    });
+}
+
 function viewDraft(draft) {
   currentDraftId = draft.id;
   
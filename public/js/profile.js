@@ -535,7 +535,7 @@ function loadReceivedApplications() {
             if (data.applications && data.applications.length > 0) {
                 window.employerApplications = data.applications;
                 
-                updateApplicationsCount(data.applications.length);
+                updateApplicationsCount(Object.values(data.status_counts).reduce((total, count) => total + count, 0));
                 
                 populateJobFilter(data.applications);
                 
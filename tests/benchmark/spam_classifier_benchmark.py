@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from backend.models.spam_model_registry import SpamModelRegistry
+from backend.routes.messages import spam_probabilities
+from backend.routes.spam_verdict_cache import SpamVerdictCache
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'ML', 'email_spam_dataset.csv')
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+DEFAULT_TOLERANCE = 0.25
+
+def sample_messages(count, seed=42, path=DATASET_PATH):
+    df = pd.read_csv(path)
+    sample = df.sample(n=count, replace=count > len(df), random_state=seed)
+    return list(zip(sample['subject'].fillna(''), sample['message'].fillna('')))
+
+def percentile_ms(latencies, q):
+    return round(float(np.percentile(latencies, q)) * 1000, 4)
+
+def measure_latency(texts, registry, cache):
+    """Score each text on its own through spam_probabilities and return the per-call seconds."""
+    latencies = []
+    for text in texts:
+        cache.invalidate()
+        call_start = time.perf_counter()
+        spam_probabilities([text], registry=registry, cache=cache)
+        latencies.append(time.perf_counter() - call_start)
+    return latencies
+
+def measure_throughput(model, texts, batch_sizes, min_seconds):
+    """Call predict_proba on batches of each size until min_seconds have passed."""
+    throughput = []
+    for batch_size in batch_sizes:
+        batch = [texts[i % len(texts)] for i in range(batch_size)]
+        scored = 0
+        batch_start = time.perf_counter()
+        while True:
+            model.predict_proba(batch)
+            scored += batch_size
+            elapsed = time.perf_counter() - batch_start
+            if elapsed >= min_seconds:
+                break
+        throughput.append({"batch_size": batch_size, "messages_per_second": round(scored / elapsed, 1)})
+    return throughput
+
+def traced_peak(phase, *args):
+    """Run phase with tracemalloc on and return its peak traced memory in bytes."""
+    tracemalloc.start()
+    try:
+        phase(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmark(model_path=None, samples=1000, batch_sizes=BATCH_SIZES, seed=42, min_seconds=0.5):
+    """Replay sampled dataset messages through the production spam classifier.
+
+    The model is loaded into a private registry and verdict cache, so running
+    the benchmark inside a live process never changes the model it serves.
+    Per-message latency goes through spam_probabilities(), the scoring path
+    send_message uses, with the cache cleared before each call so every
+    message pays for a model prediction. Throughput calls the model's
+    predict_proba on batches of each size until min_seconds have passed.
+    Both are timed with tracing off; the per-phase memory peaks come from a
+    second, traced pass that runs each batch size once.
+    """
+    messages = sample_messages(samples, seed)
+    texts = [f"{subject} {body}" for subject, body in messages]
+
+    start = time.perf_counter()
+    registry = SpamModelRegistry(model_path)
+    loaded = registry.get()
+    load_ms = (time.perf_counter() - start) * 1000
+    if loaded is None:
+        raise RuntimeError("Spam model could not be loaded")
+    cache = SpamVerdictCache()
+
+    latencies = measure_latency(texts, registry, cache)
+    throughput = measure_throughput(loaded.model, texts, batch_sizes, min_seconds)
+
+    latency_peak = traced_peak(measure_latency, texts, registry, cache)
+    throughput_peak = traced_peak(measure_throughput, loaded.model, texts, batch_sizes, 0)
+
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "model_version": loaded.version,
+        "model_path": loaded.path,
+        "samples": len(messages),
+        "load_ms": round(load_ms, 2),
+        "latency_ms": {
+            "p50": percentile_ms(latencies, 50),
+            "p95": percentile_ms(latencies, 95),
+            "p99": percentile_ms(latencies, 99),
+            "mean": round(float(np.mean(latencies)) * 1000, 4)
+        },
+        "throughput": throughput,
+        "peak_memory_mb": {
+            "latency": round(latency_peak / 1024 / 1024, 2),
+            "throughput": round(throughput_peak / 1024 / 1024, 2),
+            "max_rss": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+        }
+    }
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return a message for every metric that is worse than baseline by more than tolerance."""
+    regressions = []
+    for q in ('p50', 'p95', 'p99'):
+        limit = baseline['latency_ms'][q] * (1 + tolerance)
+        if results['latency_ms'][q] > limit:
+            regressions.append(f"{q} latency {results['latency_ms'][q]}ms exceeds {limit:.4f}ms")
+
+    baseline_throughput = {row['batch_size']: row['messages_per_second'] for row in baseline['throughput']}
+    for row in results['throughput']:
+        expected = baseline_throughput.get(row['batch_size'])
+        if expected and row['messages_per_second'] < expected * (1 - tolerance):
+            regressions.append(f"batch {row['batch_size']} throughput {row['messages_per_second']} msg/s "
+                               f"is below {expected * (1 - tolerance):.1f} msg/s")
+
+    for phase in ('latency', 'throughput'):
+        if phase not in baseline['peak_memory_mb']:
+            continue
+        limit = baseline['peak_memory_mb'][phase] * (1 + tolerance)
+        if results['peak_memory_mb'][phase] > limit:
+            regressions.append(f"{phase} peak traced memory {results['peak_memory_mb'][phase]}MB exceeds {limit:.2f}MB")
+    return regressions
+
+def print_report(results):
+    latency = results['latency_ms']
+    print(f"Model {results['model_version']} loaded in {results['load_ms']}ms, {results['samples']} messages replayed")
+    print(f"is_spam latency: p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms")
+    print(f"{'Batch size':>10}  {'Messages/s':>12}")
+    for row in results['throughput']:
+        print(f"{row['batch_size']:>10}  {row['messages_per_second']:>12,.1f}")
+    memory = results['peak_memory_mb']
+    print(f"Peak traced memory: {memory['latency']}MB latency phase, {memory['throughput']}MB throughput phase, "
+          f"{memory['max_rss']}MB max RSS")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark spam classifier latency, throughput and memory")
+    parser.add_argument('--model', help="model artifact to benchmark (default: the production model)")
+    parser.add_argument('--samples', type=int, default=1000)
+    parser.add_argument('--max-batch-size', type=int, default=1024)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON results of a previous run to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.model, args.samples,
+                            [size for size in BATCH_SIZES if size <= args.max_batch_size], args.seed)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
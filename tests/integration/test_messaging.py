@@ -3,9 +3,14 @@ import os
 import sys
 import json
 import io
-from datetime import datetime
+import shutil
+import tempfile
+import time
+from unittest import mock
+from datetime import datetime, timedelta
 from flask import Flask
 from flask_testing import TestCase
+from sqlalchemy import event
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
@@ -13,7 +18,37 @@ from backend.models.database import db
 from backend.models.user import User
 from backend.models.message import Message
 from backend.models.attachment import Attachment
-from backend.routes.messages import messages_bp
+from backend.models.job import Job
+from backend.models.status_message import StatusMessage
+from backend.routes.messages import messages_bp, collect_attachment_garbage
+from backend.routes.bulk_updates import bulk_updates_bp, apply_bulk_status_update, BULK_UPDATE_CHUNK_SIZE
+from backend.routes.message_events import message_events
+from backend.routes.status_templates import status_template_cache, StatusTemplateCache
+from backend.routes.dashboard import dashboard_bp
+from backend.routes.jobs import jobs_bp
+from backend.routes.admin import admin_bp
+from backend.routes.dashboard_aggregates import rebuild_dashboard_aggregates
+from backend.models.dashboard_aggregate import DashboardAggregate
+from backend.models.blob_store import get_blob_store
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
 
 class MessagingIntegrationTest(TestCase):
     
@@ -23,9 +58,14 @@ class MessagingIntegrationTest(TestCase):
         app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
         app.config['WTF_CSRF_ENABLED'] = False
+        app.config['ATTACHMENT_STORE_PATH'] = tempfile.mkdtemp(prefix='pmail-attachments-')
         app.secret_key = 'test_secret_key'
         
         app.register_blueprint(messages_bp)
+        app.register_blueprint(bulk_updates_bp)
+        app.register_blueprint(dashboard_bp, url_prefix='/dashboard')
+        app.register_blueprint(jobs_bp)
+        app.register_blueprint(admin_bp)
         
         db.init_app(app)
         
@@ -68,6 +108,8 @@ class MessagingIntegrationTest(TestCase):
         print("----- Cleaning up test environment -----")
         db.session.remove()
         db.drop_all()
+        status_template_cache.invalidate()
+        shutil.rmtree(self.app.config['ATTACHMENT_STORE_PATH'], ignore_errors=True)
     
     def test_send_message(self):
         print("\n===== Testing basic message sending =====")
@@ -348,6 +390,758 @@ class MessagingIntegrationTest(TestCase):
         
         print(f"Pass: Message threading tested successfully")
 
+    def test_listing_query_count_is_constant(self):
+        print("\n===== Testing folder listings issue a constant number of queries =====")
+
+        def seed(count):
+            for i in range(count):
+                sender = User(
+                    email=f"applicant{count}_{i}@pmail.com",
+                    password="hashed_password",
+                    first_name="Bulk",
+                    last_name=f"Applicant{i}",
+                    role="employee",
+                    birthdate=datetime.now(),
+                    phone=f"555-000-{count:02d}{i:02d}"
+                )
+                db.session.add(sender)
+                db.session.flush()
+                db.session.add_all([
+                    Message(sender_id=sender.id, recipient_id=1, subject=f"Inbox {i}",
+                            body="Inbox body", is_draft=False, is_spam=False),
+                    Message(sender_id=sender.id, recipient_id=1, subject=f"Spam {i}",
+                            body="Spam body", is_draft=False, is_spam=True),
+                    Message(sender_id=1, recipient_id=sender.id, subject=f"Sent {i}",
+                            body="Sent body", is_draft=False, is_spam=False),
+                    Message(sender_id=1, recipient_id=sender.id, subject=f"Draft {i}",
+                            body="Draft body", is_draft=True, is_spam=False)
+                ])
+            db.session.commit()
+
+        urls = ['/messages/inbox/1', '/messages/sent/1', '/messages/drafts/1', '/messages/spam/1']
+
+        def count_queries():
+            counts = {}
+            for url in urls:
+                db.session.expunge_all()
+                with QueryCounter(db.engine) as counter:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                counts[url] = counter.count
+            return counts
+
+        seed(2)
+        small = count_queries()
+        seed(20)
+        large = count_queries()
+
+        for url in urls:
+            print(f"{url}: {small[url]} queries with 2 participants, {large[url]} with 22")
+            self.assertEqual(small[url], large[url], f"{url} query count grows with mailbox size")
+
+        inbox = json.loads(self.client.get('/messages/inbox/1').data)
+        self.assertEqual(len(inbox), 22)
+        self.assertTrue(all(msg['sender_email'].startswith('applicant') for msg in inbox))
+
+        print("Pass: Folder listings resolve participants in a single batched query")
+
+    def test_inbox_keyset_pagination(self):
+        print("\n===== Testing cursor pagination of the inbox =====")
+
+        base_time = datetime(2024, 1, 1, 12, 0, 0)
+        for i in range(5):
+            db.session.add(Message(
+                sender_id=2,
+                recipient_id=1,
+                subject=f"Paged message {i}",
+                body="Paged body",
+                is_draft=False,
+                is_spam=False,
+                created_at=base_time + timedelta(minutes=i // 2)
+            ))
+        db.session.commit()
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            url = '/messages/inbox/1?limit=2' + (f'&cursor={cursor}' if cursor else '')
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = json.loads(response.data)
+            self.assertLessEqual(len(page), 2)
+            seen.extend(msg['subject'] for msg in page)
+            pages += 1
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [f"Paged message {i}" for i in (4, 3, 2, 1, 0)])
+
+        response = self.client.get('/messages/inbox/1?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+        print(f"Pass: Inbox paged through {len(seen)} messages in {pages} pages")
+
+    def test_listing_returns_summary_without_body(self):
+        print("\n===== Testing folder listings return snippets instead of bodies =====")
+
+        long_body = "Dear hiring team,\n\n" + "I have extensive experience. " * 40
+        message = Message(
+            sender_id=2,
+            recipient_id=1,
+            subject="Application for: Backend Engineer",
+            body=long_body,
+            is_draft=False,
+            is_spam=False
+        )
+        db.session.add(message)
+        db.session.commit()
+
+        response = self.client.get('/messages/inbox/1')
+        self.assertEqual(response.status_code, 200)
+        listing = json.loads(response.data)
+        self.assertEqual(len(listing), 1)
+        self.assertNotIn('body', listing[0])
+        self.assertTrue(listing[0]['snippet'].startswith("Dear hiring team, I have extensive experience."))
+        self.assertTrue(listing[0]['snippet'].endswith("..."))
+        self.assertLessEqual(len(listing[0]['snippet']), 123)
+
+        response = self.client.get(f'/messages/{message.id}?user_id=1')
+        self.assertEqual(json.loads(response.data)['body'], long_body)
+
+        print("Pass: Listing carries a fixed-length snippet and the full body comes from get_message")
+
+    def test_inbox_conditional_get(self):
+        print("\n===== Testing ETag / If-None-Match on the inbox =====")
+
+        db.session.add(Message(sender_id=2, recipient_id=1, subject="Cached message",
+                               body="Cached body", is_draft=False, is_spam=False))
+        db.session.commit()
+
+        response = self.client.get('/messages/inbox/1')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+
+        with QueryCounter(db.engine) as counter:
+            response = self.client.get('/messages/inbox/1', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(counter.count, 0)
+
+        response = self.client.get('/messages/inbox/1?limit=1', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        self.client.post('/messages/send',
+                         data=json.dumps({
+                             'sender_id': 2,
+                             'recipient_email': 'employer@pmail.com',
+                             'subject': 'Application for: Software Developer',
+                             'body': 'I am interested in the Software Developer position.'
+                         }),
+                         content_type='application/json')
+
+        response = self.client.get('/messages/inbox/1', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers.get('ETag'), etag)
+
+        print("Pass: Unchanged inbox answered with 304 and no queries; sending a message changed the ETag")
+
+    def test_message_events_are_pushed(self):
+        print("\n===== Testing push notifications for new mail, status and spam changes =====")
+
+        response = self.client.get('/messages/stream/1', buffered=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.mimetype.startswith('text/event-stream'))
+        self.assertEqual(next(response.response), b"retry: 3000\n\n")
+        response.close()
+
+        employer_events = message_events.subscribe(1)
+        employee_events = message_events.subscribe(2)
+        try:
+            response = self.client.post('/messages/send',
+                                        data=json.dumps({
+                                            'sender_id': 2,
+                                            'recipient_email': 'employer@pmail.com',
+                                            'subject': 'Application for: Software Developer',
+                                            'body': 'I am interested in the Software Developer position.'
+                                        }),
+                                        content_type='application/json')
+            message_id = json.loads(response.data)['message_id']
+
+            event = employer_events.get(timeout=1)
+            self.assertEqual(event['type'], 'new_message')
+            self.assertEqual(event['message_id'], message_id)
+
+            self.client.put(f'/messages/{message_id}/status',
+                            data=json.dumps({'status': 'Accepted'}),
+                            content_type='application/json')
+            employee_types = [employee_events.get(timeout=1)['type'] for _ in range(2)]
+            self.assertEqual(employee_types, ['status_change', 'new_message'])
+            self.assertEqual(employer_events.get(timeout=1)['type'], 'status_change')
+
+            Message.query.get(message_id).is_spam = True
+            db.session.commit()
+            self.client.post(f'/messages/not-spam/{message_id}')
+            event = employer_events.get(timeout=1)
+            self.assertEqual(event['type'], 'spam_reclassified')
+            self.assertFalse(event['is_spam'])
+        finally:
+            message_events.unsubscribe(1, employer_events)
+            message_events.unsubscribe(2, employee_events)
+
+        print("Pass: Send, status change and spam reclassification events reached subscribers")
+
+    def test_attachments_are_deduplicated_in_blob_store(self):
+        print("\n===== Testing content-addressed attachment storage =====")
+
+        pdf_data = b'%PDF-1.5\nIdentical CV sent to several employers'
+
+        def send_cv():
+            response = self.client.post('/messages/send', data={
+                'sender_id': '2',
+                'recipient_email': 'employer@pmail.com',
+                'subject': 'Application for: Software Developer',
+                'body': 'Please find my CV attached.',
+                'attachment': (io.BytesIO(pdf_data), 'cv.pdf')
+            }, content_type='multipart/form-data')
+            self.assertEqual(response.status_code, 201)
+            return json.loads(response.data)['message_id']
+
+        first = Attachment.query.filter_by(message_id=send_cv()).one()
+        second = Attachment.query.filter_by(message_id=send_cv()).one()
+
+        self.assertEqual(first.content_hash, second.content_hash)
+        self.assertIsNone(first.file_data)
+        self.assertEqual(first.file_size, len(pdf_data))
+
+        store_root = self.app.config['ATTACHMENT_STORE_PATH']
+        blobs = [name for _, _, files in os.walk(store_root) for name in files]
+        self.assertEqual(blobs, [first.content_hash])
+        self.assertTrue(get_blob_store().exists(first.content_hash))
+
+        response = self.client.get(f'/attachments/{second.id}?user_id=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, pdf_data)
+        response.close()
+
+        print("Pass: Identical attachments share one blob and download intact")
+
+    def test_attachment_range_and_conditional_download(self):
+        print("\n===== Testing ranged and conditional attachment downloads =====")
+
+        pdf_data = b'%PDF-1.5\n' + b'0123456789' * 1000
+        response = self.client.post('/messages/send', data={
+            'sender_id': '2',
+            'recipient_email': 'employer@pmail.com',
+            'subject': 'Application for: Software Developer',
+            'body': 'Please find my CV attached.',
+            'attachment': (io.BytesIO(pdf_data), 'cv.pdf')
+        }, content_type='multipart/form-data')
+        message_id = json.loads(response.data)['message_id']
+        attachment = Attachment.query.filter_by(message_id=message_id).one()
+        url = f'/attachments/{attachment.id}?user_id=1'
+
+        response = self.client.get(url, headers={'Range': 'bytes=9-18'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, b'0123456789')
+        self.assertEqual(response.headers['Content-Range'], f'bytes 9-18/{len(pdf_data)}')
+        response.close()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], f'"{attachment.content_hash}"')
+        self.assertIn('Last-Modified', response.headers)
+        self.assertIn('private', response.headers['Cache-Control'])
+        response.close()
+
+        response = self.client.get(url, headers={'If-None-Match': f'"{attachment.content_hash}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        response.close()
+
+        print("Pass: Attachment served with Range, strong ETag and Last-Modified support")
+
+    def test_invalid_attachment_leaves_no_message(self):
+        print("\n===== Testing attachment validation happens before the message is saved =====")
+
+        def send_with(data, filename):
+            return self.client.post('/messages/send', data={
+                'sender_id': '2',
+                'recipient_email': 'employer@pmail.com',
+                'subject': 'Application for: Software Developer',
+                'body': 'Please find my CV attached.',
+                'attachment': (io.BytesIO(data), filename)
+            }, content_type='multipart/form-data')
+
+        response = send_with(b'MZ\x90\x00 not really a pdf', 'cv.pdf')
+        self.assertEqual(response.status_code, 400)
+
+        response = send_with(b'%PDF-1.5\n' + b'0' * (5 * 1024 * 1024), 'cv.pdf')
+        self.assertEqual(response.status_code, 413)
+
+        self.assertEqual(Message.query.count(), 0)
+        self.assertEqual(Attachment.query.count(), 0)
+        store_root = self.app.config['ATTACHMENT_STORE_PATH']
+        self.assertEqual([name for _, _, files in os.walk(store_root) for name in files], [])
+
+        print("Pass: Rejected uploads left no message, attachment or blob behind")
+
+    def test_orphaned_attachment_blobs_are_released(self):
+        print("\n===== Testing attachment blobs without a message are cleaned up =====")
+
+        store_root = self.app.config['ATTACHMENT_STORE_PATH']
+
+        def stored_blobs():
+            return [name for _, _, files in os.walk(store_root) for name in files]
+
+        response = self.client.post('/messages/send', data={
+            'sender_id': '2',
+            'recipient_email': 'employer@pmail.com',
+            'subject': 'Application for: Software Developer',
+            'body': 'Please find my CV attached.',
+            'draft_id': '999',
+            'attachment': (io.BytesIO(b'%PDF-1.5\nDraft CV'), 'cv.pdf')
+        }, content_type='multipart/form-data')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(stored_blobs(), [])
+        print("Unknown draft rejected before the attachment was stored")
+
+        # An identical upload whose message is not committed yet shares the blob.
+        shared_hash, _ = get_blob_store().put(io.BytesIO(b'%PDF-1.5\nShared CV'))
+        with mock.patch.object(db.session, 'commit', side_effect=RuntimeError("database unavailable")):
+            response = self.client.post('/messages/send', data={
+                'sender_id': '2',
+                'recipient_email': 'employer@pmail.com',
+                'subject': 'Application for: Software Developer',
+                'body': 'Please find my CV attached.',
+                'attachment': (io.BytesIO(b'%PDF-1.5\nShared CV'), 'cv.pdf')
+            }, content_type='multipart/form-data')
+        self.assertEqual(response.status_code, 500)
+        self.assertTrue(get_blob_store().exists(shared_hash))
+        print("Failed send left the shared blob in place for the concurrent upload")
+
+        kept_hash, _ = get_blob_store().put(io.BytesIO(b'%PDF-1.5\nReferenced CV'))
+        message = Message(sender_id=2, recipient_id=1, subject="CV", body="Attached", is_draft=False, is_spam=False)
+        db.session.add(Attachment(message=message, filename='cv.pdf', file_type='application/pdf',
+                                  file_size=22, content_hash=kept_hash))
+        db.session.commit()
+        orphan_hash, _ = get_blob_store().put(io.BytesIO(b'%PDF-1.5\nOrphaned CV'))
+
+        self.assertEqual(collect_attachment_garbage(min_age=3600), 0)
+        self.assertEqual(collect_attachment_garbage(min_age=0), 2)
+        self.assertEqual(stored_blobs(), [kept_hash])
+        self.assertFalse(get_blob_store().exists(orphan_hash))
+        self.assertFalse(get_blob_store().exists(shared_hash))
+
+        print("Pass: Unreferenced blobs are left to garbage collection and removed once older than min_age")
+
+    def test_send_links_application_to_job(self):
+        print("\n===== Testing applications are linked to their job listing at send time =====")
+
+        other_job = Job(title="Software Developer", description="Elsewhere", category="Information Technology",
+                        job_type="Full-time", location="Remote", company_name="Other Company")
+        job = Job(title="Software Developer", description="Build things", category="Information Technology",
+                  job_type="Full-time", location="Remote", company_name="Test Company")
+        analyst_job = Job(title="Data Analyst", description="Count things", category="Information Technology",
+                          job_type="Full-time", location="Remote", company_name="Test Company")
+        db.session.add_all([other_job, job, analyst_job])
+        db.session.commit()
+
+        def send(subject, **extra):
+            data = {'sender_id': 2, 'recipient_email': 'employer@pmail.com', 'subject': subject,
+                    'body': 'I would like to apply for this role.', **extra}
+            response = self.client.post('/messages/send', data=json.dumps(data), content_type='application/json')
+            self.assertEqual(response.status_code, 201)
+            return Message.query.get(json.loads(response.data)['message_id'])
+
+        parsed = send('Application for: software developer')
+        self.assertTrue(parsed.is_application)
+        self.assertEqual(parsed.job_id, job.id)
+
+        explicit = send('Application for: Software Developer', job_id=analyst_job.id)
+        self.assertTrue(explicit.is_application)
+        self.assertEqual(explicit.job_id, analyst_job.id)
+
+        foreign = send('Application for: Software Developer', job_id=other_job.id)
+        self.assertTrue(foreign.is_application)
+        self.assertEqual(foreign.job_id, job.id)
+        print("Another company's job_id was ignored in favour of the subject")
+
+        reply = send('Re: Application for: Software Developer')
+        self.assertFalse(reply.is_application)
+        self.assertIsNone(reply.job_id)
+
+        unknown = send('Application for: Astronaut')
+        self.assertTrue(unknown.is_application)
+        self.assertIsNone(unknown.job_id)
+
+        question = send('Question about the office')
+        self.assertFalse(question.is_application)
+        self.assertIsNone(question.job_id)
+
+        applications = Message.query.filter(Message.recipient_id == 1, Message.is_application == True).count()
+        self.assertEqual(applications, 4)
+
+        print("Pass: is_application and job_id set from the form or parsed from the subject")
+
+    def test_bulk_status_update_query_count(self):
+        print("\n===== Testing bulk status updates load everything in a constant number of queries =====")
+
+        db.session.add(StatusMessage(user_id=1, status='rejected',
+                                     message="We have filled the {job_title} role, thank you."))
+        db.session.commit()
+        status_template_cache.get(1)
+
+        def seed(count):
+            senders = [User(email=f"bulk{count}_{i}@pmail.com", password="hashed_password",
+                            first_name="Bulk", last_name=f"Applicant{i}", role="employee",
+                            birthdate=datetime.now(), phone=f"555-{count:04d}-{i:04d}")
+                       for i in range(count)]
+            db.session.add_all(senders)
+            db.session.flush()
+            messages = [Message(sender_id=sender.id, recipient_id=1, subject=f"Application for: Role {i}",
+                                body="Application", is_draft=False, is_spam=False, is_application=True)
+                        for i, sender in enumerate(senders)]
+            db.session.add_all(messages)
+            db.session.commit()
+            return [message.id for message in messages]
+
+        results = {}
+        for count in (10, 100, 1000):
+            message_ids = seed(count)
+            db.session.expunge_all()
+            with QueryCounter(db.engine) as counter:
+                start = time.perf_counter()
+                response = self.client.put('/messages/bulk-status-update',
+                                           data=json.dumps({'message_ids': message_ids, 'status': 'Rejected'}),
+                                           content_type='application/json')
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data)['updated_count'], count)
+            results[count] = counter.count
+            print(f"{count} IDs: {counter.count} queries, {elapsed_ms:.1f}ms")
+
+            replies = Message.query.filter(Message.parent_id.in_(message_ids)).all()
+            self.assertEqual(len(replies), count)
+            self.assertTrue(all(reply.body.startswith("We have filled the Role ") for reply in replies))
+            self.assertEqual(Message.query.filter(Message.id.in_(message_ids),
+                                                  Message.status == 'Rejected').count(), count)
+
+        chunks = -(-1000 // BULK_UPDATE_CHUNK_SIZE)
+        self.assertEqual(results[10], results[100])
+        self.assertEqual(results[1000], results[10] * chunks, "bulk status update query count grows within a chunk")
+
+        print("Pass: Bulk status update uses set-based loads and one bulk insert for auto-replies")
+
+    def test_bulk_status_update_reports_partial_failures(self):
+        print("\n===== Testing bulk status updates commit per chunk and report failures =====")
+
+        messages = [Message(sender_id=2, recipient_id=1, subject=f"Application for: Role {i}",
+                            body="Application", is_draft=False, is_spam=False) for i in range(6)]
+        db.session.add_all(messages)
+        db.session.commit()
+        message_ids = [message.id for message in messages]
+
+        response = self.client.put('/messages/bulk-status-update',
+                                   data=json.dumps({'message_ids': message_ids[:2] + [9999, 'abc'],
+                                                    'status': 'Under Review'}),
+                                   content_type='application/json')
+        self.assertEqual(response.status_code, 207)
+        report = json.loads(response.data)
+        self.assertEqual(report['updated_count'], 2)
+        self.assertEqual(sorted(str(failure['message_id']) for failure in report['failed']), ['9999', 'abc'])
+
+        response = self.client.put('/messages/bulk-status-update',
+                                   data=json.dumps({'message_ids': message_ids, 'status': 'Archived'}),
+                                   content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        def fail_on_role_3(status, subject, *args, **kwargs):
+            if subject.endswith("Role 3"):
+                raise RuntimeError("template error")
+            return f"{status}: {subject}"
+
+        with mock.patch('backend.routes.bulk_updates.generate_status_message', side_effect=fail_on_role_3):
+            report = apply_bulk_status_update(message_ids, 'Accepted', chunk_size=2)
+
+        self.assertEqual(report['chunks'], 3)
+        self.assertEqual(report['failed_chunks'], 1)
+        self.assertEqual(report['updated_count'], 4)
+        self.assertEqual(sorted(failure['message_id'] for failure in report['failed']), message_ids[2:4])
+
+        statuses = {message.id: message.status for message in Message.query.filter(Message.id.in_(message_ids))}
+        self.assertEqual([statuses[message_id] for message_id in message_ids],
+                         ['Accepted', 'Accepted', 'Pending', 'Pending', 'Accepted', 'Accepted'])
+        self.assertEqual(Message.query.filter(Message.parent_id.in_(message_ids[2:4])).count(), 0)
+
+        print("Pass: Failed chunk rolled back and reported while the other chunks committed")
+
+    def test_status_templates_are_cached(self):
+        print("\n===== Testing auto-replies render from the cached employer templates =====")
+
+        response = self.client.post('/status-messages', data=json.dumps({
+            'user_id': 1,
+            'messages': {'accepted': "Welcome aboard as {job_title}! ({job_title})"}
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        messages = [Message(sender_id=2, recipient_id=1, subject=f"Application for: Role {i}",
+                            body="Application", is_draft=False, is_spam=False) for i in range(2)]
+        db.session.add_all(messages)
+        db.session.commit()
+        first_id, second_id = messages[0].id, messages[1].id
+
+        self.client.put(f'/messages/{first_id}/status', data=json.dumps({'status': 'Accepted'}),
+                        content_type='application/json')
+        with QueryCounter(db.engine) as counter:
+            self.client.put(f'/messages/{second_id}/status', data=json.dumps({'status': 'Accepted'}),
+                            content_type='application/json')
+        self.assertFalse([statement for statement in counter.statements if 'status_messages' in statement])
+        reply = Message.query.filter_by(parent_id=second_id).first()
+        self.assertEqual(reply.body, "Welcome aboard as Role 1! (Role 1)")
+
+        self.client.post('/status-messages', data=json.dumps({
+            'user_id': 1,
+            'messages': {'accepted': "You got the {job_title} job"}
+        }), content_type='application/json')
+        response = self.client.get('/status-messages/1')
+        templates = json.loads(response.data)['messages']
+        self.assertEqual(templates['accepted'], "You got the {job_title} job")
+        self.assertIn('{job_title}', templates['rejected'])
+
+        self.client.put(f'/messages/{first_id}/status', data=json.dumps({'status': 'Rejected'}),
+                        content_type='application/json')
+        self.client.put(f'/messages/{first_id}/status', data=json.dumps({'status': 'Accepted'}),
+                        content_type='application/json')
+        latest = Message.query.filter_by(parent_id=first_id).order_by(Message.id.desc()).first()
+        self.assertEqual(latest.body, "You got the Role 0 job")
+        print(f"Template cache stats: {status_template_cache.stats()}")
+
+        cache = StatusTemplateCache()
+
+        def invalidate_during_load(conn, cursor, statement, parameters, context, executemany):
+            if 'status_messages' in statement:
+                cache.invalidate(1)
+
+        event.listen(db.engine, 'before_cursor_execute', invalidate_during_load)
+        try:
+            self.assertIn('accepted', cache.get(1))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', invalidate_during_load)
+        self.assertEqual(cache.stats()['size'], 0)
+        self.assertIn('accepted', cache.get(1))
+        self.assertEqual(cache.stats()['size'], 1)
+        print("A load that raced an invalidation was not cached")
+
+        print("Pass: Templates served from cache and refreshed after save_status_messages")
+
+    def test_dashboard_aggregates_are_maintained(self):
+        print("\n===== Testing dashboard aggregates follow sends and status changes =====")
+
+        db.session.add(Job(title="Software Developer", description="Build things", category="Information Technology",
+                           job_type="Full-time", location="Remote", company_name="Test Company"))
+        db.session.commit()
+
+        def send(subject):
+            response = self.client.post('/messages/send', data=json.dumps({
+                'sender_id': 2, 'recipient_email': 'employer@pmail.com', 'subject': subject,
+                'body': 'I would like to apply for this role.'
+            }), content_type='application/json')
+            return json.loads(response.data)['message_id']
+
+        first = send('Application for: Software Developer')
+        second = send('Application for: Software Developer')
+        send('Question about the office')
+
+        self.client.put(f'/messages/{first}/status', data=json.dumps({'status': 'Accepted'}),
+                        content_type='application/json')
+        self.client.put('/messages/bulk-status-update', data=json.dumps({'message_ids': [second], 'status': 'Rejected'}),
+                        content_type='application/json')
+
+        employer = json.loads(self.client.get('/dashboard/employer/1?limit=1').data)
+        self.assertEqual(employer['status_counts'], {'Accepted': 1, 'Rejected': 1, 'Pending': 1})
+        self.assertEqual(employer['category_counts'], {'Information Technology': 2})
+        self.assertEqual(sum(employer['time_series'].values()), 3)
+        self.assertEqual(sum(employer['day_of_week_counts'].values()), 3)
+        self.assertEqual(len(employer['applications']), 1)
+
+        employee = json.loads(self.client.get('/dashboard/employee/2').data)
+        self.assertEqual(employee['status_counts'], employer['status_counts'])
+        self.assertEqual(len(employee['applications']), 3)
+
+        def snapshot():
+            return {(row.user_id, row.direction, row.status, row.month, row.weekday, row.category): row.count
+                    for row in DashboardAggregate.query.filter(DashboardAggregate.count != 0)}
+
+        incremental = snapshot()
+        self.assertEqual(sum(count for key, count in incremental.items() if key[:2] == (2, 'received')), 2)
+        rebuild_dashboard_aggregates()
+        self.assertEqual(snapshot(), incremental)
+
+        for _ in range(20):
+            send('Application for: Software Developer')
+        with QueryCounter(db.engine) as counter:
+            response = self.client.get('/dashboard/employer/1?limit=1')
+        self.assertEqual(json.loads(response.data)['status_counts']['Pending'], 21)
+        print(f"Employer dashboard with 23 applications and ?limit=1: {counter.count} queries")
+        self.assertLessEqual(counter.count, 6)
+
+        print("Pass: Aggregates maintained on send and status change and match a full rebuild")
+
+    def test_dashboard_applications_are_paged(self):
+        print("\n===== Testing cursor pagination of the dashboard application list =====")
+
+        base_time = datetime(2024, 1, 1, 12, 0, 0)
+        for i in range(5):
+            db.session.add(Message(sender_id=2, recipient_id=1, subject=f"Application for: Role {i}",
+                                   body="Paged body", is_draft=False, is_spam=False, is_application=True,
+                                   created_at=base_time + timedelta(minutes=i // 2)))
+        db.session.commit()
+
+        for url in ('/dashboard/employee/2', '/dashboard/employer/1'):
+            everything = json.loads(self.client.get(url).data)
+            self.assertEqual(len(everything['applications']), 5)
+            self.assertIsNone(everything['next_cursor'])
+
+            seen = []
+            cursor = None
+            while True:
+                response = self.client.get(f'{url}?limit=2' + (f'&cursor={cursor}' if cursor else ''))
+                page = json.loads(response.data)
+                self.assertLessEqual(len(page['applications']), 2)
+                self.assertEqual(response.headers.get('X-Next-Cursor'), page['next_cursor'])
+                seen.extend(app['id'] for app in page['applications'])
+                cursor = page['next_cursor']
+                if not cursor:
+                    break
+            self.assertEqual(seen, [app['id'] for app in everything['applications']])
+            print(f"{url}: 5 applications in {len(seen) // 2 + 1} pages of 2")
+
+        print("Pass: Dashboard application lists page with the folder keyset cursor")
+
+    def test_dashboard_aggregates_follow_job_and_user_changes(self):
+        print("\n===== Testing dashboard aggregates follow job edits and deletions =====")
+
+        db.session.add(Job(title="Software Developer", description="Build things", category="Information Technology",
+                           job_type="Full-time", location="Remote", company_name="Test Company"))
+        db.session.add(User(id=3, email="other@pmail.com", password="hashed_password", first_name="Other",
+                            last_name="Employee", role="employee", birthdate=datetime.now(), phone="555-000-0003"))
+        db.session.commit()
+        job_id = Job.query.first().id
+
+        for sender_id in (2, 2, 3):
+            self.client.post('/messages/send', data=json.dumps({
+                'sender_id': sender_id, 'recipient_email': 'employer@pmail.com',
+                'subject': 'Application for: Software Developer', 'body': 'I would like to apply for this role.'
+            }), content_type='application/json')
+
+        def snapshot():
+            return {(row.user_id, row.direction, row.status, row.month, row.weekday, row.category): row.count
+                    for row in DashboardAggregate.query.filter(DashboardAggregate.count != 0)}
+
+        def matches_rebuild():
+            incremental = snapshot()
+            rebuild_dashboard_aggregates()
+            return snapshot() == incremental
+
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['role'] = 'employer'
+        response = self.client.put(f'/jobs/{job_id}', data=json.dumps({
+            'title': 'Software Developer', 'description': 'Build things', 'category': 'Engineering',
+            'job_type': 'Full-time', 'location': 'Remote', 'salary_range': '50k', 'deadline': '2030-01-01'
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        employer = json.loads(self.client.get('/dashboard/employer/1').data)
+        self.assertEqual(employer['category_counts'], {'Engineering': 3})
+        self.assertTrue(matches_rebuild())
+        print("Category edit moved 3 applications to the new category")
+
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['role'] = 'admin'
+        response = self.client.delete('/admin/users/3')
+        self.assertEqual(response.status_code, 200)
+        employer = json.loads(self.client.get('/dashboard/employer/1').data)
+        self.assertEqual(employer['status_counts'], {'Pending': 2})
+        self.assertEqual(DashboardAggregate.query.filter_by(user_id=3).count(), 0)
+        self.assertTrue(matches_rebuild())
+        print("Deleting a user removed their messages from the counterpart's aggregates")
+
+        response = self.client.delete(f'/admin/jobs/{job_id}')
+        self.assertEqual(response.status_code, 200)
+        employer = json.loads(self.client.get('/dashboard/employer/1').data)
+        self.assertEqual(employer['category_counts'], {})
+        self.assertEqual(employer['status_counts'], {'Pending': 2})
+        self.assertTrue(matches_rebuild())
+
+        print("Pass: Aggregates follow category edits, user deletes and job deletes without a rebuild")
+
+    def test_dashboard_query_count_is_constant(self):
+        print("\n===== Testing dashboards resolve jobs and participants in batched queries =====")
+
+        jobs = [Job(title=f"Role {i}", description="Role", category=f"Category {i % 3}", job_type="Full-time",
+                    location="Remote", company_name="Test Company",
+                    deadline=datetime.now() - timedelta(days=1) if i % 2 else None) for i in range(4)]
+        db.session.add_all(jobs)
+        db.session.commit()
+        jobs = [(job.id, job.title) for job in jobs]
+
+        def seed(count):
+            for i in range(count):
+                sender = User(email=f"dash{count}_{i}@pmail.com", password="hashed_password",
+                              first_name="Dash", last_name=f"Applicant{i}", role="employee",
+                              birthdate=datetime.now(), phone=f"555-{count:03d}-{i:04d}")
+                db.session.add(sender)
+                db.session.flush()
+                job_id, title = jobs[i % len(jobs)]
+                db.session.add_all([
+                    Message(sender_id=sender.id, recipient_id=1, subject=f"Application for: {title}",
+                            body="Application", is_draft=False, is_spam=False,
+                            is_application=True, job_id=job_id),
+                    Message(sender_id=2, recipient_id=sender.id, subject=f"Application for: {title}",
+                            body="Application", is_draft=False, is_spam=False,
+                            is_application=True, job_id=job_id)
+                ])
+            db.session.commit()
+
+        urls = ['/dashboard/employer/1', '/dashboard/employee/2']
+
+        def count_queries():
+            counts = {}
+            for url in urls:
+                db.session.expunge_all()
+                with QueryCounter(db.engine) as counter:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                counts[url] = counter.count
+            return counts
+
+        seed(3)
+        small = count_queries()
+        seed(30)
+        large = count_queries()
+
+        for url in urls:
+            print(f"{url}: {small[url]} queries with 3 applications, {large[url]} with 33")
+            self.assertEqual(small[url], large[url], f"{url} query count grows with applications")
+
+        employer = json.loads(self.client.get('/dashboard/employer/1').data)
+        self.assertEqual(len(employer['applications']), 33)
+        by_role = {app['subject']: app for app in employer['applications']}
+        self.assertTrue(by_role['Application for: Role 1']['job_closed'])
+        self.assertFalse(by_role['Application for: Role 0']['job_closed'])
+        self.assertEqual(by_role['Application for: Role 2']['job_category'], 'Category 2')
+        self.assertTrue(all(app['sender_email'].startswith('dash') for app in employer['applications']))
+
+        employee = json.loads(self.client.get('/dashboard/employee/2').data)
+        self.assertTrue(all(app['recipient_email'].startswith('dash') for app in employee['applications']))
+        self.assertTrue(all(app['job_company'] == 'Test Company' for app in employee['applications']))
+
+        print("Pass: Dashboards serialize every application from two batched lookups")
+
 if __name__ == '__main__':
     print("=" * 70)
     print("MESSAGING SYSTEM INTEGRATION TESTS")
@@ -367,7 +1161,24 @@ if __name__ == '__main__':
         'test_delete_draft',
         'test_spam_detection',
         'test_message_with_attachment',
-        'test_message_thread'
+        'test_message_thread',
+        'test_listing_query_count_is_constant',
+        'test_inbox_keyset_pagination',
+        'test_listing_returns_summary_without_body',
+        'test_inbox_conditional_get',
+        'test_message_events_are_pushed',
+        'test_attachments_are_deduplicated_in_blob_store',
+        'test_attachment_range_and_conditional_download',
+        'test_invalid_attachment_leaves_no_message',
+        'test_orphaned_attachment_blobs_are_released',
+        'test_send_links_application_to_job',
+        'test_bulk_status_update_query_count',
+        'test_bulk_status_update_reports_partial_failures',
+        'test_status_templates_are_cached',
+        'test_dashboard_aggregates_are_maintained',
+        'test_dashboard_applications_are_paged',
+        'test_dashboard_aggregates_follow_job_and_user_changes',
+        'test_dashboard_query_count_is_constant'
     ]
     
     for test_case in test_cases:
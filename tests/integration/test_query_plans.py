@@ -0,0 +1,178 @@
+import unittest
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_testing import TestCase
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from backend.models.database import db
+from backend.models.user import User
+from backend.models.message import Message
+from backend.models.employer_violation import EmployerViolation
+from backend.routes.messages import messages_bp
+from backend.routes.auth import auth_bp, check_employer_violations
+
+class QueryPlanRecorder:
+    """Records every SELECT issued while active and runs EXPLAIN QUERY PLAN on it."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.queries = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            self.queries.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    def plans(self, table):
+        """Return (statement, plan) for each recorded query that reads from table."""
+        results = []
+        with self.engine.connect() as connection:
+            for statement, parameters in self.queries:
+                if f"FROM {table}" not in statement:
+                    continue
+                rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                results.append((statement, "\n".join(row[-1] for row in rows)))
+        return results
+
+class QueryPlanIntegrationTest(TestCase):
+
+    def create_app(self):
+        app = Flask(__name__)
+        app.config['TESTING'] = True
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        app.config['WTF_CSRF_ENABLED'] = False
+        app.secret_key = 'test_secret_key'
+
+        app.register_blueprint(messages_bp)
+        app.register_blueprint(auth_bp)
+
+        db.init_app(app)
+
+        return app
+
+    def setUp(self):
+        print("\n----- Setting up test environment for query plan tests -----")
+        db.create_all()
+
+        db.session.add_all([
+            User(id=1, email="employer@pmail.com", password="hashed_password", first_name="Test",
+                 last_name="Employer", role="employer", company_name="Test Company",
+                 birthdate=datetime.now(), phone="555-123-4567"),
+            User(id=2, email="employee@pmail.com", password="hashed_password", first_name="Test",
+                 last_name="Employee", role="employee", birthdate=datetime.now(), phone="555-987-6543")
+        ])
+        old = datetime.utcnow() - timedelta(days=10)
+        for i in range(20):
+            db.session.add_all([
+                Message(sender_id=2, recipient_id=1, subject=f"Application for: Role {i}", body="Body",
+                        is_draft=False, is_spam=False, is_application=True, created_at=old),
+                Message(sender_id=2, recipient_id=1, subject=f"Offer {i}", body="Body",
+                        is_draft=False, is_spam=True),
+                Message(sender_id=1, recipient_id=2, subject=f"Draft {i}", body="Body", is_draft=True)
+            ])
+        db.session.commit()
+        db.session.add(Message(sender_id=1, recipient_id=2, subject="Re: Application for: Role 0",
+                               body="Reply", is_draft=False, is_spam=False, parent_id=1))
+        db.session.commit()
+
+    def tearDown(self):
+        print("----- Cleaning up test environment -----")
+        db.session.remove()
+        db.drop_all()
+
+    def assertUsesIndex(self, plans, index, where=None):
+        matching = [(statement, plan) for statement, plan in plans if not where or where in statement]
+        self.assertTrue(matching, f"No query matching {where!r} was issued")
+        for statement, plan in matching:
+            print(f"{index}: {plan}")
+            self.assertRegex(plan, rf"USING (COVERING )?INDEX {index}\b",
+                             f"Expected {index} for:\n{statement}\nbut the plan was:\n{plan}")
+            self.assertNotRegex(plan, r"SCAN messages(?! USING)|USE TEMP B-TREE FOR ORDER BY")
+
+    def test_folder_queries_use_folder_indexes(self):
+        print("\n===== Testing every folder listing is served by its composite index =====")
+
+        expected = {
+            '/messages/inbox/1': 'ix_messages_recipient_folder',
+            '/messages/spam/1': 'ix_messages_recipient_folder',
+            '/messages/sent/2': 'ix_messages_sender_folder',
+            '/messages/drafts/1': 'ix_messages_sender_folder'
+        }
+        for url, index in expected.items():
+            for cursor in (False, True):
+                query = url
+                if cursor:
+                    first_page = self.client.get(f'{url}?limit=5')
+                    query = f"{url}?limit=5&cursor={first_page.headers.get('X-Next-Cursor', '')}"
+                with QueryPlanRecorder(db.engine) as recorder:
+                    response = self.client.get(query)
+                self.assertEqual(response.status_code, 200)
+                self.assertUsesIndex(recorder.plans('messages'), index)
+
+        print("Pass: Inbox, spam, sent and drafts pages use their folder index without a sort")
+
+    def test_replies_use_parent_index(self):
+        print("\n===== Testing replies are read through the (parent_id, created_at) index =====")
+
+        with QueryPlanRecorder(db.engine) as recorder:
+            response = self.client.get('/messages/replies/1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)), 1)
+        self.assertUsesIndex(recorder.plans('messages'), 'ix_messages_parent_created')
+
+        print("Pass: Replies use ix_messages_parent_created")
+
+    def test_violation_checker_uses_indexes(self):
+        print("\n===== Testing the employer violation checker is served by indexes =====")
+
+        db.session.add(EmployerViolation(employer_id=1, message_id=1, acknowledged=True))
+        db.session.commit()
+
+        with QueryPlanRecorder(db.engine) as recorder:
+            check_employer_violations(1)
+
+        self.assertUsesIndex(recorder.plans('messages'), 'ix_messages_recipient_applications',
+                             where='is_application')
+        violation_plans = recorder.plans('employer_violations')
+        self.assertUsesIndex(violation_plans, 'ix_employer_violations_employer_message',
+                             where='message_id = ?')
+        self.assertUsesIndex(violation_plans, 'ix_employer_violations_employer_acknowledged',
+                             where='acknowledged = ')
+
+        print("Pass: Overdue applications and existing violations are looked up by index")
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("QUERY PLAN INTEGRATION TESTS")
+    print("=" * 70)
+    print("\nChecking the hot message queries use their intended indexes...\n")
+
+    suite = unittest.TestSuite()
+    test_cases = [
+        'test_folder_queries_use_folder_indexes',
+        'test_replies_use_parent_index',
+        'test_violation_checker_uses_indexes'
+    ]
+
+    for test_case in test_cases:
+        suite.addTest(QueryPlanIntegrationTest(test_case))
+
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+
+    print("\n" + "=" * 70)
+    print("ALL TESTS PASSED:")
+    for test in test_cases:
+        print(test)
+    print("=" * 70)
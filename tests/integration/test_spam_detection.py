@@ -2,9 +2,19 @@ import unittest
 import os
 import sys
 import json
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
 from datetime import datetime
 from flask import Flask
 from flask_testing import TestCase
+from sqlalchemy import null
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
@@ -13,6 +23,19 @@ from backend.models.user import User
 from backend.models.message import Message
 from backend.routes.messages import messages_bp
 from backend.routes.messages import is_spam  
+from backend.routes.messages import spam_queue, classify_queued_messages, unclassified_messages
+from backend.routes.spam_queue import SpamClassificationQueue
+from backend.routes.admin import admin_bp
+from backend.models.spam_model_registry import SpamModelRegistry, spam_model_registry, LINEAR_MODEL_PATH, DEFAULT_MODEL_PATH
+from backend.models.compact_spam_model import CompactSpamModel
+from ML.export_compact_model import export_compact_model, sample_texts, verdict_agreement
+from ML.incremental_training import train_incremental, new_incremental_model
+from backend.models.incremental_spam_model import (partial_fit_batches, save_incremental_model,
+                                                   load_incremental_model)
+from backend.models.spam_feedback import SpamFeedback
+from backend.routes.spam_feedback_trainer import SpamFeedbackTrainer
+from tests.benchmark.spam_classifier_benchmark import run_benchmark, find_regressions
+from backend.routes.spam_verdict_cache import SpamVerdictCache, spam_verdict_cache
 
 class SpamDetectionIntegrationTest(TestCase):
     
@@ -25,6 +48,7 @@ class SpamDetectionIntegrationTest(TestCase):
         app.secret_key = 'test_secret_key'
         
         app.register_blueprint(messages_bp)
+        app.register_blueprint(admin_bp)
         
         db.init_app(app)
         
@@ -186,6 +210,450 @@ class SpamDetectionIntegrationTest(TestCase):
                 print("Skipping direct model testing")
                 break
 
+    def test_async_classification_queue(self):
+        print("\n===== Testing asynchronous spam classification =====")
+
+        self.app.config['SPAM_CLASSIFICATION_MODE'] = 'async'
+        # The startup recovery sweep runs on its own thread; let it finish so it
+        # does not share the in-memory sqlite connection with the requests below.
+        spam_queue.start(self.app)
+        spam_queue.drain()
+        try:
+            sent_ids = {}
+            for label, subject, body in [
+                ('spam', 'MAKE MONEY FAST!!! Urgent Business Proposal',
+                 'Click here to get rich overnight! Free cash! 100% GUARANTEED INCOME! Buy now!'),
+                ('legitimate', 'Application for Software Developer Position',
+                 'Dear Hiring Manager, I am writing to express my interest in the Software Developer position.')
+            ]:
+                response = self.client.post('/messages/send', data=json.dumps({
+                    'sender_id': self.sender.id,
+                    'recipient_email': self.recipient.email,
+                    'subject': subject,
+                    'body': body
+                }), content_type='application/json')
+                self.assertEqual(response.status_code, 201)
+                response_data = json.loads(response.data)
+                self.assertTrue(response_data['classifying'])
+                sent_ids[label] = response_data['message_id']
+
+            spam_queue.drain()
+            db.session.expire_all()
+
+            self.assertTrue(Message.query.get(sent_ids['spam']).is_spam)
+            self.assertFalse(Message.query.get(sent_ids['legitimate']).is_spam)
+
+            inbox_ids = [msg['id'] for msg in json.loads(self.client.get(f'/messages/inbox/{self.recipient.id}').data)]
+            self.assertEqual(inbox_ids, [sent_ids['legitimate']])
+        finally:
+            self.app.config['SPAM_CLASSIFICATION_MODE'] = 'sync'
+
+        print("Pass: Queued messages were classified in the background and filed correctly")
+
+    def test_unclassified_messages_are_recovered(self):
+        print("\n===== Testing messages left unclassified are re-queued and retried =====")
+
+        stranded = Message(sender_id=1, recipient_id=2, subject='MAKE MONEY FAST!!! Urgent Business Proposal',
+                           body='Click here to get rich overnight! Free cash! Buy now!',
+                           is_draft=False, is_spam=null())
+        draft = Message(sender_id=1, recipient_id=2, subject='Draft', body='Draft', is_draft=True, is_spam=null())
+        db.session.add_all([stranded, draft])
+        db.session.commit()
+        stranded_id = stranded.id
+
+        self.assertEqual([item[0] for item in unclassified_messages()], [stranded_id])
+        self.assertEqual(list(unclassified_messages(min_age=3600)), [])
+        print("Only sent messages older than min_age are picked up")
+
+        calls = []
+
+        def flaky_handler(batch):
+            calls.append([message_id for message_id, _ in batch])
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+            classify_queued_messages(batch)
+
+        recovery_queue = SpamClassificationQueue(flaky_handler, recover=unclassified_messages, retry_delay=0)
+        recovery_queue.start(self.app)
+        recovery_queue.drain()
+        db.session.expire_all()
+
+        self.assertTrue(Message.query.get(stranded_id).is_spam)
+        self.assertIsNone(Message.query.get(draft.id).is_spam)
+        self.assertEqual(calls[:2], [[stranded_id], [stranded_id]])
+
+        print("Stranded message recovered at startup and retried after a failed batch")
+
+        handled = []
+        release = threading.Event()
+
+        def blocking_recover(min_age):
+            release.wait(5)
+            return [(1, 'submitted'), (2, 'stranded')]
+
+        def handler(batch):
+            dedupe_queue.recovered.wait(5)
+            handled.extend(batch)
+
+        dedupe_queue = SpamClassificationQueue(handler, recover=blocking_recover, key=lambda item: item[0])
+        started = time.monotonic()
+        dedupe_queue.submit(self.app, (1, 'submitted'))
+        self.assertLess(time.monotonic() - started, 1)
+        print("submit returned without waiting for the recovery sweep")
+        release.set()
+        dedupe_queue.drain()
+        self.assertEqual(sorted(handled), [(1, 'submitted'), (2, 'stranded')])
+
+        print("Pass: Recovery sweep runs off the submitting thread and skips items already queued")
+
+    def test_bulk_rescore_messages(self):
+        print("\n===== Testing batch re-scoring of stored messages =====")
+
+        spam_text = ('MAKE MONEY FAST!!! Urgent Business Proposal',
+                     'Click here to get rich overnight! Free cash! 100% GUARANTEED INCOME! Buy now!')
+        legit_text = ('Application for Software Developer Position',
+                      'Dear Hiring Manager, I am writing to express my interest in the Software Developer position.')
+        mislabelled = [
+            Message(sender_id=1, recipient_id=2, subject=spam_text[0], body=spam_text[1], is_spam=False),
+            Message(sender_id=1, recipient_id=2, subject=legit_text[0], body=legit_text[1], is_spam=True),
+            Message(sender_id=1, recipient_id=2, subject=spam_text[0], body=spam_text[1], is_spam=False),
+            Message(sender_id=1, recipient_id=2, subject=legit_text[0], body=legit_text[1], is_spam=False)
+        ]
+        auto_reply = Message(sender_id=2, recipient_id=1, subject=spam_text[0], body=spam_text[1],
+                             is_spam=False, is_auto_reply=True)
+        corrected = Message(sender_id=1, recipient_id=2, subject=spam_text[0], body=spam_text[1], is_spam=False)
+        db.session.add_all(mislabelled + [auto_reply, corrected])
+        db.session.commit()
+        db.session.add(SpamFeedback(message_id=corrected.id, user_id=2, is_spam=False))
+        db.session.commit()
+        ids = [msg.id for msg in mislabelled]
+
+        with self.client.session_transaction() as session:
+            session['user_id'] = 1
+            session['role'] = 'admin'
+
+        response = self.client.post('/admin/spam/rescore',
+                                    data=json.dumps({'message_ids': ids + [auto_reply.id, corrected.id]}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        summary = json.loads(response.data)
+        self.assertEqual(summary['scored'], 4)
+        self.assertEqual(summary['moved_to_spam'], 2)
+        self.assertEqual(summary['moved_to_inbox'], 1)
+
+        db.session.expire_all()
+        self.assertEqual([Message.query.get(i).is_spam for i in ids], [True, False, True, False])
+        self.assertFalse(Message.query.get(auto_reply.id).is_spam)
+        self.assertFalse(Message.query.get(corrected.id).is_spam)
+        print("Automated replies and user-corrected messages kept their verdicts")
+
+        response = self.client.post('/admin/spam/rescore', data=json.dumps({}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        print("Pass: Stored messages re-scored in bulk and corrected")
+
+    def test_model_registry_lazy_load_and_swap(self):
+        print("\n===== Testing lazy loading and hot swapping of the spam model =====")
+
+        registry = SpamModelRegistry()
+        self.assertIsNone(registry.current)
+        loaded = registry.get()
+        self.assertIsNotNone(loaded)
+        self.assertEqual(len(loaded.version), 12)
+        print(f"Model loaded lazily with version {loaded.version}")
+
+        class BrokenModel:
+            def predict_proba(self, texts):
+                raise RuntimeError("not fitted")
+
+        with self.assertRaises(ValueError):
+            registry.swap(model=BrokenModel())
+        self.assertIs(registry.get(), loaded)
+        print("Broken candidate rejected by smoke test, previous model kept")
+
+        swapped = registry.swap(model=loaded.model, version="candidate")
+        self.assertEqual(registry.version, "candidate")
+        self.assertIs(swapped.model, loaded.model)
+
+        response = self.client.post('/messages/send', data=json.dumps({
+            'sender_id': self.sender.id,
+            'recipient_email': self.recipient.email,
+            'subject': 'Interview follow-up',
+            'body': 'Thank you for your time yesterday.'
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        message = Message.query.get(json.loads(response.data)['message_id'])
+        self.assertEqual(message.spam_model_version, spam_model_registry.version)
+        print(f"Pass: Message records model version {message.spam_model_version}")
+
+    def test_verdict_cache(self):
+        print("\n===== Testing the spam verdict cache =====")
+
+        cache = SpamVerdictCache(max_entries=2, ttl=60)
+        cache.put("Hello   World", "v1", 0.2)
+        self.assertEqual(cache.get("hello world", "v1"), 0.2)
+        self.assertIsNone(cache.get("hello world", "v2"))
+        cache.put("second", "v1", 0.9)
+        cache.put("third", "v1", 0.4)
+        self.assertIsNone(cache.get("hello world", "v1"))
+        stats = cache.stats()
+        self.assertEqual((stats['size'], stats['hits'], stats['misses'], stats['evictions']), (2, 1, 2, 1))
+        print("Normalized keys, version scoping and LRU eviction verified")
+
+        expired = SpamVerdictCache(ttl=0)
+        expired.put("text", "v1", 0.1)
+        self.assertIsNone(expired.get("text", "v1"))
+
+        spam_verdict_cache.invalidate()
+        before = spam_verdict_cache.stats()
+        self.assertFalse(is_spam('Project update', 'The report is attached for review.'))
+        self.assertFalse(is_spam('PROJECT update', 'The report is   attached for review.'))
+        after = spam_verdict_cache.stats()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+        with self.client.session_transaction() as session:
+            session['user_id'] = 1
+            session['role'] = 'admin'
+        response = self.client.get('/admin/spam/cache')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['size'], 1)
+
+        loaded = spam_model_registry.get()
+        spam_model_registry.swap(model=loaded.model, version=loaded.version)
+        self.assertEqual(spam_verdict_cache.stats()['size'], 0)
+        print("Pass: Repeated text served from cache and model swap invalidated it")
+
+    def test_compact_model_artifact(self):
+        print("\n===== Testing the compact spam model artifact =====")
+
+        texts = [
+            'Application for: Developer please find my CV attached',
+            'Interview schedule for next week',
+            'WIN FREE CASH NOW click here urgent offer',
+            'Make money fast guaranteed income buy now',
+            'Meeting notes and project timeline',
+            'Limited offer free prize claim your cash'
+        ]
+        labels = [0, 0, 1, 1, 0, 1]
+        pipeline = Pipeline([
+            ('tfidf', TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)),
+            ('classifier', LogisticRegression(C=10))
+        ]).fit(texts, labels)
+
+        artifact_dir = tempfile.mkdtemp()
+        try:
+            meta = export_compact_model(pipeline, artifact_dir)
+            registry = SpamModelRegistry(artifact_dir)
+            loaded = registry.get()
+            self.assertEqual(loaded.version, meta['version'])
+            self.assertIsInstance(loaded.model, CompactSpamModel)
+
+            samples = texts + ['Free cash offer for your application', 'no known words here ¿']
+            np.testing.assert_allclose(loaded.model.predict_proba(samples),
+                                       pipeline.predict_proba(samples), atol=1e-5)
+            print(f"Compact model {meta['version']} matches the sklearn pipeline")
+
+            with self.assertRaises(ValueError):
+                export_compact_model(Pipeline([
+                    ('tfidf', TfidfVectorizer()),
+                    ('classifier', RandomForestClassifier(n_estimators=2))
+                ]).fit(texts, labels), artifact_dir)
+        finally:
+            shutil.rmtree(artifact_dir)
+
+        shipped = SpamModelRegistry(LINEAR_MODEL_PATH).get()
+        self.assertIsNotNone(shipped)
+        print("Pass: Compact artifact exported, loaded and scored with a sparse dot product")
+
+    def test_linear_model_agreement_with_served_model(self):
+        print("\n===== Testing the shipped linear model's recorded agreement with the served model =====")
+
+        served = SpamModelRegistry(DEFAULT_MODEL_PATH).get()
+        linear = SpamModelRegistry(LINEAR_MODEL_PATH).get()
+        recorded = linear.model.meta['agreement']
+        self.assertNotIn('export of', linear.model.meta['source'])
+        self.assertEqual(recorded['reference_version'], served.version)
+        self.assertNotEqual(linear.version, served.version)
+
+        texts = sample_texts(recorded['samples'], recorded['seed'])
+        agreement = verdict_agreement(served.model.predict_proba(texts)[:, 1], linear.model.predict_proba(texts)[:, 1])
+        print(f"Linear model {linear.version} agrees with served model {served.version} on {agreement:.2%} of "
+              f"{len(texts)} messages (recorded {recorded['verdict_agreement']:.2%})")
+        self.assertAlmostEqual(agreement, recorded['verdict_agreement'], places=3)
+
+        print("Pass: Linear model is a separate version and its recorded agreement matches the served model")
+
+    def test_out_of_core_training_from_messages(self):
+        print("\n===== Testing out-of-core training from users' spam feedback =====")
+
+        spam_texts = ['WIN FREE CASH NOW click here', 'Make money fast guaranteed income', 'Limited offer claim your prize']
+        ham_texts = ['Interview schedule for Monday', 'Application for: Developer CV attached', 'Project meeting notes']
+        messages = [Message(sender_id=1, recipient_id=2, subject=text, body=text, is_draft=False,
+                            is_spam=i >= len(spam_texts))
+                    for i, text in enumerate(spam_texts + ham_texts)]
+        unreviewed = Message(sender_id=1, recipient_id=2, subject='Free cash prize', body='click here now',
+                             is_draft=False, is_spam=True)
+        db.session.add_all(messages + [unreviewed])
+        db.session.commit()
+        db.session.add_all([SpamFeedback(message_id=message.id, user_id=2, is_spam=i < len(spam_texts))
+                            for i, message in enumerate(messages)])
+        db.session.commit()
+
+        artifact_dir = tempfile.mkdtemp()
+        model_path = os.path.join(artifact_dir, 'incremental.pkl')
+        try:
+            model, state = train_incremental(source='db', batch_size=4, path=model_path, engine=db.engine)
+            self.assertEqual(state['samples_seen'], 6)
+            last_feedback_id = state['last_feedback_id']
+            print(f"Trained on {state['samples_seen']} corrected labels up to feedback {last_feedback_id}")
+
+            model, state = train_incremental(source='db', batch_size=4, path=model_path, engine=db.engine, update=True)
+            self.assertEqual(state['samples_seen'], 6)
+
+            db.session.add(SpamFeedback(message_id=messages[0].id, user_id=2, is_spam=True))
+            db.session.commit()
+            model, state = train_incremental(source='db', batch_size=4, path=model_path, engine=db.engine, update=True)
+            self.assertEqual(state['samples_seen'], 7)
+            self.assertGreater(state['last_feedback_id'], last_feedback_id)
+            print("A later correction to an older message was picked up by --update")
+
+            loaded = SpamModelRegistry(model_path).get()
+            probabilities = loaded.model.predict_proba(['WIN FREE CASH prize', 'Interview meeting notes'])
+            self.assertGreater(probabilities[0][1], probabilities[1][1])
+        finally:
+            shutil.rmtree(artifact_dir)
+        print("Pass: Model trained in batches on feedback labels and updated with only new corrections")
+
+    def test_feedback_trains_and_publishes_model(self):
+        print("\n===== Testing online learning from spam feedback =====")
+
+        artifact_dir = tempfile.mkdtemp()
+        model_path = os.path.join(artifact_dir, 'incremental.pkl')
+        registry = SpamModelRegistry(model_path)
+        trainer = SpamFeedbackTrainer(registry=registry, model_path=model_path, batch_size=2)
+        try:
+            self.assertEqual(trainer.run_once()['trained'], 0)
+
+            base = new_incremental_model()
+            partial_fit_batches(base, [(['WIN FREE CASH NOW', 'Project meeting notes'], [1, 0])])
+            save_incremental_model(base, {'samples_seen': 2}, model_path)
+            base_version = registry.version
+
+            flagged = [Message(sender_id=1, recipient_id=2, subject='Invoice for your order',
+                               body='Cash payment received, click here to view the invoice',
+                               is_draft=False, is_spam=True, spam_model_version=base_version)
+                       for _ in range(3)]
+            inbox_message = Message(sender_id=1, recipient_id=2, subject='Free prize', body='Claim now',
+                                    is_draft=False, is_spam=False)
+            db.session.add_all(flagged + [inbox_message])
+            db.session.commit()
+
+            for message in flagged:
+                self.assertEqual(self.client.post(f'/messages/not-spam/{message.id}').status_code, 200)
+            self.assertEqual(self.client.post(f'/messages/{inbox_message.id}/mark-spam').status_code, 200)
+            self.assertEqual(self.client.post(f'/messages/{inbox_message.id}/mark-spam').status_code, 400)
+
+            feedback = SpamFeedback.query.order_by(SpamFeedback.id).all()
+            self.assertEqual([f.is_spam for f in feedback], [False, False, False, True])
+            self.assertEqual(feedback[0].model_version, base_version)
+            self.assertEqual(trainer.pending_count(), 4)
+            print(f"Recorded {len(feedback)} feedback corrections")
+
+            text = 'Invoice for your order Cash payment received, click here to view the invoice'
+            before = base.predict_proba([text])[0][1]
+            summary = trainer.run_once()
+            self.assertTrue(summary['published'])
+            self.assertEqual(summary['trained'], 4)
+            self.assertEqual(registry.version, summary['version'])
+            self.assertNotEqual(registry.version, base_version)
+            self.assertLess(registry.get().model.predict_proba([text])[0][1], before)
+            self.assertEqual(trainer.pending_count(), 0)
+            self.assertEqual(load_incremental_model(model_path)[1]['feedback_trained'], 4)
+
+            self.assertEqual(trainer.run_once()['trained'], 0)
+        finally:
+            shutil.rmtree(artifact_dir)
+        print("Pass: Corrections trained incrementally and published as a new model version")
+
+    def test_feedback_model_replaces_base_model_only_when_enabled(self):
+        print("\n===== Testing the feedback model is published explicitly and survives a restart =====")
+
+        artifact_dir = tempfile.mkdtemp()
+        model_path = os.path.join(artifact_dir, 'incremental.pkl')
+        active_path = os.path.join(artifact_dir, 'active.json')
+        try:
+            base = new_incremental_model()
+            partial_fit_batches(base, [(['WIN FREE CASH NOW', 'Project meeting notes'], [1, 0])])
+            save_incremental_model(base, {'samples_seen': 2}, model_path)
+
+            def record_feedback():
+                message = Message(sender_id=1, recipient_id=2, subject='Invoice for your order',
+                                  body='Cash payment received', is_draft=False, is_spam=False)
+                db.session.add(message)
+                db.session.commit()
+                db.session.add(SpamFeedback(message_id=message.id, user_id=2, is_spam=True))
+                db.session.commit()
+
+            registry = SpamModelRegistry(LINEAR_MODEL_PATH, active_path=active_path)
+            shipped_version = registry.version
+            record_feedback()
+            summary = SpamFeedbackTrainer(registry=registry, model_path=model_path).run_once()
+            self.assertEqual(summary['trained'], 1)
+            self.assertFalse(summary['published'])
+            self.assertEqual(registry.version, shipped_version)
+            self.assertIsNone(registry.published())
+            print("Shipped model kept; feedback model saved but not published by default")
+
+            record_feedback()
+            trainer = SpamFeedbackTrainer(registry=registry, model_path=model_path, replace_base_model=True)
+            summary = trainer.run_once()
+            self.assertTrue(summary['published'])
+            self.assertEqual(registry.version, summary['version'])
+            self.assertEqual(registry.published()['path'], os.path.abspath(model_path))
+
+            restarted = SpamModelRegistry(LINEAR_MODEL_PATH, active_path=active_path)
+            restarted.warm()
+            self.assertEqual(restarted.version, summary['version'])
+            self.assertEqual(os.path.abspath(restarted.get().path), os.path.abspath(model_path))
+            print(f"Restarted registry serves published model {restarted.version}")
+
+            record_feedback()
+            summary = SpamFeedbackTrainer(registry=restarted, model_path=model_path).run_once()
+            self.assertTrue(summary['published'])
+            self.assertEqual(restarted.version, summary['version'])
+        finally:
+            shutil.rmtree(artifact_dir)
+        print("Pass: Feedback model replaced the shipped model only when enabled and persisted across restarts")
+
+    def test_benchmark_harness_reports_and_detects_regressions(self):
+        print("\n===== Testing the spam classifier benchmark harness =====")
+
+        served_version = spam_model_registry.version
+        spam_verdict_cache.put('benchmark sentinel', served_version, 0.1)
+        results = run_benchmark(samples=20, batch_sizes=[1, 4], min_seconds=0.01)
+        self.assertEqual(results['samples'], 20)
+        self.assertEqual(spam_model_registry.version, served_version)
+        self.assertEqual(spam_verdict_cache.get('benchmark sentinel', served_version), 0.1)
+        print("Served model and shared verdict cache left untouched")
+        self.assertEqual(results['model_version'], spam_model_registry.version)
+        self.assertEqual(set(results['latency_ms']), {'p50', 'p95', 'p99', 'mean'})
+        self.assertLessEqual(results['latency_ms']['p50'], results['latency_ms']['p99'])
+        self.assertEqual([row['batch_size'] for row in results['throughput']], [1, 4])
+        self.assertGreater(results['peak_memory_mb']['latency'], 0)
+        self.assertGreater(results['peak_memory_mb']['throughput'], 0)
+        json.dumps(results)
+        print(f"Benchmark p95 latency {results['latency_ms']['p95']}ms")
+
+        self.assertEqual(find_regressions(results, results), [])
+        faster = json.loads(json.dumps(results))
+        faster['latency_ms']['p95'] = results['latency_ms']['p95'] / 2
+        faster['throughput'][1]['messages_per_second'] = results['throughput'][1]['messages_per_second'] * 2
+        regressions = find_regressions(results, faster, tolerance=0.25)
+        self.assertEqual(len(regressions), 2)
+        print("Pass: Benchmark results are machine-readable and regressions are reported")
+
 if __name__ == '__main__':
     print("=" * 70)
     print("SPAM DETECTION INTEGRATION TESTS")
@@ -200,7 +668,18 @@ if __name__ == '__main__':
     test_cases = [
         'test_spam_detection_on_message_sending',
         'test_legitimate_message_not_marked_spam',
-        'test_spam_detection_function_directly'
+        'test_spam_detection_function_directly',
+        'test_async_classification_queue',
+        'test_unclassified_messages_are_recovered',
+        'test_bulk_rescore_messages',
+        'test_model_registry_lazy_load_and_swap',
+        'test_verdict_cache',
+        'test_compact_model_artifact',
+        'test_linear_model_agreement_with_served_model',
+        'test_out_of_core_training_from_messages',
+        'test_feedback_trains_and_publishes_model',
+        'test_feedback_model_replaces_base_model_only_when_enabled',
+        'test_benchmark_harness_reports_and_detects_regressions'
     ]
     for test_case in test_cases:
         suite.addTest(SpamDetectionIntegrationTest(test_case))